@@ -3,7 +3,9 @@
 // predates the multi-module Command Center and works fine as-is).
 import { createApiClient } from "../../api/core";
 
-const client = createApiClient("freightmas.freightmas.page.shipment_dashboard.shipment_dashboard");
+const MODULE_PATH = "freightmas.freightmas.page.shipment_dashboard.shipment_dashboard";
+const client = createApiClient(MODULE_PATH);
+const exportClient = createApiClient("freightmas.utils.export_utils");
 
 export const api = {
 	getOverview: () => client.call("get_overview"),
@@ -19,17 +21,43 @@ export const api = {
 // URL (new tab / window.location) triggers the browser's normal file download,
 // no fetch/blob juggling needed. GET requests to whitelisted methods don't
 // require the CSRF header, so a plain URL is enough.
+const exportMethodMap = {
+	shipments: "export_jobs",
+	finance: "export_finance",
+	dnd: "export_dnd",
+	trackingReport: "export_tracking_report",
+	masterTrackingReport: "export_master_tracking_report",
+	shipmentTrackingReport: "export_shipment_tracking_report",
+	shipmentTrackingReportExcel: "export_shipment_tracking_report_excel",
+};
+
 export function exportUrl(kind, params = {}) {
-	const methodMap = {
-		shipments: "export_jobs",
-		finance: "export_finance",
-		dnd: "export_dnd",
-		trackingReport: "export_tracking_report",
-		masterTrackingReport: "export_master_tracking_report",
-		shipmentTrackingReport: "export_shipment_tracking_report",
-		shipmentTrackingReportExcel: "export_shipment_tracking_report_excel",
-	};
-	return client.buildUrl(methodMap[kind], params);
+	return client.buildUrl(exportMethodMap[kind], params);
+}
+
+// The tracking workbooks can take longer than a web request allows, so they
+// are built by a background job (export_utils.start_export, which allow-lists
+// these methods) instead of streamed from exportUrl. Polls get_export_status,
+// calling onProgress(status) on each poll, and resolves with the completed
+// status - its file_url is offered as a link, since a window.open this long
+// after the click is swallowed by popup blockers.
+const EXPORT_POLL_MS = 2000;
+
+export async function runBackgroundExport(kind, params = {}, onProgress = () => {}) {
+	const started = await exportClient.call("start_export", {
+		method: `${MODULE_PATH}.${exportMethodMap[kind]}`,
+		kwargs: params,
+	});
+	let status = started;
+	while (status.status === "queued" || status.status === "running") {
+		onProgress(status);
+		await new Promise((resolve) => setTimeout(resolve, EXPORT_POLL_MS));
+		status = await exportClient.call("get_export_status", { export_id: started.export_id });
+	}
+	if (status.status !== "completed") {
+		throw new Error(status.message || "Export failed.");
+	}
+	return status;
 }
 
 // Mirrors exportUrl's methodMap - one whitelisted "email_*" function per
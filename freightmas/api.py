@@ -4,7 +4,6 @@ import importlib
 from typing import Optional, Dict, List, Any
 import json
 from io import BytesIO
-import re
 
 import frappe
 from frappe import _
@@ -19,6 +18,7 @@ from openpyxl.workbook import Workbook
 
 from erpnext.stock.utils import get_incoming_rate
 
+from freightmas.utils import excel_stream
 from freightmas.utils.permissions import check_freightmas_role
 
 #########################################################
@@ -65,9 +65,10 @@ def get_report_filename(report_name: str, file_type: str, party: Optional[str] =
 @frappe.whitelist()
 def export_report_to_excel(report_name, filters=None):
     import json
-    from io import BytesIO
     import importlib
 
+    from freightmas.utils.export_utils import with_export_progress
+
     frappe.has_permission("Report", "read", report_name, throw=True)
 
     if isinstance(filters, str):
@@ -83,139 +84,16 @@ def export_report_to_excel(report_name, filters=None):
     )
     columns, data = module.execute(filters)
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-
-    sheet_title = re.sub(r'[\\/*?:\[\]]', '', report_name)[:31]
-    ws.title = sheet_title
+    preamble = excel_stream.report_preamble(frappe.defaults.get_user_default("Company"), report_name, filters)
 
-    # Styles
-    bold_font = Font(bold=True, color="FFFFFF")
-    title_font = Font(bold=True, size=16)
-    subtitle_font = Font(bold=True, size=13)
-    filter_label_font = Font(bold=True)
-    header_fill = PatternFill("solid", fgColor="305496")  # Modern blue
-    zebra_fill = PatternFill("solid", fgColor="F2F2F2")  # Light gray for zebra
-    border = Border(
-        left=Side(style='thin', color='DDDDDD'),
-        right=Side(style='thin', color='DDDDDD'),
-        top=Side(style='thin', color='DDDDDD'),
-        bottom=Side(style='thin', color='DDDDDD')
+    # Rows are streamed into a write-only workbook (zebra striping, frozen header)
+    wb = excel_stream.new_workbook()
+    excel_stream.write_table_sheet(
+        wb, report_name, columns, with_export_progress(data), preamble=preamble, dates_by_fieldname=True
     )
-    center_align = Alignment(horizontal="center", vertical="center")
-    right_align = Alignment(horizontal="right", vertical="center")
-    left_align = Alignment(horizontal="left", vertical="center")
-
-    ncols = len(columns)
-    row_idx = 1
-
-    # Company Name (merged)
-    ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-    ws.cell(row=row_idx, column=1, value=frappe.defaults.get_user_default("Company")).font = title_font
-    row_idx += 1
-
-    # Report Title (merged)
-    ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-    ws.cell(row=row_idx, column=1, value=report_name).font = subtitle_font
-    row_idx += 1
-
-    # Filters (merged label and value)
-    if filters:
-        for label, val in filters.items():
-            if val:
-                # Format date filters
-                if "date" in label and val:
-                    try:
-                        val = frappe.utils.formatdate(val, "dd-MMM-yy")
-                    except Exception:
-                        pass
-                ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=1)
-                ws.cell(row=row_idx, column=1, value=f"{label.replace('_', ' ').title()}:").font = filter_label_font
-                ws.merge_cells(start_row=row_idx, start_column=2, end_row=row_idx, end_column=ncols)
-                ws.cell(row=row_idx, column=2, value=val)
-                row_idx += 1
-
-    # Timestamp (label in first column, value in next column, merged across remaining columns)
-    ws.merge_cells(start_row=row_idx, start_column=2, end_row=row_idx, end_column=ncols)
-    ws.cell(row=row_idx, column=1, value="Exported:").font = filter_label_font
-    ws.cell(row=row_idx, column=1).alignment = left_align
-    export_time = now_datetime().strftime("%d-%b-%Y %H:%M")
-    ws.cell(row=row_idx, column=2, value=export_time)
-    ws.cell(row_idx, column=2).alignment = left_align
-    row_idx += 1
-
-    # Table Header
-    header_row = row_idx
-    for col_idx, col in enumerate(columns, start=1):
-        cell = ws.cell(row=header_row, column=col_idx, value=col["label"])
-        cell.font = bold_font
-        cell.alignment = left_align
-        cell.fill = header_fill
-        cell.border = border
-    row_idx += 1
-
-    # Freeze panes below the header row
-    ws.freeze_panes = ws[f"A{header_row+1}"]
-
-    # Table Data (zebra striping)
-    for i, row in enumerate(data, start=1):
-        fill = zebra_fill if i % 2 == 0 else None
-        for col_idx, col in enumerate(columns, start=1):
-            value = row.get(col["fieldname"], "")
-            cell = ws.cell(row=row_idx, column=col_idx)
-            
-            # Format numbers and currency
-            if col.get("fieldtype") in ["Int", "Float", "Currency"]:
-                if isinstance(value, (int, float)):
-                    cell.value = value
-                    cell.number_format = '#,##0.00'
-                else:
-                    cell.value = 0
-                    cell.number_format = '#,##0.00'
-            # Format dates
-            elif "date" in col["fieldname"] and value:
-                try:
-                    cell.value = frappe.utils.formatdate(value, "dd-MMM-yy")
-                except Exception:
-                    cell.value = value
-            else:
-                cell.value = value
-                
-            cell.border = border
-            if fill:
-                cell.fill = fill
-            # Alignment
-            if col.get("fieldtype") in ["Int", "Float", "Currency"]:
-                cell.alignment = right_align
-            else:
-                cell.alignment = left_align
-        row_idx += 1
-
-    # Auto-fit columns using only header and data rows
-    for col_idx, col in enumerate(columns, start=1):
-        max_length = 0
-        # Only check header and data rows
-        for row in ws.iter_rows(min_row=header_row, max_row=ws.max_row, min_col=col_idx, max_col=col_idx):
-            for cell in row:
-                try:
-                    cell_length = len(str(cell.value)) if cell.value else 0
-                    if cell_length > max_length:
-                        max_length = cell_length
-                except:
-                    pass
-        ws.column_dimensions[get_column_letter(col_idx)].width = max(12, min(max_length + 2, 40))
-
-    # Hide gridlines
-    ws.sheet_view.showGridLines = False
 
-    # Save to BytesIO and return as file
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-
-    timestamp = frappe.utils.now_datetime().strftime("%Y%m%d_%H%M")
     frappe.local.response.filename = get_report_filename(report_name, "xlsx")
-    frappe.local.response.filecontent = output.read()
+    frappe.local.response.filecontent = excel_stream.workbook_bytes(wb)
     frappe.local.response.type = "binary"
 
 
@@ -227,6 +105,9 @@ def export_report_to_excel(report_name, filters=None):
 @frappe.whitelist()
 def export_report_to_pdf(report_name, filters):
     import json
+
+    from freightmas.utils.export_utils import update_export_progress
+
     filters = json.loads(filters)
 
     frappe.has_permission("Report", "read", report_name, throw=True)
@@ -267,6 +148,7 @@ def export_report_to_pdf(report_name, filters):
         "exported_at": frappe.utils.now_datetime().strftime("%d-%b-%Y %H:%M"),
     }
 
+    update_export_progress(30, _("Rendering PDF"))
     html = frappe.render_template(
         "freightmas/templates/report_pdf_template.html", context
     )
@@ -1158,16 +1158,6 @@ def _link_invoice_register_entries_to_purchase_invoice(source_references, purcha
 def fetch_containers_from_bl(docname):
     """Fetch container tracking data from the configured provider and populate the Clearing Job."""
     from freightmas.integrations.tracking.dispatcher import fetch_tracking
-    from freightmas.integrations.tracking.lifecycle import apply_provider_extras, append_clearing_eta_history
-    from freightmas.integrations.tracking.status_labels import (
-        build_tracking_comment,
-        standardized_event_label,
-    )
-    from freightmas.utils.master_data_sync import (
-        match_container_type,
-        match_or_create_port,
-        match_shipping_line,
-    )
 
     doc = frappe.get_doc("Clearing Job", docname)
 
@@ -1184,6 +1174,25 @@ def fetch_containers_from_bl(docname):
         traqo_shipment_id=doc.get("traqo_shipment_id"),
     )
 
+    return apply_tracking_to_job(doc, tracking)
+
+
+def apply_tracking_to_job(doc, tracking):
+    """Populate a loaded Clearing Job from a normalized tracking payload and save it.
+
+    Split from fetch_containers_from_bl so the tracking scheduler can fetch payloads
+    concurrently and still apply them one job at a time."""
+    from freightmas.integrations.tracking.lifecycle import apply_provider_extras, append_clearing_eta_history
+    from freightmas.integrations.tracking.status_labels import (
+        build_tracking_comment,
+        standardized_event_label,
+    )
+    from freightmas.utils.master_data_sync import (
+        match_container_type,
+        match_or_create_port,
+        match_shipping_line,
+    )
+
     metadata = tracking["metadata"]
     route = tracking["route"]
     vessel = tracking["vessel"]
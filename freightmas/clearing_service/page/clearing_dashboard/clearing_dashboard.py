@@ -14,8 +14,10 @@ is computed from those here.
 import frappe
 from frappe.utils import flt, getdate, nowdate
 
+from freightmas.utils import excel_stream
 from freightmas.utils.permissions import check_freightmas_role, check_doc_read_permission
-from freightmas.utils.dashboard_common import monthly_revenue_margin_trend
+from freightmas.utils.dashboard_common import cached_count, monthly_revenue_margin_trend, paginate_job_list
+from freightmas.utils.search_index import job_search_or_filters
 # Reuse the Excel workbook helpers already written for the Forwarding dashboard.
 from freightmas.freightmas.page.shipment_dashboard.shipment_dashboard import (
 	_write_sheet,
@@ -154,7 +156,7 @@ def _milestone_percent(job):
 # ============================================================
 
 @frappe.whitelist()
-def get_jobs(customer=None, status=None, direction=None, search=None, limit_start=0, limit_page_length=20):
+def get_jobs(customer=None, status=None, direction=None, search=None, limit_start=0, limit_page_length=20, cursor=None):
 	check_freightmas_role()
 
 	filters = {"docstatus": ["<", 2]}
@@ -167,26 +169,25 @@ def get_jobs(customer=None, status=None, direction=None, search=None, limit_star
 
 	or_filters = None
 	if search:
-		or_filters = [
-			["name", "like", f"%{search}%"],
-			["customer_reference", "like", f"%{search}%"],
-			["bl_number", "like", f"%{search}%"],
-		]
+		or_filters = job_search_or_filters("Clearing Job", search, filters=filters)
 
 	fields = [
 		"name", "customer", "customer_reference", "direction", "status",
 		"origin", "destination", "shipping_line", "bl_number", "bl_type",
-		"eta", "ata", "discharge_date", "current_comment", "last_updated_on",
+		"eta", "ata", "discharge_date", "current_comment", "last_updated_on", "modified",
 	] + _CHECK_FIELDS
 
-	jobs = frappe.get_list(
-		"Clearing Job", filters=filters, or_filters=or_filters, fields=fields,
-		order_by="modified desc",
-		limit_start=frappe.utils.cint(limit_start),
-		limit_page_length=frappe.utils.cint(limit_page_length),
+	def fetch(page_filters, order_by, start, page_length):
+		return frappe.get_list(
+			"Clearing Job", filters=page_filters, or_filters=or_filters, fields=fields,
+			order_by=order_by, limit_start=start, limit_page_length=page_length,
+		)
+
+	jobs, next_cursor = paginate_job_list(
+		fetch, filters, cursor=cursor, limit_start=limit_start, limit_page_length=limit_page_length
 	)
 
-	total_count = frappe.db.count("Clearing Job", filters=filters)
+	total_count = cached_count("Clearing Job", filters)
 	today = getdate(nowdate())
 	for j in jobs:
 		j["milestone_percent"] = _milestone_percent(j)
@@ -195,7 +196,7 @@ def get_jobs(customer=None, status=None, direction=None, search=None, limit_star
 		for f in _CHECK_FIELDS:
 			j.pop(f, None)
 
-	return {"jobs": jobs, "total_count": total_count}
+	return {"jobs": jobs, "total_count": total_count, "next_cursor": next_cursor}
 
 
 # ============================================================
@@ -388,7 +389,6 @@ def get_finance_summary(from_date=None, to_date=None, customer=None):
 @frappe.whitelist()
 def export_jobs(customer=None, status=None, direction=None, search=None):
 	check_freightmas_role()
-	import openpyxl
 
 	res = get_jobs(customer=customer, status=status, direction=direction, search=search,
 	               limit_start=0, limit_page_length=5000)
@@ -406,15 +406,14 @@ def export_jobs(customer=None, status=None, direction=None, search=None):
 		{"label": "Status", "fieldname": "status"},
 		{"label": "Milestone %", "fieldname": "milestone_percent", "fieldtype": "Float"},
 	]
-	wb = openpyxl.Workbook()
-	_write_sheet(wb.active, "Clearing Jobs", columns, res["jobs"])
+	wb = excel_stream.new_workbook("dashboard")
+	_write_sheet(wb, "Clearing Jobs", columns, res["jobs"])
 	_send_workbook(wb, _timestamped("Clearing_Jobs"))
 
 
 @frappe.whitelist()
 def export_finance(from_date=None, to_date=None, customer=None):
 	check_freightmas_role()
-	import openpyxl
 
 	res = get_finance_summary(from_date=from_date, to_date=to_date, customer=customer)
 	columns = [
@@ -430,6 +429,6 @@ def export_finance(from_date=None, to_date=None, customer=None):
 		{"label": "Invoiced Profit", "fieldname": "invoiced_profit", "fieldtype": "Currency"},
 		{"label": "Invoiced Margin %", "fieldname": "invoiced_margin_percent", "fieldtype": "Float"},
 	]
-	wb = openpyxl.Workbook()
-	_write_sheet(wb.active, "Clearing Finance", columns, res["jobs"])
+	wb = excel_stream.new_workbook("dashboard")
+	_write_sheet(wb, "Clearing Finance", columns, res["jobs"])
 	_send_workbook(wb, _timestamped("Clearing_Finance"))
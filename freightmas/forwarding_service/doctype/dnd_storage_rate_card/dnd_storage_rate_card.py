@@ -1,6 +1,8 @@
 import frappe
 from frappe.model.document import Document
 
+from freightmas.utils.forwarding_dnd_calculator import clear_rate_card_index
+
 
 class DNDStorageRateCard(Document):
 	def validate(self):
@@ -10,6 +12,15 @@ class DNDStorageRateCard(Document):
 		# Enforce uniqueness: no two active cards for same SL + port + direction
 		self._check_duplicate()
 
+	def on_update(self):
+		clear_rate_card_index()
+
+	def on_trash(self):
+		clear_rate_card_index()
+
+	def after_rename(self, old, new, merge=False):
+		clear_rate_card_index()
+
 	def _check_duplicate(self):
 		filters = {
 			"shipping_line": self.shipping_line,
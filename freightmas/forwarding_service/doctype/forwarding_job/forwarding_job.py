@@ -8,6 +8,7 @@ from frappe.utils import flt, nowdate, cint, now_datetime
 from frappe import _
 from freightmas.utils.permissions import check_doc_read_permission
 from freightmas.forwarding_service.utils.operational_phase import set_operational_phase
+from freightmas.forwarding_service.utils.milestone_progress import set_milestone_progress
 
 class ForwardingJob(Document):
     
@@ -52,6 +53,7 @@ class ForwardingJob(Document):
             self.prevent_manual_milestone_rows()
 
         set_operational_phase(self)
+        set_milestone_progress(self)
 
     def lock_services_required_once_set(self):
         """Once a Services Required checkbox has been saved as ticked, it can
@@ -1757,9 +1759,33 @@ def _link_invoice_register_entries_to_purchase_invoice(source_references, purcha
 @frappe.whitelist()
 def fetch_containers_from_bl(docname):
     """Fetch container tracking data from the configured provider and populate the Forwarding Job."""
+    from freightmas.integrations.tracking.dispatcher import fetch_tracking
+
+    doc = frappe.get_doc("Forwarding Job", docname)
+
+    if not doc.bl_number:
+        frappe.throw(_("BL Number is required to fetch tracking data."))
+
+    settings = frappe.get_single("FreightMas Settings")
+    tracking_type = settings.default_tracking_type or "BL"
+
+    tracking = fetch_tracking(
+        doc.bl_number,
+        tracking_type=tracking_type,
+        shipping_line=doc.shipping_line,
+        traqo_shipment_id=doc.get("traqo_shipment_id"),
+    )
+
+    return apply_tracking_to_job(doc, tracking)
+
+
+def apply_tracking_to_job(doc, tracking):
+    """Populate a loaded Forwarding Job from a normalized tracking payload and save it.
+
+    Split from fetch_containers_from_bl so the tracking scheduler can fetch payloads
+    concurrently and still apply them one job at a time."""
     from frappe.utils import now_datetime
 
-    from freightmas.integrations.tracking.dispatcher import fetch_tracking
     from freightmas.integrations.tracking.lifecycle import apply_provider_extras
     from freightmas.integrations.tracking.status_labels import (
         build_tracking_comment,
@@ -1776,21 +1802,6 @@ def fetch_containers_from_bl(docname):
         sync_cargo_milestones_from_port_dates,
     )
 
-    doc = frappe.get_doc("Forwarding Job", docname)
-
-    if not doc.bl_number:
-        frappe.throw(_("BL Number is required to fetch tracking data."))
-
-    settings = frappe.get_single("FreightMas Settings")
-    tracking_type = settings.default_tracking_type or "BL"
-
-    tracking = fetch_tracking(
-        doc.bl_number,
-        tracking_type=tracking_type,
-        shipping_line=doc.shipping_line,
-        traqo_shipment_id=doc.get("traqo_shipment_id"),
-    )
-
     metadata = tracking["metadata"]
     route = tracking["route"]
     vessel = tracking["vessel"]
@@ -0,0 +1,115 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Unit tests for the pure pieces of the batch DND recalculation engine."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import frappe
+
+from freightmas.scheduler.dnd import _diff, _fingerprint, _job_totals
+from freightmas.utils.forwarding_dnd_calculator import (
+	RATE_CARD_INDEX_VERSION_KEY,
+	apply_dnd_figures,
+	clear_rate_card_index,
+	resolve_rate_card,
+	select_rate_card,
+)
+
+
+def _card(**kwargs):
+	card = frappe._dict({
+		"name": "CARD",
+		"port": "",
+		"direction": "",
+		"currency": "USD",
+		"valid_from": None,
+		"valid_to": None,
+		"dnd_free_days": 14,
+		"storage_free_days": 3,
+	})
+	card.update(kwargs)
+	return card
+
+
+def _row(**kwargs):
+	row = frappe._dict({
+		"cargo_parcel_reference": "CP-1",
+		"container_number": "MSCU1234565",
+		"container_type": "40HC",
+		"discharge_date": "2026-01-01",
+		"gate_out_date": "2026-01-20",
+		"empty_return_date": "2026-01-25",
+		"to_be_returned": 1,
+		"is_hazardous": 0,
+	})
+	row.update(kwargs)
+	return row
+
+
+class TestDndBatchRecalc(unittest.TestCase):
+	def test_select_rate_card_prefers_port_and_direction(self):
+		cards = [
+			_card(name="GENERIC"),
+			_card(name="PORT", port="DBN"),
+			_card(name="EXACT", port="DBN", direction="Import"),
+		]
+		self.assertEqual(select_rate_card(cards, "DBN", "Import", "2026-01-01").name, "EXACT")
+		self.assertEqual(select_rate_card(cards, "DBN", "Export", "2026-01-01").name, "PORT")
+		self.assertEqual(select_rate_card(cards, "BEI", "Export", "2026-01-01").name, "GENERIC")
+
+	def test_select_rate_card_skips_expired(self):
+		cards = [_card(valid_to="2025-12-31")]
+		self.assertIsNone(select_rate_card(cards, "", "", "2026-01-01"))
+
+	def test_apply_dnd_figures_uses_hazardous_storage_rate(self):
+		row = _row(is_hazardous=1)
+		rates = frappe._dict(dnd_rate_per_day=10, storage_rate_per_day=5, storage_rate_per_day_hazardous=8)
+		apply_dnd_figures(row, _card(), rates, 0, "Import")
+
+		# 2026-01-01 → 2026-01-25 is 25 days, 14 free
+		self.assertEqual(row.chargeable_dnd_days, 11)
+		self.assertEqual(row.estimated_dnd_cost, 110)
+		# 2026-01-01 → 2026-01-20 is 20 days, 3 free
+		self.assertEqual(row.storage_rate_per_day, 8)
+		self.assertEqual(row.estimated_storage_cost, 17 * 8)
+		self.assertEqual(_job_totals([row]).total_est_dnd_storage_cost, 110 + 136)
+
+	def test_diff_ignores_equivalent_values(self):
+		current = frappe._dict(discharge_date="2026-01-01", estimated_dnd_cost=110.0, rate_card=None)
+		new = frappe._dict(discharge_date=frappe.utils.getdate("2026-01-01"), estimated_dnd_cost=110, rate_card="")
+		self.assertEqual(_diff(current, new, ["discharge_date", "estimated_dnd_cost", "rate_card"]), {})
+
+	def test_fingerprint_only_tracks_today_while_clock_running(self):
+		job = frappe._dict(direction="Import", shipping_line="MSC", port_of_discharge="DBN")
+		closed = [_row()]
+		self.assertEqual(
+			_fingerprint(job, closed, None, {}, 7, "2026-02-01"),
+			_fingerprint(job, closed, None, {}, 7, "2026-02-02"),
+		)
+		running = [_row(gate_out_date=None, empty_return_date=None)]
+		self.assertNotEqual(
+			_fingerprint(job, running, None, {}, 7, "2026-02-01"),
+			_fingerprint(job, running, None, {}, 7, "2026-02-02"),
+		)
+
+	def test_resolve_rate_card_from_index(self):
+		generic = _card(name="GENERIC", rates={"40HC": frappe._dict(dnd_rate_per_day=10)})
+		exact = _card(name="EXACT", port="DBN", direction="Import", rates={})
+		index = {("MSC", "", ""): [generic], ("MSC", "DBN", "Import"): [exact]}
+
+		self.assertEqual(resolve_rate_card(index, "MSC", "DBN", "Import", "2026-01-01").name, "EXACT")
+		header = resolve_rate_card(index, "MSC", "BEI", "Import", "2026-01-01")
+		self.assertEqual(header.rates["40HC"].dnd_rate_per_day, 10)
+		self.assertIsNone(resolve_rate_card(index, "MAERSK", "DBN", "Import", "2026-01-01"))
+
+	def test_rate_card_index_is_cleared_again_after_commit(self):
+		cache, db = MagicMock(), MagicMock()
+		with patch("frappe.cache", return_value=cache), patch("frappe.db", db):
+			clear_rate_card_index()
+			self.assertEqual(cache.set_value.call_count, 1)
+			(after_commit,) = db.after_commit.add.call_args[0]
+			after_commit()
+		self.assertEqual(cache.set_value.call_count, 2)
+		self.assertEqual(cache.set_value.call_args[0][0], RATE_CARD_INDEX_VERSION_KEY)
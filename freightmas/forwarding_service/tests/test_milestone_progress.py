@@ -4,9 +4,11 @@
 import unittest
 
 from freightmas.forwarding_service.utils.milestone_progress import (
+	milestone_progress_counts,
 	overall_milestone_percent,
 	road_transport_progress_counts,
 	sea_air_progress_counts,
+	set_milestone_progress,
 )
 
 
@@ -57,6 +59,34 @@ class TestMilestoneProgress(unittest.TestCase):
 		self.assertEqual(overall_milestone_percent(8, 2), 25)
 		self.assertEqual(overall_milestone_percent(0, 0), 0)
 
+	def test_job_counts_combine_milestone_rows_and_parcel_checks(self):
+		job = {
+			"requires_sea_air_freight": 1,
+			"atd": "2026-07-01",
+			"ata": None,
+			"port_clearance_milestones": [{"is_completed": 1}, {"is_completed": 0}],
+			"warehouse_milestones": [{"is_completed": 1}],
+			"cargo_parcel_details": [{
+				"cargo_type": "Loose",
+				"is_truck_required": 1,
+				"is_booked": 1,
+				"is_loaded": 0,
+				"is_offloaded": 0,
+				"is_completed": 0,
+			}],
+		}
+		# 3 milestone rows + 4 road checks + 2 sea/air shipment checks
+		self.assertEqual(milestone_progress_counts(job), (9, 4))
+
+	def test_set_milestone_progress_writes_header_counters(self):
+		class Job(dict):
+			__getattr__ = dict.get
+			__setattr__ = dict.__setitem__
+
+		job = Job(road_freight_milestones=[{"is_completed": 1}, {"is_completed": 1}, {"is_completed": 0}, {}])
+		set_milestone_progress(job)
+		self.assertEqual((job.milestone_total, job.milestone_done, job.milestone_percent), (4, 2, 50))
+
 
 if __name__ == "__main__":
 	unittest.main()
@@ -4,12 +4,14 @@
 """Unit tests for Forwarding Job operational phase derivation."""
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 
 from freightmas.forwarding_service.utils.operational_phase import (
 	derive_operational_phase,
 	get_overview_bucket_phases,
+	operational_phase_map,
 )
 
 
@@ -134,6 +136,37 @@ class TestOperationalPhase(unittest.TestCase):
 		self.assertEqual(OVERVIEW_PIPELINE_BUCKETS[3]["label"], "Port Clearance")
 		self.assertEqual(OVERVIEW_PIPELINE_BUCKETS[-1]["label"], "Delivered")
 
+	def test_bulk_map_matches_single_derivation(self):
+		header = _job(name="FJ-1", requires_port_clearance=1, ata="2026-02-01")
+		cargo = frappe._dict({"parent": "FJ-1", "cargo_type": "Containerised", "gate_out_date": None})
+		milestone = frappe._dict({
+			"parent": "FJ-1",
+			"parentfield": "port_clearance_milestones",
+			"is_completed": 0,
+			"stage": "Documentation",
+			"stage_sequence": 1,
+		})
+
+		def fake_get_all(doctype, **kwargs):
+			if doctype == "Forwarding Job":
+				return [frappe._dict(header, cargo_parcel_details=None)]
+			if doctype == "Cargo Parcel Details":
+				return [cargo]
+			return [milestone]
+
+		with patch.object(frappe, "get_all", side_effect=fake_get_all) as get_all:
+			result = operational_phase_map(["FJ-1", "FJ-1"])
+
+		self.assertEqual(get_all.call_count, 3)
+		expected = derive_operational_phase(_job(
+			requires_port_clearance=1,
+			ata="2026-02-01",
+			cargo_parcel_details=[cargo],
+			port_clearance_milestones=[milestone],
+		))
+		self.assertEqual(result, {"FJ-1": expected})
+		self.assertEqual(expected["substage"], "Documentation")
+
 
 if __name__ == "__main__":
 	unittest.main()
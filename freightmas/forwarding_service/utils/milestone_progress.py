@@ -5,12 +5,12 @@
 
 Mirrors the Desk form rollup in forwarding_job.js (render_milestone_summary):
 Job Milestone Progress child rows, plus road-transport and sea/air parcel checks.
+The rollup is stored on the job header on every save so list endpoints can
+read (and sort by) it without touching the child tables.
 """
 
 from __future__ import annotations
 
-import frappe
-
 MILESTONE_TABLE_FIELDS = (
 	"road_freight_milestones",
 	"port_clearance_milestones",
@@ -63,65 +63,32 @@ def overall_milestone_percent(total, done):
 	return round(done / total * 100)
 
 
-def forwarding_milestone_progress_map(job_names):
-	"""Bulk {job_name: overall_milestone_percent} for list endpoints."""
-	if not job_names:
-		return {}
+def milestone_progress_counts(job):
+	"""Return (total_checks, done_checks) for a loaded Forwarding Job."""
+	total = 0
+	done = 0
+	for fieldname in MILESTONE_TABLE_FIELDS:
+		rows = job.get(fieldname) or []
+		total += len(rows)
+		done += sum(1 for row in rows if row.get("is_completed"))
 
-	counts = {name: {"total": 0, "done": 0} for name in job_names}
+	parcels = job.get("cargo_parcel_details") or []
+	rt_total, rt_done = road_transport_progress_counts(parcels)
+	total += rt_total
+	done += rt_done
 
-	for fieldname in MILESTONE_TABLE_FIELDS:
-		rows = frappe.db.sql(
-			"""
-			SELECT parent, COUNT(*) AS total, SUM(IFNULL(is_completed, 0)) AS done
-			FROM `tabJob Milestone Progress`
-			WHERE parenttype = 'Forwarding Job' AND parentfield = %(field)s AND parent IN %(names)s
-			GROUP BY parent
-			""",
-			{"field": fieldname, "names": tuple(job_names)},
-			as_dict=True,
-		)
-		for row in rows:
-			bucket = counts[row.parent]
-			bucket["total"] += row.total or 0
-			bucket["done"] += int(row.done or 0)
-
-	parcels = frappe.db.sql(
-		"""
-		SELECT
-			parent, cargo_type, is_truck_required, to_be_returned,
-			is_booked, is_loaded, is_offloaded, is_completed,
-			is_returned, empty_return_date, discharge_date, gate_out_date
-		FROM `tabCargo Parcel Details`
-		WHERE parenttype = 'Forwarding Job' AND parent IN %(names)s
-		""",
-		{"names": tuple(job_names)},
-		as_dict=True,
-	)
-	parcels_by_job = {}
-	for parcel in parcels:
-		parcels_by_job.setdefault(parcel.parent, []).append(parcel)
-
-	jobs = frappe.get_all(
-		"Forwarding Job",
-		filters={"name": ["in", job_names]},
-		fields=["name", "requires_sea_air_freight", "atd", "ata"],
-	)
-	jobs_by_name = {job.name: job for job in jobs}
-
-	for name in job_names:
-		job_parcels = parcels_by_job.get(name, [])
-		rt_total, rt_done = road_transport_progress_counts(job_parcels)
-		counts[name]["total"] += rt_total
-		counts[name]["done"] += rt_done
-
-		job = jobs_by_name.get(name) or {}
-		if job.get("requires_sea_air_freight"):
-			sa_total, sa_done = sea_air_progress_counts(job, job_parcels)
-			counts[name]["total"] += sa_total
-			counts[name]["done"] += sa_done
-
-	return {
-		name: overall_milestone_percent(bucket["total"], bucket["done"])
-		for name, bucket in counts.items()
-	}
+	if job.get("requires_sea_air_freight"):
+		sa_total, sa_done = sea_air_progress_counts(job, parcels)
+		total += sa_total
+		done += sa_done
+
+	return total, done
+
+
+def set_milestone_progress(job):
+	"""Refresh the denormalised milestone_total / milestone_done /
+	milestone_percent header fields that list endpoints read and sort on."""
+	total, done = milestone_progress_counts(job)
+	job.milestone_total = total
+	job.milestone_done = done
+	job.milestone_percent = overall_milestone_percent(total, done)
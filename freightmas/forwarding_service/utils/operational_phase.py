@@ -128,16 +128,95 @@ def derive_operational_phase(doc):
 	}
 
 
+# Columns the resolvers below actually read — keep in sync when they change.
+PHASE_HEADER_FIELDS = (
+	"status",
+	"direction",
+	"shipment_mode",
+	"requires_sea_air_freight",
+	"requires_port_clearance",
+	"requires_border_clearance",
+	"is_trucking_required",
+	"requires_warehousing",
+	"atd",
+	"ata",
+	"discharge_date",
+)
+
+PHASE_CARGO_FIELDS = (
+	"cargo_type",
+	"is_truck_required",
+	"is_loaded",
+	"is_offloaded",
+	"is_completed",
+	"gate_out_date",
+	"to_be_returned",
+	"empty_return_date",
+)
+
+PHASE_MILESTONE_FIELDS = ("is_completed", "stage", "stage_sequence")
+
+
 def operational_phase_map(job_names):
-	"""Bulk {job_name: {phase, substage, label}} for list endpoints."""
+	"""Bulk {job_name: {phase, substage, label}} for list endpoints.
+
+	Loads only the header columns and child rows the resolvers read — one query
+	for headers, one for cargo parcels and one for all milestone tables — then
+	runs the same derivation as derive_operational_phase on lightweight dicts.
+	"""
 	if not job_names:
 		return {}
 
-	result = {}
-	for name in job_names:
-		doc = frappe.get_doc("Forwarding Job", name)
-		result[name] = derive_operational_phase(doc)
-	return result
+	job_names = list(dict.fromkeys(job_names))
+	return {
+		name: derive_operational_phase(job)
+		for name, job in load_phase_inputs(job_names).items()
+	}
+
+
+def load_phase_inputs(job_names):
+	"""{job_name: frappe._dict} carrying just the fields derive_operational_phase reads."""
+	jobs = {
+		row.name: row
+		for row in frappe.get_all(
+			"Forwarding Job",
+			filters={"name": ["in", job_names]},
+			fields=["name", *PHASE_HEADER_FIELDS],
+		)
+	}
+	if not jobs:
+		return {}
+
+	for job in jobs.values():
+		job.cargo_parcel_details = []
+		for fieldname in MILESTONE_TABLE_FIELDS:
+			job[fieldname] = []
+
+	for row in frappe.get_all(
+		"Cargo Parcel Details",
+		filters={
+			"parenttype": "Forwarding Job",
+			"parentfield": "cargo_parcel_details",
+			"parent": ["in", list(jobs)],
+		},
+		fields=["parent", *PHASE_CARGO_FIELDS],
+		order_by="parent asc, idx asc",
+	):
+		jobs[row.parent].cargo_parcel_details.append(row)
+
+	for row in frappe.get_all(
+		"Job Milestone Progress",
+		filters={
+			"parenttype": "Forwarding Job",
+			"parentfield": ["in", list(MILESTONE_TABLE_FIELDS)],
+			"parent": ["in", list(jobs)],
+		},
+		fields=["parent", "parentfield", *PHASE_MILESTONE_FIELDS],
+		order_by="parent asc, idx asc",
+	):
+		jobs[row.parent][row.parentfield].append(row)
+
+	return jobs
 
 
 def _resolve_phase(doc):
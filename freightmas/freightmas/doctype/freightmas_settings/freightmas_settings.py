@@ -15,9 +15,9 @@ class FreightMasSettings(Document):
 		if not self.enable_revenue_recognition:
 			pass
 		else:
-			from freightmas.utils.revenue_recognition import get_recognition_settings
+			from freightmas.utils.revenue_recognition import load_recognition_settings
 			try:
-				get_recognition_settings()
+				load_recognition_settings(self)
 			except Exception as e:
 				frappe.throw(
 					_("Revenue Recognition is enabled but settings are invalid: {0}. "
@@ -29,6 +29,11 @@ class FreightMasSettings(Document):
 		if self.tracking_provider == "Traqo" and self.enable_shipping_tracker:
 			self.traqo_webhook_url = get_traqo_webhook_url()
 
+	def on_update(self):
+		from freightmas.utils.revenue_recognition import clear_recognition_settings_cache
+
+		clear_recognition_settings_cache()
+
 
 def get_traqo_webhook_url():
 	return frappe.utils.get_url(
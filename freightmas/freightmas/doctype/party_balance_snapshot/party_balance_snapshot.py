@@ -0,0 +1,17 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class PartyBalanceSnapshot(Document):
+	pass
+
+
+def on_doctype_update():
+	frappe.db.add_index(
+		"Party Balance Snapshot",
+		["company", "party_type", "party", "period_end"],
+		index_name="idx_party_period_end",
+	)
@@ -13,6 +13,7 @@ own whitelisted methods.
 
 import re
 import json
+import hashlib
 from collections import Counter
 from io import BytesIO
 
@@ -26,6 +27,10 @@ import openpyxl
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from openpyxl.utils import get_column_letter
 
+from freightmas.utils import excel_stream
+from freightmas.utils.dashboard_common import KEYSET_ORDER_BY, cached_count, paginate_job_list
+from freightmas.utils.export_utils import update_export_row_progress, with_export_progress
+from freightmas.utils.search_index import job_search_or_filters
 from freightmas.utils.permissions import check_freightmas_role, check_doc_read_permission
 from freightmas.forwarding_service.utils.operational_phase import (
 	OPERATIONAL_PHASES,
@@ -33,7 +38,6 @@ from freightmas.forwarding_service.utils.operational_phase import (
 	get_phase_label,
 	build_overview_phase_pipeline,
 )
-from freightmas.forwarding_service.utils.milestone_progress import forwarding_milestone_progress_map
 
 NOT_ACTIVE_STATUSES = ["Completed", "Closed", "Cancelled"]
 
@@ -397,8 +401,17 @@ def get_operational_phases():
 	return [{"value": phase, "label": get_phase_label(phase)} for phase in OPERATIONAL_PHASES]
 
 
+# sort_by values accepted by get_jobs. milestone_percent is maintained on the
+# job header by ForwardingJob.validate, so progress sorts happen in SQL.
+JOB_SORT_ORDERS = {
+	"modified": KEYSET_ORDER_BY,
+	"progress_asc": "milestone_percent asc, modified desc",
+	"progress_desc": "milestone_percent desc, modified desc",
+}
+
+
 @frappe.whitelist()
-def get_jobs(customer=None, status=None, direction=None, operational_phase=None, operational_phases=None, overview_bucket=None, search=None, limit_start=0, limit_page_length=20):
+def get_jobs(customer=None, status=None, direction=None, operational_phase=None, operational_phases=None, overview_bucket=None, search=None, sort_by=None, limit_start=0, limit_page_length=20, cursor=None):
 	check_freightmas_role()
 
 	filters = {"docstatus": ["<", 2]}
@@ -419,44 +432,48 @@ def get_jobs(customer=None, status=None, direction=None, operational_phase=None,
 
 	or_filters = None
 	if search:
-		or_filters = [
-			["name", "like", f"%{search}%"],
-			["customer_reference", "like", f"%{search}%"],
-			["bl_number", "like", f"%{search}%"],
-			["consignee", "like", f"%{search}%"],
-		]
+		or_filters = job_search_or_filters("Forwarding Job", search, like_fields=("consignee",), filters=filters)
 
 	fields = [
 		"name", "customer", "customer_reference", "direction", "shipment_mode",
 		"status", "operational_phase", "operational_substage",
 		"port_of_loading", "port_of_discharge", "destination",
 		"vessel_flight_no", "bl_number", "cargo_count", "eta", "ata", "etd", "atd",
-		"discharge_date", "current_comment", "last_updated_on",
+		"discharge_date", "current_comment", "last_updated_on", "milestone_percent", "modified",
 	]
 
-	jobs = frappe.get_list(
-		"Forwarding Job",
-		filters=filters,
-		or_filters=or_filters,
-		fields=fields,
-		order_by="modified desc",
-		limit_start=frappe.utils.cint(limit_start),
-		limit_page_length=frappe.utils.cint(limit_page_length),
+	def fetch(page_filters, order_by, start, page_length):
+		return frappe.get_list(
+			"Forwarding Job",
+			filters=page_filters,
+			or_filters=or_filters,
+			fields=fields,
+			order_by=order_by,
+			limit_start=start,
+			limit_page_length=page_length,
+		)
+
+	jobs, next_cursor = paginate_job_list(
+		fetch,
+		filters,
+		order_by=JOB_SORT_ORDERS.get(sort_by) or JOB_SORT_ORDERS["modified"],
+		cursor=cursor,
+		limit_start=limit_start,
+		limit_page_length=limit_page_length,
 	)
 
-	total_count = frappe.db.count("Forwarding Job", filters=filters)
+	total_count = cached_count("Forwarding Job", filters)
 
-	progress_map = forwarding_milestone_progress_map([j.name for j in jobs])
 	today = getdate(nowdate())
 	for j in jobs:
-		j["milestone_percent"] = progress_map.get(j.name, 0)
+		j["milestone_percent"] = cint(j.milestone_percent)
 		j["operational_phase_label"] = _operational_phase_label(j.get("operational_phase"))
 		j["is_overdue"] = bool(
 			(j.direction == "Import" and j.eta and getdate(j.eta) < today and not j.ata)
 			or (j.direction == "Export" and j.etd and getdate(j.etd) < today and not j.atd)
 		)
 
-	return {"jobs": jobs, "total_count": total_count}
+	return {"jobs": jobs, "total_count": total_count, "next_cursor": next_cursor}
 
 
 def milestone_stage_rollup(milestones):
@@ -1044,70 +1061,20 @@ _BORDER = Border(
 )
 _LEFT = Alignment(horizontal="left", vertical="center")
 _RIGHT = Alignment(horizontal="right", vertical="center")
-NUMERIC_TYPES = ("Currency", "Int", "Float", "Percent")
 
 
-def _write_sheet(ws, sheet_title, columns, rows):
-	"""columns: list of dicts {label, fieldname, fieldtype}."""
-	ws.title = sheet_title[:31]
-	ncols = len(columns)
+def _write_sheet(wb, sheet_title, columns, rows):
+	"""Stream a table sheet into a write-only workbook from new_workbook("dashboard").
 
+	columns: list of dicts {label, fieldname, fieldtype}; rows may be a generator.
+	"""
 	company = frappe.defaults.get_global_default("company") or frappe.defaults.get_user_default("Company") or "FreightMas"
-	row_idx = 1
-	ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-	ws.cell(row=row_idx, column=1, value=company).font = _TITLE_FONT
-	row_idx += 1
-
-	ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-	export_time = frappe.utils.now_datetime().strftime("%d-%b-%Y %H:%M")
-	ws.cell(row=row_idx, column=1, value=f"{sheet_title} \u2014 Exported {export_time}").font = _SUBTITLE_FONT
-	row_idx += 2
-
-	header_row = row_idx
-	for col_idx, col in enumerate(columns, start=1):
-		cell = ws.cell(row=header_row, column=col_idx, value=col["label"])
-		cell.font = _HEADER_FONT
-		cell.fill = _HEADER_FILL
-		cell.alignment = _LEFT
-		cell.border = _BORDER
-	row_idx += 1
-	ws.freeze_panes = ws[f"A{header_row + 1}"]
-
-	for i, row in enumerate(rows, start=1):
-		fill = _ZEBRA_FILL if i % 2 == 0 else None
-		for col_idx, col in enumerate(columns, start=1):
-			value = row.get(col["fieldname"], "")
-			cell = ws.cell(row=row_idx, column=col_idx)
-			fieldtype = col.get("fieldtype", "Data")
-			if fieldtype in NUMERIC_TYPES:
-				cell.value = flt(value) if value not in (None, "") else 0
-				cell.number_format = "0.0%" if fieldtype == "Percent" else "#,##0.00"
-				cell.alignment = _RIGHT
-			elif fieldtype in ("Date", "Datetime") and value:
-				try:
-					cell.value = formatdate(value, "dd-MMM-yy")
-				except Exception:
-					cell.value = str(value)
-				cell.alignment = _LEFT
-			else:
-				cell.value = value if value not in (None,) else ""
-				cell.alignment = _LEFT
-			cell.border = _BORDER
-			if fill:
-				cell.fill = fill
-		row_idx += 1
-
-	for col_idx, col in enumerate(columns, start=1):
-		max_length = len(col["label"])
-		for row in ws.iter_rows(min_row=header_row, max_row=ws.max_row, min_col=col_idx, max_col=col_idx):
-			for cell in row:
-				try:
-					max_length = max(max_length, len(str(cell.value)) if cell.value else 0)
-				except Exception:
-					pass
-		ws.column_dimensions[get_column_letter(col_idx)].width = max(12, min(max_length + 2, 40))
-
-	ws.sheet_view.showGridLines = False
+	preamble = [
+		[(company, "fm_title")],
+		[(f"{sheet_title} \u2014 Exported {excel_stream.export_stamp()}", "fm_subtitle")],
+		None,
+	]
+	return excel_stream.write_table_sheet(wb, sheet_title, columns, rows, preamble=preamble)
 
 
 def _workbook_bytes(wb):
@@ -1128,14 +1095,14 @@ def _timestamped(name):
 
 
 @frappe.whitelist()
-def export_jobs(customer=None, status=None, direction=None, operational_phase=None, operational_phases=None, overview_bucket=None, search=None):
+def export_jobs(customer=None, status=None, direction=None, operational_phase=None, operational_phases=None, overview_bucket=None, search=None, sort_by=None):
 	"""Export the (unpaginated, filtered) Shipments list to Excel."""
 	check_freightmas_role()
 
 	res = get_jobs(
 		customer=customer, status=status, direction=direction,
 		operational_phase=operational_phase, operational_phases=operational_phases,
-		overview_bucket=overview_bucket, search=search,
+		overview_bucket=overview_bucket, search=search, sort_by=sort_by,
 		limit_start=0, limit_page_length=5000,
 	)
 
@@ -1160,8 +1127,8 @@ def export_jobs(customer=None, status=None, direction=None, operational_phase=No
 		{"label": "Milestone %", "fieldname": "milestone_percent", "fieldtype": "Float"},
 	]
 
-	wb = openpyxl.Workbook()
-	_write_sheet(wb.active, "Shipments", columns, res["jobs"])
+	wb = excel_stream.new_workbook("dashboard")
+	_write_sheet(wb, "Shipments", columns, with_export_progress(res["jobs"]))
 	_send_workbook(wb, _timestamped("Shipments"))
 
 
@@ -1186,8 +1153,8 @@ def export_finance(from_date=None, to_date=None, customer=None):
 		{"label": "Invoiced Margin %", "fieldname": "invoiced_margin_percent", "fieldtype": "Float"},
 	]
 
-	wb = openpyxl.Workbook()
-	_write_sheet(wb.active, "Finance", columns, res["jobs"])
+	wb = excel_stream.new_workbook("dashboard")
+	_write_sheet(wb, "Finance", columns, res["jobs"])
 	_send_workbook(wb, _timestamped("Finance"))
 
 
@@ -1222,9 +1189,9 @@ def export_dnd():
 		{"label": "Total Cost", "fieldname": "total_container_cost", "fieldtype": "Currency"},
 	]
 
-	wb = openpyxl.Workbook()
-	_write_sheet(wb.active, "DND Jobs", job_columns, res["jobs"])
-	_write_sheet(wb.create_sheet("Containers"), "Containers", container_columns, res["containers"])
+	wb = excel_stream.new_workbook("dashboard")
+	_write_sheet(wb, "DND Jobs", job_columns, res["jobs"])
+	_write_sheet(wb, "Containers", container_columns, res["containers"])
 	_send_workbook(wb, _timestamped("DND_Additional_Costs"))
 
 
@@ -1386,6 +1353,7 @@ def _build_tracking_workbook(sections, rows):
 
 	data_start = header_row + 1
 	for row_offset, row_data in enumerate(rows):
+		update_export_row_progress(row_offset + 1, len(rows))
 		row_idx = data_start + row_offset
 		for col_idx, (label, fieldname, kind) in enumerate(columns, 1):
 			value = row_data.get(fieldname)
@@ -1481,11 +1449,7 @@ def _gather_tracking_report_rows(customers=None, status=None, direction=None, se
 
 	or_filters = None
 	if search:
-		or_filters = [
-			["name", "like", f"%{search}%"],
-			["customer_reference", "like", f"%{search}%"],
-			["bl_number", "like", f"%{search}%"],
-		]
+		or_filters = job_search_or_filters("Forwarding Job", search, filters=filters)
 
 	jobs = frappe.get_all(
 		"Forwarding Job",
@@ -2166,6 +2130,7 @@ def _write_master_detailed_sheet(ws, sections, report_rows, ladder):
 
 	data_start = header_row + 1
 	for offset, row in enumerate(report_rows):
+		update_export_row_progress(offset + 1, len(report_rows))
 		row_idx = data_start + offset
 		row["_milestones_achieved"] = sum(
 			1 for r in ladder["rungs"][1:]
@@ -2331,14 +2296,86 @@ DOSSIER_STATUS_LABELS = {
 }
 
 
-def _build_job_dossier_context(job_name):
+# Header, cargo and milestone fields the dossier context reads - everything
+# _load_dossier_jobs fetches, instead of a full Forwarding Job document.
+DOSSIER_JOB_FIELDS = [
+	"name", "status", "direction", "shipment_mode", "eta", "etd", "ata", "atd",
+	"bl_number", "customer_reference", "cargo_description", "cargo_count",
+	"current_comment", "last_updated_on", "completed_on",
+	"requires_port_clearance", "requires_border_clearance", "requires_warehousing",
+]
+DOSSIER_CARGO_FIELDS = [
+	"name", "parent", "container_number", "cargo_item_description", "container_type",
+	"cargo_type", "to_be_returned", "return_by_date", "is_truck_required",
+	"is_booked", "is_loaded", "is_offloaded", "is_returned", "is_completed",
+	"booked_on_date", "loaded_on_date", "offloaded_on_date", "returned_on_date",
+	"completed_on_date", "discharge_date", "gate_out_date", "empty_return_date",
+	"api_container_status", "api_last_event", "api_last_event_date",
+]
+DOSSIER_MILESTONE_FIELDS = [
+	"parent", "parentfield", "milestone_label", "is_completed", "completed_on",
+	"remarks", "stage", "stage_sequence",
+]
+DOSSIER_MILESTONE_TABLES = (
+	"road_freight_milestones",
+	"port_clearance_milestones",
+	"border_clearance_milestones",
+	"warehouse_milestones",
+)
+
+
+def _load_dossier_jobs(filters, order_by):
+	"""Batch-load the Forwarding Jobs matching `filters` in three queries -
+	headers, cargo parcels and milestone rows - instead of one get_doc (with
+	every child table) per job. Returns header dicts in `order_by` order, each
+	carrying cargo_parcel_details and the four milestone tables as lists of
+	rows, so _build_job_cargo_list / _build_job_milestone_stages read them
+	exactly as they read a loaded document."""
+	jobs = frappe.get_all(
+		"Forwarding Job", filters=filters, fields=DOSSIER_JOB_FIELDS, order_by=order_by,
+	)
+	if not jobs:
+		return []
+
+	by_name = {}
+	for job in jobs:
+		job["cargo_parcel_details"] = []
+		for table in DOSSIER_MILESTONE_TABLES:
+			job[table] = []
+		by_name[job.name] = job
+	job_names = list(by_name)
+
+	for row in frappe.get_all(
+		"Cargo Parcel Details",
+		filters={"parenttype": "Forwarding Job", "parent": ["in", job_names]},
+		fields=DOSSIER_CARGO_FIELDS,
+		order_by="parent, idx",
+	):
+		by_name[row.parent]["cargo_parcel_details"].append(row)
+
+	for row in frappe.get_all(
+		"Job Milestone Progress",
+		filters={
+			"parenttype": "Forwarding Job",
+			"parentfield": ["in", DOSSIER_MILESTONE_TABLES],
+			"parent": ["in", job_names],
+		},
+		fields=DOSSIER_MILESTONE_FIELDS,
+		order_by="parent, parentfield, idx",
+	):
+		by_name[row.parent][row.parentfield].append(row)
+
+	return jobs
+
+
+def _build_job_dossier_context(doc, today=None):
 	"""Reshapes one Forwarding Job into the dossier block the PDF template
 	renders: ref, status color/line, an at-a-glance summary row, a 5-field
 	info bar (BL Number, Reference, Cargo, Mode, Last Update) and 4 section
 	cards (Sea/Air Freight + Road Transport on the left, Port Clearance +
-	Completion on the right)."""
-	doc = frappe.get_doc("Forwarding Job", job_name)
-	today = getdate(nowdate())
+	Completion on the right). `doc` is a Forwarding Job document or a row from
+	_load_dossier_jobs."""
+	today = today or getdate(nowdate())
 
 	cargo = _build_job_cargo_list(doc)
 	groups_by_name = {s["group"]: s for s in _build_job_milestone_stages(doc)}
@@ -2556,30 +2593,39 @@ def _company_logo_data_uri(company):
 		return None
 
 
+def _dossier_job_filters(customer):
+	"""The open Forwarding Jobs a customer's tracking dossier covers."""
+	return {
+		"customer": customer,
+		"docstatus": ["in", [0, 1]],
+		"status": ["in", ["Draft", "In Progress", "Delivered"]],
+	}
+
+
 def _dossier_jobs_for_customer(customer, numbered=False):
 	"""Shared by export_shipment_tracking_report(_excel) and their email
-	counterparts: fetches this customer's open Forwarding Jobs and builds
+	counterparts: batch-loads this customer's open Forwarding Jobs and builds
 	each one's dossier context. numbered=True stamps ctx["num"] for the
 	PDF's at-a-glance table (not needed by the Excel workbook)."""
-	jobs = frappe.get_all(
-		"Forwarding Job",
-		filters={
-			"customer": customer,
-			"docstatus": ["in", [0, 1]],
-			"status": ["in", ["Draft", "In Progress", "Delivered"]],
-		},
-		fields=["name"],
-		order_by="status asc, eta asc",
-	)
+	jobs = _load_dossier_jobs(_dossier_job_filters(customer), order_by="status asc, eta asc")
+	today = getdate(nowdate())
 	dossier_jobs = []
-	for i, j in enumerate(jobs, start=1):
-		ctx = _build_job_dossier_context(j.name)
+	for i, job in enumerate(jobs, start=1):
+		ctx = _build_job_dossier_context(job, today)
 		if numbered:
 			ctx["num"] = i  # cross-references the at-a-glance table's "#" column
 		dossier_jobs.append(ctx)
 	return dossier_jobs
 
 
+def _tracking_report_company():
+	return (
+		frappe.defaults.get_user_default("Company")
+		or frappe.defaults.get_global_default("company")
+		or "FreightMas"
+	)
+
+
 def _build_shipment_tracking_pdf(customer):
 	"""Builds the compact, color-coded Shipment Tracking dossier (one block
 	per Forwarding Job) as PDF bytes, scoped to a single customer. Shared by
@@ -2588,11 +2634,7 @@ def _build_shipment_tracking_pdf(customer):
 	if not customer:
 		frappe.throw(_("Select a customer to generate this report."))
 
-	company = (
-		frappe.defaults.get_user_default("Company")
-		or frappe.defaults.get_global_default("company")
-		or "FreightMas"
-	)
+	company = _tracking_report_company()
 
 	dossier_jobs = _dossier_jobs_for_customer(customer, numbered=True)
 
@@ -2642,7 +2684,7 @@ def export_shipment_tracking_report(customer):
 	per Forwarding Job) as a PDF, scoped to a single customer."""
 	check_freightmas_role()
 
-	pdf, _customer_name = _build_shipment_tracking_pdf(customer)
+	pdf, _customer_name = get_shipment_tracking_report(customer, "pdf")
 
 	frappe.local.response.filename = f"Shipment-Tracking-{frappe.scrub(customer)}.pdf"
 	frappe.local.response.filecontent = pdf
@@ -2835,14 +2877,73 @@ def export_shipment_tracking_report_excel(customer):
 	Excel workbook (Summary, Milestone Detail, Container Detail)."""
 	check_freightmas_role()
 
-	if not customer:
-		frappe.throw(_("Select a customer to generate this report."))
+	content, _customer_name = get_shipment_tracking_report(customer, "xlsx")
+
+	frappe.local.response.filename = f"Shipment-Tracking-{frappe.scrub(customer)}.xlsx"
+	frappe.local.response.filecontent = content
+	frappe.local.response.type = "binary"
 
-	dossier_jobs = _dossier_jobs_for_customer(customer)
 
+# --- Shipment tracking report cache ---------------------------------------------
+#
+# Built PDF / Excel dossiers are kept in Redis per customer together with a
+# fingerprint of what they were built from: the date (overdue jobs turn red
+# overnight), the company and every open job's name + modified timestamp. Any
+# save of one of the customer's jobs - milestones and cargo are child rows, so
+# they bump the parent too - or a job entering/leaving the open set changes
+# the fingerprint and the next request rebuilds. The scheduler pre-builds
+# every opted-in customer's reports each morning
+# (freightmas.scheduler.tracking_reports).
+
+TRACKING_REPORT_CACHE_PREFIX = "freightmas:shipment_tracking_report"
+TRACKING_REPORT_CACHE_TTL = 36 * 60 * 60  # seconds; outlives one scheduler cycle
+TRACKING_REPORT_KINDS = ("pdf", "xlsx")
+
+
+def _shipment_tracking_fingerprint(customer):
+	jobs = frappe.get_all(
+		"Forwarding Job",
+		filters=_dossier_job_filters(customer),
+		fields=["name", "modified"],
+		order_by="name asc",
+	)
+	parts = (nowdate(), _tracking_report_company(), [(j.name, str(j.modified)) for j in jobs])
+	return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _build_shipment_tracking_report(customer, kind):
+	if kind == "pdf":
+		return _build_shipment_tracking_pdf(customer)
 	customer_name = frappe.db.get_value("Customer", customer, "customer_name") or customer
-	wb = _build_shipment_tracking_workbook(customer_name, dossier_jobs)
-	_send_workbook(wb, f"Shipment-Tracking-{frappe.scrub(customer)}.xlsx")
+	wb = _build_shipment_tracking_workbook(customer_name, _dossier_jobs_for_customer(customer))
+	return _workbook_bytes(wb), customer_name
+
+
+def get_shipment_tracking_report(customer, kind):
+	"""(content bytes, customer_name) of a customer's Shipment Tracking report -
+	`kind` "pdf" (the dossier) or "xlsx" (the 3-sheet workbook). Served from
+	the cache while its fingerprint still matches, otherwise rebuilt and
+	stored."""
+	if not customer:
+		frappe.throw(_("Select a customer to generate this report."))
+
+	cache = frappe.cache()
+	key = f"{TRACKING_REPORT_CACHE_PREFIX}:{kind}:{customer}"
+	# Taken before building, so a job saved mid-build leaves a stale
+	# fingerprint behind and the next request rebuilds.
+	fingerprint = _shipment_tracking_fingerprint(customer)
+
+	cached = cache.get_value(key)
+	if cached and cached.get("fingerprint") == fingerprint:
+		return cached["content"], cached["customer_name"]
+
+	content, customer_name = _build_shipment_tracking_report(customer, kind)
+	cache.set_value(
+		key,
+		{"fingerprint": fingerprint, "content": content, "customer_name": customer_name},
+		expires_in_sec=TRACKING_REPORT_CACHE_TTL,
+	)
+	return content, customer_name
 
 
 # --- Tracking report email actions ------------------------------------------------
@@ -2956,7 +3057,7 @@ def email_shipment_tracking_report(to_email, subject, message, customer, cc_emai
 	_validate_email_address(to_email)
 	cc = _parse_cc_emails(cc_emails)
 
-	pdf, _customer_name = _build_shipment_tracking_pdf(customer)
+	pdf, _customer_name = get_shipment_tracking_report(customer, "pdf")
 	attachment = {"fname": f"Shipment-Tracking-{frappe.scrub(customer)}.pdf", "fcontent": pdf}
 
 	frappe.sendmail(
@@ -2975,15 +3076,11 @@ def email_shipment_tracking_report(to_email, subject, message, customer, cc_emai
 @frappe.whitelist()
 def email_shipment_tracking_report_excel(to_email, subject, message, customer, cc_emails=None):
 	check_freightmas_role()
-	if not customer:
-		frappe.throw(_("Select a customer to generate this report."))
 	_validate_email_address(to_email)
 	cc = _parse_cc_emails(cc_emails)
 
-	dossier_jobs = _dossier_jobs_for_customer(customer)
-	customer_name = frappe.db.get_value("Customer", customer, "customer_name") or customer
-	wb = _build_shipment_tracking_workbook(customer_name, dossier_jobs)
-	attachment = {"fname": f"Shipment-Tracking-{frappe.scrub(customer)}.xlsx", "fcontent": _workbook_bytes(wb)}
+	content, _customer_name = get_shipment_tracking_report(customer, "xlsx")
+	attachment = {"fname": f"Shipment-Tracking-{frappe.scrub(customer)}.xlsx", "fcontent": content}
 
 	frappe.sendmail(
 		recipients=[to_email],
@@ -0,0 +1,87 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""
+Shared aging engine for the FM Accounts Receivable / Payable Summary reports.
+
+One grouped query per report buckets every outstanding invoice of the company
+by party: the date difference and bucket choice are evaluated by the database
+for all rows at once (DATEDIFF inside conditional SUMs), so the cost no longer
+grows with the number of parties.
+"""
+
+import frappe
+from frappe.utils import flt, getdate
+
+DEFAULT_RANGES = [30, 60, 90, 120]
+BUCKETS = ("range1", "range2", "range3", "range4")
+
+# party_type -> (invoice doctype, party field)
+AGING_SOURCES = {
+    "Customer": ("Sales Invoice", "customer"),
+    "Supplier": ("Purchase Invoice", "supplier"),
+}
+
+
+def parse_aging_ranges(value):
+    """The report's "Ageing Range" filter ("30, 60, 90, 120") as ints;
+    falls back to DEFAULT_RANGES when fewer than four are given."""
+    ranges = [int(x.strip()) for x in (value or "").split(",") if x.strip().isdigit()]
+    return ranges if len(ranges) >= 4 else list(DEFAULT_RANGES)
+
+
+def empty_buckets():
+    return dict.fromkeys(BUCKETS, 0)
+
+
+def get_aging_buckets(party_type, company, report_date, ranges=None, ageing_based_on="Due Date", parties=None):
+    """{party: {range1..range4}} of submitted, outstanding invoices posted on
+    or before report_date, aged from the due date (or posting date) to
+    report_date. range1 is up to ranges[0] days, range2 up to ranges[1],
+    range3 up to ranges[2] and range4 everything older. Invoices without a
+    reference date are left out.
+
+    parties: optional list restricting the parties returned.
+    """
+    doctype, party_field = AGING_SOURCES[party_type]
+    ranges = ranges or DEFAULT_RANGES
+    date_field = "due_date" if ageing_based_on == "Due Date" else "posting_date"
+
+    if parties is not None and not parties:
+        return {}
+
+    params = {
+        "company": company,
+        "report_date": getdate(report_date),
+        "r1": ranges[0],
+        "r2": ranges[1],
+        "r3": ranges[2],
+    }
+    party_condition = ""
+    if parties is not None:
+        params["parties"] = tuple(parties)
+        party_condition = f"AND inv.{party_field} IN %(parties)s"
+
+    age = f"DATEDIFF(%(report_date)s, inv.{date_field})"
+    rows = frappe.db.sql(
+        f"""
+        SELECT
+            inv.{party_field} AS party,
+            SUM(CASE WHEN {age} <= %(r1)s THEN inv.outstanding_amount ELSE 0 END) AS range1,
+            SUM(CASE WHEN {age} > %(r1)s AND {age} <= %(r2)s THEN inv.outstanding_amount ELSE 0 END) AS range2,
+            SUM(CASE WHEN {age} > %(r2)s AND {age} <= %(r3)s THEN inv.outstanding_amount ELSE 0 END) AS range3,
+            SUM(CASE WHEN {age} > %(r3)s THEN inv.outstanding_amount ELSE 0 END) AS range4
+        FROM `tab{doctype}` inv
+        WHERE inv.company = %(company)s
+        AND inv.docstatus = 1
+        AND inv.outstanding_amount > 0
+        AND inv.posting_date <= %(report_date)s
+        AND inv.{date_field} IS NOT NULL
+        {party_condition}
+        GROUP BY inv.{party_field}
+        """,
+        params,
+        as_dict=True,
+    )
+
+    return {row.party: {bucket: flt(row[bucket]) for bucket in BUCKETS} for row in rows}
@@ -4,6 +4,8 @@
 import frappe
 from frappe.utils import cint
 
+from freightmas.utils.search_index import find_search_keys
+
 
 def execute(filters=None):
     filters = frappe._dict(filters or {})
@@ -14,17 +16,62 @@ def execute(filters=None):
     return columns, data
 
 
+# Job sources searched by the finder. Container and BL filters are resolved
+# through the Job Search Key index (freightmas.utils.search_index) into cargo
+# row / job names, so no source is ever scanned with a leading-wildcard LIKE.
+SOURCES = [
+    {
+        "service": "Clearing",
+        "job_doctype": "Clearing Job",
+        "cargo_doctype": "Cargo Package Details",
+        "container_field": "container_number",
+        "container_type_field": "container_type",
+        "bl_field": "bl_number",
+        "containerised_only": True,
+    },
+    {
+        "service": "Forwarding",
+        "job_doctype": "Forwarding Job",
+        "cargo_doctype": "Cargo Parcel Details",
+        "container_field": "container_number",
+        "container_type_field": "container_type",
+        "bl_field": "bl_number",
+        "containerised_only": True,
+    },
+    {
+        "service": "Border Clearing",
+        "job_doctype": "Border Clearing Job",
+        "cargo_doctype": "Border Clearing Cargo Details",
+        "container_field": "container_or_vehicle_no",
+        "container_type_field": None,
+        "bl_field": None,
+        "containerised_only": False,
+    },
+]
+
+
 def get_data(filters):
     data = []
 
-    has_clearing_perm = frappe.has_permission("Clearing Job", "read")
-    has_forwarding_perm = frappe.has_permission("Forwarding Job", "read")
+    container_value = (filters.get("container_number") or filters.get("container_no") or "").strip()
+    bl_value = (filters.get("bl_number") or "").strip()
 
-    if has_clearing_perm:
-        data.extend(_get_clearing_rows(filters))
+    sources = [
+        source for source in SOURCES
+        if frappe.has_permission(source["job_doctype"], "read")
+        and (source["bl_field"] or not bl_value)
+    ]
+    if not sources:
+        return data
 
-    if has_forwarding_perm:
-        data.extend(_get_forwarding_rows(filters))
+    container_rows = bl_jobs = None
+    if container_value:
+        container_rows = _index_matches(container_value, "Container", sources, "row_name")
+    if bl_value:
+        bl_jobs = _index_matches(bl_value, "BL", sources, "job_name")
+
+    for source in sources:
+        data.extend(_get_rows(source, filters, container_rows, bl_jobs))
 
     data.sort(
         key=lambda row: (
@@ -37,104 +84,74 @@ def get_data(filters):
     return data
 
 
-def _get_clearing_rows(filters):
-    params = {}
-    conditions = ["cpd.parenttype = 'Clearing Job'", "cpd.cargo_type = 'Containerised'"]
+def _index_matches(value, key_type, sources, fieldname):
+    """{job_doctype: [row/job names]} of index keys matching `value`."""
+    matches = {}
+    job_doctypes = [source["job_doctype"] for source in sources]
+    # The report narrows by customer / date itself, so every match is needed.
+    for key in find_search_keys(value, [key_type], job_doctypes, limit=None):
+        matches.setdefault(key.job_doctype, []).append(key[fieldname])
+    return matches
 
-    if not cint(filters.get("include_cancelled")):
-        conditions.append("cj.docstatus < 2")
 
-    container_value = (filters.get("container_number") or filters.get("container_no") or "").strip()
-    if container_value:
-        conditions.append("cpd.container_number LIKE %(container_number)s")
-        params["container_number"] = f"%{container_value}%"
-
-    if filters.get("bl_number"):
-        conditions.append("cj.bl_number LIKE %(bl_number)s")
-        params["bl_number"] = f"%{filters.get('bl_number').strip()}%"
-
-    if filters.get("customer"):
-        conditions.append("cj.customer = %(customer)s")
-        params["customer"] = filters.get("customer")
+def _get_rows(source, filters, container_rows=None, bl_jobs=None):
+    job_doctype = source["job_doctype"]
+    params = {"job_doctype": job_doctype}
+    conditions = ["cpd.parenttype = %(job_doctype)s"]
 
-    if filters.get("from_date"):
-        conditions.append("cj.date_created >= %(from_date)s")
-        params["from_date"] = filters.get("from_date")
-
-    if filters.get("to_date"):
-        conditions.append("cj.date_created <= %(to_date)s")
-        params["to_date"] = filters.get("to_date")
-
-    where_clause = " AND ".join(conditions)
-
-    return frappe.db.sql(
-        f"""
-        SELECT
-            'Clearing' AS service,
-            'Clearing Job' AS job_doctype,
-            cj.name AS job_id,
-            cj.bl_number AS bl_number,
-            cpd.container_number AS container_number,
-            cpd.container_type AS container_type,
-            cj.customer AS customer,
-            cj.date_created AS job_date,
-            cj.docstatus AS docstatus
-        FROM `tabClearing Job` cj
-        INNER JOIN `tabCargo Package Details` cpd ON cpd.parent = cj.name
-        WHERE {where_clause}
-        """,
-        params,
-        as_dict=True,
-    )
-
-
-def _get_forwarding_rows(filters):
-    params = {}
-    conditions = ["cpd.parenttype = 'Forwarding Job'", "cpd.cargo_type = 'Containerised'"]
+    if source["containerised_only"]:
+        conditions.append("cpd.cargo_type = 'Containerised'")
+    else:
+        conditions.append(f"IFNULL(cpd.{source['container_field']}, '') != ''")
 
     if not cint(filters.get("include_cancelled")):
-        conditions.append("fj.docstatus < 2")
+        conditions.append("job.docstatus < 2")
 
-    container_value = (filters.get("container_number") or filters.get("container_no") or "").strip()
-    if container_value:
-        conditions.append("cpd.container_number LIKE %(container_number)s")
-        params["container_number"] = f"%{container_value}%"
+    if container_rows is not None:
+        params["rows"] = tuple(container_rows.get(job_doctype) or ())
+        if not params["rows"]:
+            return []
+        conditions.append("cpd.name IN %(rows)s")
 
-    if filters.get("bl_number"):
-        conditions.append("fj.bl_number LIKE %(bl_number)s")
-        params["bl_number"] = f"%{filters.get('bl_number').strip()}%"
+    if bl_jobs is not None:
+        params["bl_jobs"] = tuple(bl_jobs.get(job_doctype) or ())
+        if not params["bl_jobs"]:
+            return []
+        conditions.append("job.name IN %(bl_jobs)s")
 
     if filters.get("customer"):
-        conditions.append("fj.customer = %(customer)s")
+        conditions.append("job.customer = %(customer)s")
         params["customer"] = filters.get("customer")
 
     if filters.get("from_date"):
-        conditions.append("fj.date_created >= %(from_date)s")
+        conditions.append("job.date_created >= %(from_date)s")
         params["from_date"] = filters.get("from_date")
 
     if filters.get("to_date"):
-        conditions.append("fj.date_created <= %(to_date)s")
+        conditions.append("job.date_created <= %(to_date)s")
         params["to_date"] = filters.get("to_date")
 
     where_clause = " AND ".join(conditions)
+    bl_column = f"job.{source['bl_field']}" if source["bl_field"] else "NULL"
+    type_column = f"cpd.{source['container_type_field']}" if source["container_type_field"] else "NULL"
 
     return frappe.db.sql(
         f"""
         SELECT
-            'Forwarding' AS service,
-            'Forwarding Job' AS job_doctype,
-            fj.name AS job_id,
-            fj.bl_number AS bl_number,
-            cpd.container_number AS container_number,
-            cpd.container_type AS container_type,
-            fj.customer AS customer,
-            fj.date_created AS job_date,
-            fj.docstatus AS docstatus
-        FROM `tabForwarding Job` fj
-        INNER JOIN `tabCargo Parcel Details` cpd ON cpd.parent = fj.name
+            %(service)s AS service,
+            %(job_doctype)s AS job_doctype,
+            job.name AS job_id,
+            {bl_column} AS bl_number,
+            cpd.{source['container_field']} AS container_number,
+            {type_column} AS container_type,
+            job.customer AS customer,
+            job.date_created AS job_date,
+            job.docstatus AS docstatus
+        FROM `tab{job_doctype}` job
+        INNER JOIN `tab{source['cargo_doctype']}` cpd ON cpd.parent = job.name
         WHERE {where_clause}
         """,
-        params,
+        dict(params, service=source["service"]),
         as_dict=True,
     )
 
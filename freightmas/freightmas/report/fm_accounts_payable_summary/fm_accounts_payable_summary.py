@@ -5,6 +5,12 @@ import frappe
 from frappe import _
 from frappe.utils import flt, getdate
 
+from freightmas.freightmas.report.aging_common import (
+    empty_buckets,
+    get_aging_buckets,
+    parse_aging_ranges,
+)
+
 
 def execute(filters=None):
     filters = filters or {}
@@ -149,14 +155,23 @@ def get_data(filters):
     suppliers = set(gl_map.keys()) | set(draft_map.keys())
     result = []
     
+    # Aging buckets for every party in one grouped query
+    aging_map = get_aging_buckets(
+        "Supplier",
+        company,
+        report_date,
+        ranges=parse_aging_ranges(filters.get("range")),
+        ageing_based_on=filters.get("ageing_based_on") or "Due Date",
+        parties=list(suppliers),
+    )
+    
     for supp in suppliers:
         submitted = gl_map.get(supp, 0)
         draft = draft_map.get(supp, 0) if include_drafts else 0
         total = submitted + draft
         
         if total != 0:
-            # Get aging analysis
-            aging = get_aging_analysis(supp, filters, report_date)
+            aging = aging_map.get(supp) or empty_buckets()
             
             row = {
                 "supplier": supp,
@@ -178,55 +193,3 @@ def get_data(filters):
     
     return result
 
-
-def get_aging_analysis(supplier, filters, report_date):
-    """Get aging buckets based on invoices."""
-    company = filters.get("company")
-    aging_based_on = filters.get("ageing_based_on", "Due Date")
-    
-    # Parse aging ranges
-    aging_range = filters.get("range", "30, 60, 90, 120")
-    range_list = [int(x.strip()) for x in aging_range.split(",") if x.strip().isdigit()]
-    
-    if len(range_list) < 4:
-        range_list = [30, 60, 90, 120]
-    
-    date_field = "due_date" if aging_based_on == "Due Date" else "posting_date"
-    
-    aging = {"range1": 0, "range2": 0, "range3": 0, "range4": 0}
-    
-    # Get outstanding invoices
-    invoices = frappe.db.sql(
-        f"""
-        SELECT 
-            name,
-            {date_field} as ref_date,
-            outstanding_amount
-        FROM `tabPurchase Invoice`
-        WHERE supplier = %(supplier)s
-        AND company = %(company)s
-        AND docstatus = 1
-        AND outstanding_amount > 0
-        AND posting_date <= %(report_date)s
-        """,
-        {"supplier": supplier, "company": company, "report_date": report_date},
-        as_dict=True,
-    )
-    
-    for invoice in invoices:
-        if not invoice.ref_date:
-            continue
-        
-        days_diff = (report_date - getdate(invoice.ref_date)).days
-        amount = flt(invoice.outstanding_amount)
-        
-        if days_diff <= range_list[0]:
-            aging["range1"] += amount
-        elif days_diff <= range_list[1]:
-            aging["range2"] += amount
-        elif days_diff <= range_list[2]:
-            aging["range3"] += amount
-        else:
-            aging["range4"] += amount
-    
-    return aging
@@ -9,7 +9,6 @@ Provides nicely formatted Excel and PDF exports.
 import frappe
 from frappe import _
 from frappe.utils import flt, formatdate, now_datetime
-import io
 import re
 
 
@@ -26,6 +25,22 @@ PDF_EXTRA_DROP = []
 # Maximum characters for remarks column before truncation
 REMARKS_MAX_LEN = 80
 
+# Filters printed above the table, in this order
+EXPORT_FILTER_LABELS = {
+    "from_date": "From Date",
+    "to_date": "To Date",
+    "fiscal_year": "Fiscal Year",
+    "cost_center": "Cost Center",
+    "account": "Account",
+    "party_type": "Party Type",
+    "party": "Party",
+    "voucher_type": "Voucher Type",
+    "group_by": "Group By",
+    "job_type": "Job Type",
+    "job": "Job",
+    "date_basis": "Date Based On",
+}
+
 
 def strip_html(text):
     """Remove HTML tags from text."""
@@ -56,271 +71,89 @@ def build_excel_file(filters, data, columns, report_title, net_field_label="Net
     Build a formatted Excel workbook and return it as bytes.
 
     Uses the same visual style as the shared ``export_report_to_excel``
-    endpoint in ``freightmas.api`` so that all reports look uniform.
+    endpoint in ``freightmas.api`` so that all reports look uniform. Rows are
+    streamed through ``freightmas.utils.excel_stream``, so ``data`` may be a
+    generator.
 
     Args:
         filters: report filters dict
-        data: list of row dicts from the report
+        data: iterable of row dicts from the report
         columns: list of column dicts from the report
         report_title: e.g. "Revenue Detail Report"
         net_field_label: label for the net amount column header
         drop_fieldnames: columns to exclude; defaults to ALWAYS_DROP
             (pass a list to override for reports where e.g. account matters)
     """
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-
-    wb = Workbook()
-    ws = wb.active
-
-    sheet_title = re.sub(r'[\\/*?:\[\]]', '', report_title)[:31]
-    ws.title = sheet_title
-
-    # ---- Styles (matching api.py export_report_to_excel) ----
-    title_font = Font(bold=True, size=16)
-    subtitle_font = Font(bold=True, size=13)
-    filter_label_font = Font(bold=True)
-    bold_white_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill("solid", fgColor="305496")
-    zebra_fill = PatternFill("solid", fgColor="F2F2F2")
-    heading_font = Font(bold=True, size=11, color="305496")
-    heading_fill = PatternFill("solid", fgColor="E8ECF1")
-    subtotal_font = Font(bold=True, color="305496")
-    subtotal_fill = PatternFill("solid", fgColor="D6DCE4")
-    grand_total_font = Font(bold=True, color="FFFFFF")
-    grand_total_fill = PatternFill("solid", fgColor="305496")
-    border = Border(
-        left=Side(style='thin', color='DDDDDD'),
-        right=Side(style='thin', color='DDDDDD'),
-        top=Side(style='thin', color='DDDDDD'),
-        bottom=Side(style='thin', color='DDDDDD'),
-    )
-    center_align = Alignment(horizontal="center", vertical="center")
-    right_align = Alignment(horizontal="right", vertical="center")
-    left_align = Alignment(horizontal="left", vertical="center")
+    from freightmas.utils import excel_stream
 
     # ---- Filter columns for Excel (drop Account, Party, Party Type, Voucher Type) ----
     drop = ALWAYS_DROP if drop_fieldnames is None else list(drop_fieldnames)
     excel_columns = [c for c in columns if c.get("fieldname") not in drop]
-    ncols = len(excel_columns)
-
-    row_idx = 1
-
-    # ---- Company Name (merged) ----
-    ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-    ws.cell(row=row_idx, column=1, value=filters.get("company", "")).font = title_font
-    row_idx += 1
-
-    # ---- Report Title (merged) ----
-    ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-    ws.cell(row=row_idx, column=1, value=report_title).font = subtitle_font
-    row_idx += 1
-
-    # ---- Filters as label : value rows ----
-    display_filters = {
-        "from_date": "From Date",
-        "to_date": "To Date",
-        "fiscal_year": "Fiscal Year",
-        "cost_center": "Cost Center",
-        "account": "Account",
-        "party_type": "Party Type",
-        "party": "Party",
-        "voucher_type": "Voucher Type",
-        "group_by": "Group By",
-        "job_type": "Job Type",
-        "job": "Job",
-        "date_basis": "Date Based On",
-    }
-    for key, label in display_filters.items():
-        val = filters.get(key)
-        if val:
-            # Format date values
-            if "date" in key:
-                try:
-                    val = formatdate(val, "dd-MMM-yy")
-                except Exception:
-                    pass
-            ws.cell(row=row_idx, column=1, value=f"{label}:").font = filter_label_font
-            ws.merge_cells(start_row=row_idx, start_column=2, end_row=row_idx, end_column=ncols)
-            ws.cell(row=row_idx, column=2, value=val)
-            row_idx += 1
-
-    # ---- Exported timestamp ----
-    ws.cell(row=row_idx, column=1, value="Exported:").font = filter_label_font
-    ws.cell(row=row_idx, column=1).alignment = left_align
-    ws.merge_cells(start_row=row_idx, start_column=2, end_row=row_idx, end_column=ncols)
-    export_time = now_datetime().strftime("%d-%b-%Y %H:%M")
-    ws.cell(row=row_idx, column=2, value=export_time).alignment = left_align
-    row_idx += 1
-
-    # ---- Column headers ----
-    header_row = row_idx
-    for col_idx, col_def in enumerate(excel_columns, 1):
-        cell = ws.cell(row=header_row, column=col_idx, value=strip_html(col_def.get("label", "")))
-        cell.font = bold_white_font
-        cell.alignment = left_align
-        cell.fill = header_fill
-        cell.border = border
-    row_idx += 1
-
-    # ---- Freeze panes below header ----
-    ws.freeze_panes = ws[f"A{header_row + 1}"]
-
-    # ---- Identify currency fields ----
-    currency_fields = set()
-    for col_def in excel_columns:
-        if col_def.get("fieldtype") == "Currency":
-            currency_fields.add(col_def["fieldname"])
 
-    # ---- Data rows (zebra striping, headings, subtotals, grand total) ----
-    data_row_num = 0
+    preamble = excel_stream.report_preamble(filters.get("company", ""), report_title, filters, EXPORT_FILTER_LABELS)
 
-    # Pre-compute text-column boundary for total-row merging
+    # Text columns before the first numeric one carry the label on total rows
     text_end_col = 0
     for ci, cd in enumerate(excel_columns, 1):
         if cd.get("fieldtype") in ("Currency", "Int", "Float"):
             break
         text_end_col = ci
 
-    for row_data in data:
+    zebra = {"row": 0}
+
+    def row_cells(ws, row_data, index):
         if not row_data:
             # Blank separator row
-            row_idx += 1
-            data_row_num = 0
-            continue
+            zebra["row"] = 0
+            return None
 
         is_heading = row_data.get("is_group_heading", 0)
         is_total = row_data.get("is_group_total", 0)
-        is_grand = is_total and "Grand Total" in str(
-            row_data.get("remarks", "") or row_data.get("account_name", "")
-        )
+        label = strip_html(row_data.get("account_name", "") or row_data.get("remarks", ""))
 
-        # ---- Group heading row (merged across all columns) ----
+        # ---- Group heading row ----
         if is_heading:
-            heading_label = strip_html(
-                row_data.get("account_name", "") or row_data.get("remarks", "")
-            )
-            ws.merge_cells(start_row=row_idx, start_column=1, end_row=row_idx, end_column=ncols)
-            cell = ws.cell(row=row_idx, column=1, value=heading_label)
-            cell.font = heading_font
-            cell.fill = heading_fill
-            cell.alignment = left_align
-            cell.border = border
-            row_idx += 1
-            data_row_num = 0
-            continue
+            zebra["row"] = 0
+            return [excel_stream.cell(ws, label, "fm_heading")] + [
+                excel_stream.cell(ws, None, "fm_heading") for _column in excel_columns[1:]
+            ]
 
-        # ---- Subtotal / Grand-total rows (label spans text cols) ----
+        # ---- Subtotal / Grand-total rows (label in the first text column) ----
         if is_total:
-            label = strip_html(
-                row_data.get("account_name", "") or row_data.get("remarks", "")
-            )
-            t_font = grand_total_font if is_grand else subtotal_font
-            t_fill = grand_total_fill if is_grand else subtotal_fill
-
-            if text_end_col > 1:
-                ws.merge_cells(
-                    start_row=row_idx, start_column=1,
-                    end_row=row_idx, end_column=text_end_col,
-                )
-
-            # Label in first cell
-            cell = ws.cell(row=row_idx, column=1, value=label)
-            cell.font = t_font
-            cell.fill = t_fill
-            cell.alignment = left_align
-            cell.border = border
-
-            # Currency values
+            zebra["row"] = 0
+            prefix = "fm_grand" if "Grand Total" in str(
+                row_data.get("remarks", "") or row_data.get("account_name", "")
+            ) else "fm_subtotal"
+            cells = []
             for col_idx, col_def in enumerate(excel_columns, 1):
                 if col_idx <= text_end_col:
+                    cells.append(excel_stream.cell(ws, label if col_idx == 1 else None, f"{prefix}_text"))
                     continue
-                fieldname = col_def["fieldname"]
-                value = row_data.get(fieldname, "")
-                cell = ws.cell(row=row_idx, column=col_idx)
-                if isinstance(value, (int, float)):
-                    cell.value = value
-                    cell.number_format = '#,##0.00'
-                else:
-                    cell.value = 0
-                    cell.number_format = '#,##0.00'
-                cell.font = t_font
-                cell.fill = t_fill
-                cell.alignment = right_align
-                cell.border = border
-
-            data_row_num = 0
-            row_idx += 1
-            continue
-
-        # ---- Normal data row ----
-        data_row_num += 1
-
-        for col_idx, col_def in enumerate(excel_columns, 1):
-            fieldname = col_def["fieldname"]
-            value = row_data.get(fieldname, "")
-
-            # Strip HTML from text values
-            if isinstance(value, str):
-                value = strip_html(value)
-
-            cell = ws.cell(row=row_idx, column=col_idx)
-
-            # Format numbers and currency
-            if col_def.get("fieldtype") in ("Int", "Float", "Currency"):
-                if isinstance(value, (int, float)):
-                    cell.value = value
-                    cell.number_format = '#,##0.00'
-                else:
-                    cell.value = 0
-                    cell.number_format = '#,##0.00'
-            elif "date" in fieldname and value:
-                try:
-                    cell.value = formatdate(value, "dd-MMM-yy")
-                except Exception:
-                    cell.value = value
-            else:
-                cell.value = value
-
-            cell.border = border
-
-            # Zebra striping and alignment for normal data rows
-            if data_row_num % 2 == 0:
-                cell.fill = zebra_fill
-            cell.alignment = right_align if col_def.get("fieldtype") in ("Int", "Float", "Currency") else left_align
-
-        row_idx += 1
-
-    # ---- Auto-fit column widths (matching api.py approach) ----
-    for col_idx in range(1, ncols + 1):
-        max_length = 0
-        for row in ws.iter_rows(min_row=header_row, max_row=ws.max_row,
-                                min_col=col_idx, max_col=col_idx):
-            for cell in row:
-                try:
-                    cell_length = len(str(cell.value)) if cell.value else 0
-                    if cell_length > max_length:
-                        max_length = cell_length
-                except Exception:
-                    pass
-        ws.column_dimensions[get_column_letter(col_idx)].width = max(12, min(max_length + 2, 40))
-
-    # ---- Hide gridlines ----
-    ws.sheet_view.showGridLines = False
-
-    # ---- Print setup ----
-    ws.sheet_properties.pageSetUpPr.fitToPage = True
-    ws.page_setup.orientation = "landscape"
-    ws.page_setup.fitToWidth = 1
-    ws.page_setup.fitToHeight = 0
-    ws.page_setup.paperSize = ws.PAPERSIZE_A4
+                value = row_data.get(col_def["fieldname"], "")
+                cells.append(excel_stream.cell(
+                    ws, value if isinstance(value, (int, float)) else 0, f"{prefix}_number"
+                ))
+            return cells
+
+        # ---- Normal data row (zebra striping restarts after each group) ----
+        zebra["row"] += 1
+        return excel_stream.data_cells(
+            ws, row_data, excel_columns,
+            alt=zebra["row"] % 2 == 0,
+            dates_by_fieldname=True,
+            transform=lambda v: strip_html(v) if isinstance(v, str) else v,
+        )
 
-    # Save to bytes
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output.getvalue()
+    wb = excel_stream.new_workbook()
+    excel_stream.write_table_sheet(
+        wb, report_title, excel_columns, data,
+        preamble=preamble,
+        row_cells=row_cells,
+        dates_by_fieldname=True,
+        label_transform=strip_html,
+        fit_to_width=True,
+    )
+    return excel_stream.workbook_bytes(wb)
 
 
 # ============================================================
@@ -355,23 +188,8 @@ def build_pdf_file(filters, data, columns, report_title, net_fieldname="net_reve
     curr_cols = [c for c in pdf_columns if c["fieldname"] in currency_fields]
 
     # ---- Filters ----
-    display_filters = {
-        "from_date": "From Date",
-        "to_date": "To Date",
-        "fiscal_year": "Fiscal Year",
-        "cost_center": "Cost Center",
-        "account": "Account",
-        "party_type": "Party Type",
-        "party": "Party",
-        "voucher_type": "Voucher Type",
-        "group_by": "Group By",
-        "job_type": "Job Type",
-        "job": "Job",
-        "date_basis": "Date Based On",
-    }
-
     filter_rows = ""
-    for key, label in display_filters.items():
+    for key, label in EXPORT_FILTER_LABELS.items():
         val = filters.get(key)
         if val:
             if "date" in key:
@@ -6,6 +6,8 @@ import frappe
 from frappe import _
 from frappe.utils import formatdate
 
+from freightmas.utils.party_balance import get_party_opening_balance
+
 MAX_REMARKS_LENGTH = 120
 
 # Job reference fields present on both Sales Invoice and Purchase Invoice
@@ -244,7 +246,12 @@ def _fetch_invoice_job_ids(doctype, names):
 
 
 def get_opening_balance(filters):
-    cancelled_condition = "" if filters.get("include_cancelled") else "AND is_cancelled = 0"
+    if not filters.get("include_cancelled"):
+        return get_party_opening_balance(
+            filters.get("company"), filters.get("party_type"), filters.get("party"), filters.get("from_date")
+        )
+
+    # Cancelled entries aren't in the snapshots - sum the party's full history
     balance = frappe.db.sql("""
         SELECT SUM(debit) - SUM(credit) as balance
         FROM `tabGL Entry`
@@ -252,8 +259,7 @@ def get_opening_balance(filters):
         AND posting_date < %(from_date)s
         AND company = %(company)s
         AND party = %(party)s
-        {cancelled_condition}
-    """.format(cancelled_condition=cancelled_condition), filters, as_dict=1)[0].balance
+    """, filters, as_dict=1)[0].balance
 
     return balance or 0
 
@@ -6,6 +6,8 @@ import frappe
 from frappe import _
 from frappe.utils import formatdate
 
+from freightmas.utils.party_balance import get_party_opening_balance
+
 MAX_REMARKS_LENGTH = 120
 
 
@@ -325,16 +327,19 @@ def build_job_id_map(reference_docs, party_type):
 
 
 def get_opening_balance(filters):
+    if not filters.get("account"):
+        return get_party_opening_balance(
+            filters.get("company"), filters.get("party_type"), filters.get("party"), filters.get("from_date")
+        )
+
+    # Snapshots are per party, not per account - sum the account's full history
     params = {
         "party_type": filters.get("party_type"),
         "party": tuple(filters.get("party")),
         "company": filters.get("company"),
         "from_date": filters.get("from_date"),
+        "account": filters.get("account"),
     }
-    account_cond = ""
-    if filters.get("account"):
-        params["account"] = filters.get("account")
-        account_cond = "AND account = %(account)s"
 
     result = frappe.db.sql("""
         SELECT SUM(debit) - SUM(credit) as balance
@@ -344,8 +349,8 @@ def get_opening_balance(filters):
         AND company = %(company)s
         AND posting_date < %(from_date)s
         AND is_cancelled = 0
-        {account_cond}
-    """.format(account_cond=account_cond), params, as_dict=1)
+        AND account = %(account)s
+    """, params, as_dict=1)
 
     return (result[0].balance or 0) if result else 0
 
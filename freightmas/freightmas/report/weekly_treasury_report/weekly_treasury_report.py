@@ -469,15 +469,18 @@ def build_overdue_debtors(filters):
         LIMIT %(limit)s
     """, {"company": filters.company, "report_date": report_date, "limit": TOP_N}, as_dict=True)
 
+    # Aging: overdue invoices (past due date) for all listed customers at once
+    overdue_by_party = _get_overdue_amounts("Sales Invoice", "customer",
+                                            [r.customer for r in gl_data],
+                                            filters.company, report_date)
+
     total_outstanding = 0
     total_overdue = 0
     for r in gl_data:
         outstanding = flt(r.outstanding, 2)
         total_outstanding += outstanding
 
-        # Aging: sum overdue invoices (past due date)
-        overdue = _get_overdue_amount("Sales Invoice", "customer", r.customer,
-                                      filters.company, report_date)
+        overdue = overdue_by_party.get(r.customer, 0)
         total_overdue += overdue
 
         rows.append(_data_row(
@@ -499,22 +502,30 @@ def build_overdue_debtors(filters):
     return rows
 
 
-def _get_overdue_amount(doctype, party_field, party_name, company, report_date):
-    """Sum outstanding_amount on submitted invoices past their due date."""
+def _get_overdue_amounts(doctype, party_field, parties, company, report_date):
+    """Sum outstanding_amount on submitted invoices past their due date, per party.
+
+    One grouped query for all ``parties``; returns {party: overdue}, parties
+    with nothing overdue are absent.
+    """
+    if not parties:
+        return {}
+
     result = frappe.db.sql("""
-        SELECT IFNULL(SUM(outstanding_amount), 0) AS overdue
+        SELECT {party_field} AS party, SUM(outstanding_amount) AS overdue
         FROM `tab{doctype}`
-        WHERE {party_field} = %(party)s
+        WHERE {party_field} IN %(parties)s
             AND company = %(company)s
             AND docstatus = 1
             AND outstanding_amount > 0
             AND due_date < %(report_date)s
+        GROUP BY {party_field}
     """.format(doctype=doctype, party_field=party_field), {
-        "party": party_name,
+        "parties": tuple(parties),
         "company": company,
         "report_date": report_date,
     }, as_dict=True)
-    return flt(result[0].overdue, 2) if result else 0
+    return {r.party: flt(r.overdue, 2) for r in result}
 
 
 # ---------------------------------------------------------------------------
@@ -544,14 +555,17 @@ def build_overdue_creditors(filters):
         LIMIT %(limit)s
     """, {"company": filters.company, "report_date": report_date, "limit": TOP_N}, as_dict=True)
 
+    overdue_by_party = _get_overdue_amounts("Purchase Invoice", "supplier",
+                                            [r.supplier for r in gl_data],
+                                            filters.company, report_date)
+
     total_outstanding = 0
     total_overdue = 0
     for r in gl_data:
         outstanding = flt(r.outstanding, 2)
         total_outstanding += outstanding
 
-        overdue = _get_overdue_amount("Purchase Invoice", "supplier", r.supplier,
-                                      filters.company, report_date)
+        overdue = overdue_by_party.get(r.supplier, 0)
         total_overdue += overdue
 
         rows.append(_data_row(
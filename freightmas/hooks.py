@@ -173,11 +173,19 @@ scheduler_events = {
 		"freightmas.scheduler.quotation.expire_quotations",
 		"freightmas.invoicing.doctype.invoice_register_entry.invoice_register_entry.update_overdue_entries",
 		"freightmas.scheduler.dnd.recalculate_open_job_dnd",
+		"freightmas.utils.party_balance.refresh_party_balance_snapshots",
 	],
 	"cron": {
 		"0 6 * * *": [
 			"freightmas.scheduler.tracking.update_active_tracking"
 		],
+		"30 6 * * *": [
+			"freightmas.scheduler.tracking_reports.pregenerate_tracking_reports"
+		],
+		"* * * * *": [
+			"freightmas.integrations.tracking.webhook.flush_pending_refreshes",
+			"freightmas.portal.access_log.flush_access_log"
+		],
 	},
 	"monthly": [
 		"freightmas.warehouse_service.doctype.warehouse_job.warehouse_job.calculate_all_monthly_storage"
@@ -282,16 +290,30 @@ doc_events = {
         "on_update": [
             "freightmas.utils.forwarding_job_folder.update_job_folder_on_update",
             "freightmas.integrations.tracking.lifecycle.on_forwarding_job_update",
+            "freightmas.utils.search_index.update_job_search_keys",
         ],
-        "before_rename": "freightmas.utils.forwarding_job_folder.before_rename_forwarding_job"
+        "on_update_after_submit": "freightmas.utils.search_index.update_job_search_keys",
+        "on_trash": "freightmas.utils.search_index.delete_job_search_keys",
+        "before_rename": "freightmas.utils.forwarding_job_folder.before_rename_forwarding_job",
+        "after_rename": "freightmas.utils.search_index.rename_job_search_keys"
     },
     "Clearing Job": {
         "after_insert": "freightmas.utils.clearing_job_folder.create_job_folder_on_insert",
         "on_update": [
             "freightmas.utils.clearing_job_folder.update_job_folder_on_update",
             "freightmas.integrations.tracking.lifecycle.on_clearing_job_update",
+            "freightmas.utils.search_index.update_job_search_keys",
         ],
-        "before_rename": "freightmas.utils.clearing_job_folder.before_rename_clearing_job"
+        "on_update_after_submit": "freightmas.utils.search_index.update_job_search_keys",
+        "on_trash": "freightmas.utils.search_index.delete_job_search_keys",
+        "before_rename": "freightmas.utils.clearing_job_folder.before_rename_clearing_job",
+        "after_rename": "freightmas.utils.search_index.rename_job_search_keys"
+    },
+    "Border Clearing Job": {
+        "on_update": "freightmas.utils.search_index.update_job_search_keys",
+        "on_update_after_submit": "freightmas.utils.search_index.update_job_search_keys",
+        "on_trash": "freightmas.utils.search_index.delete_job_search_keys",
+        "after_rename": "freightmas.utils.search_index.rename_job_search_keys"
     },
     "File": {
         "before_insert": "freightmas.portal.attachments.enforce_private_on_insert",
@@ -299,13 +321,18 @@ doc_events = {
         "on_update": "freightmas.utils.forwarding_job_folder.file_on_update"
     },
     "Contact": {
-        "validate": "freightmas.portal.provisioning.sync_portal_user_on_contact_save"
+        "validate": "freightmas.portal.provisioning.sync_portal_user_on_contact_save",
+        "on_trash": "freightmas.portal.provisioning.clear_portal_entitlements_on_trash"
     },
     "User": {
         "validate": [
             "freightmas.portal.provisioning.enforce_portal_user_type",
             "freightmas.integrations.resend.user.validate_user_email_domain",
-        ]
+        ],
+        "on_trash": "freightmas.portal.provisioning.clear_portal_entitlements_on_trash"
+    },
+    "Role": {
+        "on_update": "freightmas.portal.provisioning.clear_all_portal_entitlements"
     },
     "Quotation": {
 		"validate": "freightmas.utils.quotation.validate_quotation",
@@ -332,6 +359,32 @@ doc_events = {
     "Journal Entry": {
         "before_cancel": "freightmas.utils.invoice_unlink.before_journal_entry_cancel",
         "on_cancel": "freightmas.utils.invoice_unlink.on_journal_entry_cancel"
+    },
+    "Account": {
+        "on_update": "freightmas.utils.revenue_recognition.clear_recognition_settings_cache",
+        "on_trash": "freightmas.utils.revenue_recognition.clear_recognition_settings_cache",
+        "after_rename": [
+            "freightmas.utils.revenue_recognition.clear_recognition_settings_cache",
+            "freightmas.utils.revenue_recognition.clear_item_default_account_cache"
+        ]
+    },
+    "Item": {
+        "on_update": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "on_trash": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "after_rename": "freightmas.utils.revenue_recognition.clear_item_default_account_cache"
+    },
+    "Item Group": {
+        "on_update": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "on_trash": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "after_rename": "freightmas.utils.revenue_recognition.clear_item_default_account_cache"
+    },
+    "Brand": {
+        "on_update": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "on_trash": "freightmas.utils.revenue_recognition.clear_item_default_account_cache",
+        "after_rename": "freightmas.utils.revenue_recognition.clear_item_default_account_cache"
+    },
+    "GL Entry": {
+        "after_insert": "freightmas.utils.party_balance.invalidate_party_balance_snapshots"
     }
 }
 
@@ -0,0 +1,136 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Shared, pooled HTTP sessions for outbound integrations (tracking, email).
+
+One `requests.Session` per service per thread, so bulk tracking syncs and
+email bursts reuse keep-alive connections instead of paying a TCP + TLS
+handshake per call. Each service gets a retry policy (429 / 5xx with
+exponential backoff, Retry-After honoured up to a cap) and a default timeout
+per host. Defaults can be overridden per site in site_config.json:
+
+	"freightmas_http": {"traqo": {"retries": 3, "timeout": [5, 90]}}
+"""
+
+from __future__ import annotations
+
+import threading
+from urllib.parse import urlsplit
+
+import frappe
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Per-service defaults. `timeout` is (connect, read) seconds; `hosts` maps a host
+# to its own timeout when one service talks to several hosts.
+SERVICE_DEFAULTS = {
+	"traqo": {
+		"retries": 2,
+		"backoff_factor": 0.5,
+		"status_forcelist": (429, 500, 502, 503, 504),
+		"allowed_methods": ("GET", "DELETE"),
+		"timeout": (10, 60),
+	},
+	"searates": {
+		"retries": 2,
+		"backoff_factor": 0.5,
+		"status_forcelist": (429, 500, 502, 503, 504),
+		"allowed_methods": ("GET",),
+		"timeout": (10, 60),
+	},
+	"resend": {
+		# POSTs are only retried where the request was certainly not processed.
+		"retries": 2,
+		"backoff_factor": 0.5,
+		"status_forcelist": (429, 503),
+		"allowed_methods": ("POST",),
+		"timeout": (10, 30),
+	},
+}
+
+FALLBACK_DEFAULTS = {
+	"retries": 2,
+	"backoff_factor": 0.5,
+	"status_forcelist": (429, 502, 503, 504),
+	"allowed_methods": ("GET", "HEAD", "OPTIONS"),
+	"timeout": (10, 30),
+}
+
+POOL_SIZE = 10
+MAX_RETRY_AFTER = 30  # seconds - never block a worker longer than this on Retry-After
+
+_sessions = threading.local()
+
+
+class _CappedRetry(Retry):
+	"""Retry that honours Retry-After but never sleeps longer than MAX_RETRY_AFTER."""
+
+	def get_retry_after(self, response):
+		retry_after = super().get_retry_after(response)
+		if retry_after is None:
+			return None
+		return min(retry_after, MAX_RETRY_AFTER)
+
+
+def get_service_config(service):
+	config = dict(SERVICE_DEFAULTS.get(service, FALLBACK_DEFAULTS))
+	overrides = (frappe.conf.get("freightmas_http") or {}).get(service) or {}
+	config.update(overrides)
+	config["timeout"] = _as_timeout(config.get("timeout"))
+	config["hosts"] = {host: _as_timeout(t) for host, t in (config.get("hosts") or {}).items()}
+	return config
+
+
+def _as_timeout(value):
+	# site_config.json gives lists; requests wants a (connect, read) tuple or a number
+	return tuple(value) if isinstance(value, list) else value
+
+
+def get_session(service):
+	"""Return this thread's pooled session for `service`, creating it on first use."""
+	registry = getattr(_sessions, "registry", None)
+	if registry is None:
+		registry = _sessions.registry = {}
+
+	session = registry.get(service)
+	if session is None:
+		session = registry[service] = _build_session(get_service_config(service))
+	return session
+
+
+def _build_session(config):
+	retry = _CappedRetry(
+		total=config["retries"],
+		connect=config["retries"],
+		read=0,  # a read timeout may mean the request was processed - never replay it
+		status=config["retries"],
+		backoff_factor=config["backoff_factor"],
+		status_forcelist=config["status_forcelist"],
+		allowed_methods=frozenset(config["allowed_methods"]),
+		respect_retry_after_header=True,
+		raise_on_status=False,
+	)
+	adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+	session = requests.Session()
+	session.mount("https://", adapter)
+	session.mount("http://", adapter)
+	return session
+
+
+def close_sessions():
+	"""Close and forget this thread's sessions (e.g. at the end of a worker thread)."""
+	registry = getattr(_sessions, "registry", None) or {}
+	for session in registry.values():
+		session.close()
+	_sessions.registry = {}
+
+
+def request(service, method, url, **kwargs):
+	"""`requests.request` over the service's pooled session with its default timeout."""
+	config = get_service_config(service)
+	if "timeout" not in kwargs:
+		host = urlsplit(url).hostname or ""
+		kwargs["timeout"] = config["hosts"].get(host, config["timeout"])
+	return get_session(service).request(method, url, **kwargs)
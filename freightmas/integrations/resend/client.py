@@ -6,10 +6,10 @@ from __future__ import annotations
 import json
 
 import frappe
-import requests
 from frappe import _
 from frappe.utils import cstr
 
+from freightmas.integrations import http_session
 from freightmas.integrations.resend.settings import get_api_key
 
 RESEND_API_URL = "https://api.resend.com/emails"
@@ -38,11 +38,12 @@ class ResendClient:
 		if idempotency_key:
 			headers["Idempotency-Key"] = idempotency_key
 
-		response = requests.post(
+		response = http_session.request(
+			"resend",
+			"POST",
 			RESEND_API_URL,
 			headers=headers,
 			data=json.dumps(payload),
-			timeout=30,
 		)
 
 		if response.ok:
@@ -12,6 +12,7 @@ import json
 import frappe
 import requests
 
+from freightmas.integrations import http_session
 from freightmas.integrations.tracking.base import (
 	compute_mappings,
 	extract_date,
@@ -36,10 +37,11 @@ def fetch_tracking(bl_number, tracking_type="BL", sealine=None):
 		params["sealine"] = sealine.strip()
 
 	try:
-		resp = requests.get(
+		resp = http_session.request(
+			"searates",
+			"GET",
 			"https://tracking.searates.com/tracking",
 			params=params,
-			timeout=60,
 		)
 		resp.raise_for_status()
 		result = resp.json()
@@ -8,6 +8,7 @@ import json
 import frappe
 import requests
 
+from freightmas.integrations import http_session
 from freightmas.integrations.tracking.base import (
 	compute_mappings,
 	extract_date,
@@ -25,7 +26,7 @@ def _headers(api_key):
 def _request(api_key, method, path, **kwargs):
 	url = f"{BASE_URL}{path}"
 	try:
-		resp = requests.request(method, url, headers=_headers(api_key), timeout=60, **kwargs)
+		resp = http_session.request("traqo", method, url, headers=_headers(api_key), **kwargs)
 	except requests.exceptions.Timeout:
 		frappe.throw("Traqo API request timed out. Please try again.")
 	except requests.exceptions.RequestException as e:
@@ -1,7 +1,13 @@
 # Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
 # For license information, please see license.txt
 
-"""Traqo webhook receiver."""
+"""Traqo webhook receiver.
+
+Deliveries are not refreshed one by one: each is folded into a pending entry
+keyed by BL number (or Traqo shipment id) and a per-minute scheduler job
+dispatches one refresh per key once the burst has gone quiet. A vessel arrival
+that fires an event per container therefore costs one refresh per job.
+"""
 
 import hashlib
 import hmac
@@ -47,19 +53,115 @@ def receive():
 	if delivery_id:
 		_mark_delivery_seen(delivery_id)
 
-	frappe.enqueue(
-		"freightmas.integrations.tracking.webhook.process_webhook_event",
-		queue="short",
-		event=event,
-		data=data,
-		delivery_id=delivery_id,
-	)
+	key = coalesce_webhook_event(event, data)
+	return {"ok": True, "queued": bool(key)}
+
+
+# ── Coalescing stage ─────────────────────────────────────────────────────────
+
+PENDING_KEY = "traqo_webhook:pending"
+RECEIVED_COUNTER = "traqo_webhook:events_received"
+DISPATCHED_COUNTER = "traqo_webhook:refreshes_dispatched"
 
-	return {"ok": True}
+QUIET_WINDOW_SEC = 30  # flush once no event has arrived for this long...
+MAX_WAIT_SEC = 300  # ...or once the first event has waited this long
 
 
-def process_webhook_event(event, data, delivery_id=None):
-	"""Process a Traqo webhook asynchronously."""
+def coalesce_webhook_event(event, data):
+	"""Record a delivery against its BL / shipment key. Returns the key, or None
+	when the payload carries neither identifier."""
+	reference = (data.get("reference_number") or "").strip()
+	shipment_id = (data.get("shipment_id") or "").strip()
+	if not reference and not shipment_id:
+		return None
+
+	key = f"ref:{reference}" if reference else f"sid:{shipment_id}"
+	cache = frappe.cache()
+	now = time.time()
+
+	entry = cache.hget(PENDING_KEY, key) or {
+		"reference_number": reference,
+		"shipment_id": shipment_id,
+		"first_seen": now,
+		"events": 0,
+	}
+	entry["last_seen"] = now
+	entry["last_event"] = event
+	entry["events"] += 1
+	if shipment_id and not entry.get("shipment_id"):
+		entry["shipment_id"] = shipment_id
+	cache.hset(PENDING_KEY, key, entry)
+	_incr(RECEIVED_COUNTER)
+	return key
+
+
+def flush_pending_refreshes():
+	"""Scheduler (every minute): dispatch one refresh per settled BL / shipment key.
+
+	The entry is removed before its refresh is enqueued, so an event arriving
+	meanwhile opens a fresh entry and triggers another refresh later - at least
+	once, never lost.
+	"""
+	cache = frappe.cache()
+	now = time.time()
+	dispatched = 0
+
+	for raw_key in cache.hkeys(PENDING_KEY) or []:
+		key = frappe.safe_decode(raw_key)
+		entry = cache.hget(PENDING_KEY, key)
+		if not entry:
+			continue
+		settled = now - entry["last_seen"] >= QUIET_WINDOW_SEC
+		overdue = now - entry["first_seen"] >= MAX_WAIT_SEC
+		if not (settled or overdue):
+			continue
+
+		cache.hdel(PENDING_KEY, key)
+		frappe.enqueue(
+			"freightmas.integrations.tracking.webhook.process_webhook_event",
+			queue="short",
+			event=entry.get("last_event"),
+			data={
+				"reference_number": entry.get("reference_number"),
+				"shipment_id": entry.get("shipment_id"),
+			},
+			coalesced_events=entry["events"],
+		)
+		dispatched += 1
+
+	if dispatched:
+		_incr(DISPATCHED_COUNTER, dispatched)
+	return dispatched
+
+
+@frappe.whitelist()
+def get_webhook_queue_stats():
+	"""Queue depth and coalesce ratio (events received per refresh dispatched)."""
+	frappe.only_for("System Manager")
+
+	cache = frappe.cache()
+	received = _counter(RECEIVED_COUNTER)
+	dispatched = _counter(DISPATCHED_COUNTER)
+	return {
+		"queue_depth": len(cache.hkeys(PENDING_KEY) or []),
+		"events_received": received,
+		"refreshes_dispatched": dispatched,
+		"coalesce_ratio": round(received / dispatched, 2) if dispatched else None,
+	}
+
+
+def _incr(counter, amount=1):
+	cache = frappe.cache()
+	cache.incrby(cache.make_key(counter), amount)
+
+
+def _counter(counter):
+	cache = frappe.cache()
+	return int(cache.get(cache.make_key(counter)) or 0)
+
+
+def process_webhook_event(event, data, delivery_id=None, coalesced_events=1):
+	"""Refresh every tracked job matching a Traqo shipment (one or more coalesced events)."""
 	reference = (data.get("reference_number") or "").strip()
 	shipment_id = (data.get("shipment_id") or "").strip()
 
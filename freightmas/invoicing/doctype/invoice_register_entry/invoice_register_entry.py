@@ -3,9 +3,8 @@
 
 import frappe
 from frappe.model.document import Document
-from frappe.utils import flt, now_datetime, get_datetime, add_to_date
+from frappe.utils import flt, now_datetime, get_datetime, getdate, add_to_date
 from frappe import _
-from datetime import timedelta
 
 
 # ========================================================
@@ -97,23 +96,45 @@ NUMERIC_CHILD_FIELDS = {"qty", "rate", "line_amount", "line_tax_amount", "line_t
 # WORKING DAYS UTILITY
 # ========================================================
 
-def _count_working_days(start_dt, end_dt):
-    """Count weekday (Mon–Fri) days between two datetimes."""
+def _count_working_days(start_dt, end_dt, holidays=None):
+    """Count weekday (Mon–Fri) days between two datetimes, less any
+    `holidays` (dates) that fall on a weekday in the range.
+
+    Closed form: whole weeks contribute 5 days each, and only the 0–6
+    leftover days are looked at individually.
+    """
     if not start_dt or not end_dt:
         return 0.0
     start = get_datetime(start_dt).date()
     end = get_datetime(end_dt).date()
     if end <= start:
         return 0.0
-    days = 0
-    current = start
-    while current < end:
-        if current.weekday() < 5:  # 0=Mon … 4=Fri
-            days += 1
-        current += timedelta(days=1)
+    weeks, leftover = divmod((end - start).days, 7)
+    first = start.weekday()  # 0=Mon … 6=Sun
+    days = weeks * 5 + sum(1 for i in range(leftover) if (first + i) % 7 < 5)
+    if holidays:
+        days -= sum(
+            1 for holiday in {getdate(h) for h in holidays}
+            if start <= holiday < end and holiday.weekday() < 5
+        )
     return float(days)
 
 
+def _get_holiday_dates(company, start_dt, end_dt):
+    """Holidays on the company's default Holiday List between two datetimes."""
+    holiday_list = company and frappe.get_cached_value("Company", company, "default_holiday_list")
+    if not holiday_list or not start_dt or not end_dt:
+        return []
+    return frappe.get_all(
+        "Holiday",
+        filters={
+            "parent": holiday_list,
+            "holiday_date": ["between", [getdate(start_dt), getdate(end_dt)]],
+        },
+        pluck="holiday_date",
+    )
+
+
 # ========================================================
 # DOCUMENT CLASS
 # ========================================================
@@ -443,7 +464,12 @@ class InvoiceRegisterEntry(Document):
                 )
             capture_override = True
 
-        working_days = _count_working_days(self.current_status_since, now_datetime())
+        status_ended = now_datetime()
+        working_days = _count_working_days(
+            self.current_status_since,
+            status_ended,
+            _get_holiday_dates(self.company, self.current_status_since, status_ended),
+        )
 
         # Compute new SLA deadline before writing to DB
         self.status = new_status
@@ -894,37 +920,36 @@ def update_overdue_entries():
     """
     Daily task: sync is_overdue on all non-terminal Invoice Register Entries.
 
-    Marking happens in bulk via db_set to avoid triggering validate hooks on
-    every entry. update_modified=False keeps the audit trail clean.
+    Each pass is one UPDATE scoped by its filters, so the sweep runs in a
+    constant number of queries whatever the backlog. Writing straight to the
+    table skips validate hooks, and update_modified=False keeps the audit
+    trail clean.
     """
     now = now_datetime()
 
-    entries_to_flag = frappe.db.get_all(
+    # Flag entries past their SLA window
+    frappe.db.set_value(
         "Invoice Register Entry",
-        filters={
+        {
             "status": ["not in", list(TERMINAL_STATES)],
             "sla_due_at": ["<", now],
             "is_overdue": 0,
         },
-        pluck="name",
+        "is_overdue",
+        1,
+        update_modified=False,
     )
-    for name in entries_to_flag:
-        frappe.db.set_value(
-            "Invoice Register Entry", name, "is_overdue", 1, update_modified=False
-        )
 
-    entries_to_clear = frappe.db.get_all(
+    # Clear the flag on entries that have since reached a terminal state
+    frappe.db.set_value(
         "Invoice Register Entry",
-        filters={
+        {
             "status": ["in", list(TERMINAL_STATES)],
             "is_overdue": 1,
         },
-        pluck="name",
+        "is_overdue",
+        0,
+        update_modified=False,
     )
-    for name in entries_to_clear:
-        frappe.db.set_value(
-            "Invoice Register Entry", name, "is_overdue", 0, update_modified=False
-        )
 
-    if entries_to_flag or entries_to_clear:
-        frappe.db.commit()
+    frappe.db.commit()
@@ -1,10 +1,14 @@
 # Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and Contributors
 # See license.txt
 
+from datetime import timedelta
+from unittest.mock import patch
+
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from frappe.utils import get_datetime, now_datetime
+from frappe.utils import get_datetime, getdate, now_datetime
 
+from freightmas.invoicing.doctype.invoice_register_entry import invoice_register_entry
 from freightmas.invoicing.doctype.invoice_register_entry.invoice_register_entry import (
     _count_working_days,
     PURCHASE_TRANSITIONS,
@@ -194,10 +198,42 @@ class TestInvoiceRegisterEntry(FrappeTestCase):
         self.assertEqual(_count_working_days(None, now_datetime()), 0.0)
         self.assertEqual(_count_working_days(now_datetime(), None), 0.0)
 
+    def test_count_working_days_matches_day_walk(self):
+        start = getdate("2026-05-01")
+        for offset in range(7):
+            for length in range(0, 800, 37):
+                first = start + timedelta(days=offset)
+                last = first + timedelta(days=length)
+                walked = sum(
+                    1 for i in range(length) if (first + timedelta(days=i)).weekday() < 5
+                )
+                self.assertEqual(_count_working_days(first, last), float(walked))
+
+    def test_count_working_days_skips_weekday_holidays(self):
+        # Mon 2026-05-04 → Mon 2026-05-11 = 5 working days; a Wednesday
+        # holiday removes one, a Saturday holiday and one outside the range don't.
+        start = get_datetime("2026-05-04 09:00:00")
+        end = get_datetime("2026-05-11 09:00:00")
+        holidays = ["2026-05-06", "2026-05-09", "2026-05-12"]
+        self.assertEqual(_count_working_days(start, end, holidays), 4.0)
+
     # ----------------------------------------------------------
     # SLA / overdue
     # ----------------------------------------------------------
 
+    def test_overdue_sweep_runs_constant_queries(self):
+        calls = []
+        with patch.object(frappe.db, "set_value", side_effect=lambda *a, **k: calls.append((a, k))), \
+                patch.object(frappe.db, "commit"):
+            invoice_register_entry.update_overdue_entries()
+
+        self.assertEqual(len(calls), 2)
+        (flag_args, _flag_kwargs), (clear_args, _clear_kwargs) = calls
+        self.assertEqual(flag_args[1]["is_overdue"], 0)
+        self.assertEqual(flag_args[2:], ("is_overdue", 1))
+        self.assertEqual(clear_args[1]["status"], ["in", list(TERMINAL_STATES)])
+        self.assertEqual(clear_args[2:], ("is_overdue", 0))
+
     def test_compute_is_overdue_returns_zero_for_terminal_state(self):
         doc = _make_entry("Purchase", "Captured")
         doc.sla_due_at = "2020-01-01 00:00:00"  # well past
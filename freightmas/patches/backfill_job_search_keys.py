@@ -0,0 +1,17 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd
+# For license information, please see license.txt
+
+"""Build the Job Search Key index for existing Forwarding, Clearing and Border Clearing Jobs."""
+
+import frappe
+
+from freightmas.utils.search_index import INDEXED_JOBS, rebuild_search_index
+
+
+def execute():
+	if not frappe.db.table_exists("Job Search Key"):
+		return
+
+	for job_doctype in INDEXED_JOBS:
+		rebuild_search_index(job_doctype)
+		frappe.db.commit()
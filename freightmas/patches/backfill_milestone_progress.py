@@ -0,0 +1,30 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd
+# For license information, please see license.txt
+
+"""Backfill milestone_total, milestone_done and milestone_percent on existing Forwarding Jobs."""
+
+import frappe
+
+from freightmas.forwarding_service.utils.milestone_progress import milestone_progress_counts, overall_milestone_percent
+
+
+def execute():
+	if not frappe.db.has_column("Forwarding Job", "milestone_percent"):
+		return
+
+	jobs = frappe.get_all("Forwarding Job", pluck="name")
+	for name in jobs:
+		doc = frappe.get_doc("Forwarding Job", name)
+		total, done = milestone_progress_counts(doc)
+		frappe.db.set_value(
+			"Forwarding Job",
+			name,
+			{
+				"milestone_total": total,
+				"milestone_done": done,
+				"milestone_percent": overall_milestone_percent(total, done),
+			},
+			update_modified=False,
+		)
+
+	frappe.db.commit()
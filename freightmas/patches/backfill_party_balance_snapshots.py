@@ -0,0 +1,16 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd
+# For license information, please see license.txt
+
+"""Build the month-end Party Balance Snapshots used for statement opening balances."""
+
+import frappe
+
+from freightmas.utils.party_balance import rebuild_party_balance_snapshots
+
+
+def execute():
+	if not frappe.db.table_exists("Party Balance Snapshot"):
+		return
+
+	rebuild_party_balance_snapshots()
+	frappe.db.commit()
@@ -0,0 +1,117 @@
+# Buffered writer for Client Portal Access Log.
+#
+# freightmas.portal.security.log_portal_access appends each audit row to a
+# Redis list instead of inserting a document inside the portal request. The
+# buffer is drained in bulk inserts by a per-minute cron and, when it grows
+# past FLUSH_SIZE, by a background job enqueued straight away.
+#
+# Delivery is at-least-once and duplicate-free: every row gets its document
+# name when it is buffered, a flush first moves the whole buffer to an
+# in-flight list (RENAME is atomic, so new rows land in a fresh buffer), and
+# the in-flight list is only deleted after the insert commits. A flush that
+# dies half-way leaves its rows in-flight; the next flush inserts them again
+# with duplicate names ignored. Because the buffer lives in Redis rather than
+# in the worker, a worker shutting down never takes unflushed rows with it.
+
+import frappe
+
+DOCTYPE = "Client Portal Access Log"
+BUFFER_KEY = "freightmas:portal_access_log:buffer"
+INFLIGHT_KEY = "freightmas:portal_access_log:inflight"
+FLUSH_LOCK_KEY = "freightmas:portal_access_log:flush_lock"
+
+FLUSH_SIZE = 200  # buffered rows that trigger an immediate background flush
+FLUSH_LOCK_TTL = 300  # seconds
+INSERT_CHUNK = 500
+
+LOG_FIELDS = [
+	"user", "customer", "party_type", "party", "action",
+	"reference_doctype", "reference_name", "ip_address", "timestamp",
+]
+_STANDARD_FIELDS = ["name", "owner", "modified_by", "creation", "modified", "docstatus"]
+
+
+def buffer_access_log(row):
+	"""Append one audit row (a dict of LOG_FIELDS) to the Redis buffer.
+
+	Raises whatever Redis raises if the row could not be pushed;
+	log_portal_access falls back to a direct insert in that case. Nothing
+	raises once the row is buffered, so it is never inserted twice.
+	"""
+	row = dict(row)
+	row["name"] = frappe.generate_hash(length=10)
+	cache = frappe.cache()
+	# RedisWrapper.rpush returns None, not the new length
+	cache.rpush(BUFFER_KEY, frappe.as_json(row, indent=None))
+
+	try:
+		if (cache.llen(BUFFER_KEY) or 0) % FLUSH_SIZE == 0:
+			frappe.enqueue(
+				"freightmas.portal.access_log.flush_access_log",
+				queue="short",
+				job_id="freightmas_portal_access_log_flush",
+				deduplicate=True,
+			)
+	except Exception:
+		# The row is buffered; the per-minute cron will pick it up.
+		pass
+
+
+def flush_access_log():
+	"""Cron / background job: bulk insert every buffered audit row.
+
+	Returns the number of rows written (duplicates from a retried flush are
+	counted but skipped by the insert).
+	"""
+	cache = frappe.cache()
+	lock_key = cache.make_key(FLUSH_LOCK_KEY)
+	if not cache.set(lock_key, frappe.local.site, nx=True, ex=FLUSH_LOCK_TTL):
+		return 0
+
+	written = 0
+	try:
+		inflight = cache.make_key(INFLIGHT_KEY)
+		# Leftovers from a flush that died are retried before new rows are taken.
+		if not cache.exists(INFLIGHT_KEY):
+			try:
+				cache.rename(cache.make_key(BUFFER_KEY), inflight)
+			except Exception:
+				# No buffer key - nothing has been logged since the last flush.
+				return 0
+
+		rows = [frappe.parse_json(raw) for raw in cache.lrange(INFLIGHT_KEY, 0, -1)]
+		written = _insert_rows(rows)
+		frappe.db.commit()
+		cache.delete(inflight)
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(frappe.get_traceback(), "Client Portal Access Log Flush Error")
+	finally:
+		cache.delete(lock_key)
+
+	return written
+
+
+def _insert_rows(rows):
+	values = []
+	for row in rows:
+		stamp = row.get("timestamp") or frappe.utils.now()
+		user = row.get("user") or "Guest"
+		values.append(
+			[row["name"], user, user, stamp, stamp, 0] + [row.get(field) for field in LOG_FIELDS]
+		)
+
+	for start in range(0, len(values), INSERT_CHUNK):
+		frappe.db.bulk_insert(
+			DOCTYPE,
+			_STANDARD_FIELDS + LOG_FIELDS,
+			values[start:start + INSERT_CHUNK],
+			ignore_duplicates=True,
+		)
+	return len(values)
+
+
+def get_buffered_count():
+	"""Rows waiting to be written (buffer plus any in-flight retry)."""
+	cache = frappe.cache()
+	return (cache.llen(BUFFER_KEY) or 0) + (cache.llen(INFLIGHT_KEY) or 0)
@@ -21,7 +21,8 @@ from freightmas.portal.security import (
 	log_portal_access,
 )
 from freightmas.forwarding_service.utils.operational_phase import get_phase_label
-from freightmas.forwarding_service.utils.milestone_progress import forwarding_milestone_progress_map
+from freightmas.utils.dashboard_common import cached_count, paginate_job_list
+from freightmas.utils.search_index import job_search_or_filters
 
 NOT_ACTIVE_STATUSES = ["Completed", "Closed", "Cancelled"]
 
@@ -30,7 +31,7 @@ JOB_LIST_FIELDS = [
 	"status", "operational_phase", "operational_substage",
 	"port_of_loading", "port_of_discharge", "destination",
 	"vessel_flight_no", "bl_number", "cargo_count", "eta", "ata", "etd", "atd",
-	"discharge_date", "current_comment", "last_updated_on",
+	"discharge_date", "current_comment", "last_updated_on", "milestone_percent", "modified",
 ]
 
 # ============================================================
@@ -165,11 +166,7 @@ def _job_list_filters(customers, status=None, direction=None, operational_phase=
 
 	or_filters = None
 	if search:
-		or_filters = [
-			["name", "like", f"%{search}%"],
-			["customer_reference", "like", f"%{search}%"],
-			["bl_number", "like", f"%{search}%"],
-		]
+		or_filters = job_search_or_filters("Forwarding Job", search, filters=filters)
 	return filters, or_filters
 
 
@@ -242,7 +239,7 @@ def _resolve_milestone_report_mode(customer=None):
 
 
 @frappe.whitelist()
-def get_jobs(status=None, direction=None, operational_phase=None, search=None, limit_start=0, limit_page_length=20):
+def get_jobs(status=None, direction=None, operational_phase=None, search=None, limit_start=0, limit_page_length=20, cursor=None):
 	check_portal_access()
 	customers = _caller_customer_filter()
 
@@ -252,22 +249,26 @@ def get_jobs(status=None, direction=None, operational_phase=None, search=None, l
 	# permissions by design (see freightmas/portal/security.py) - the
 	# explicit `customer` filter above is the actual access boundary, not
 	# Frappe's own permission system, so it must not be re-checked here.
-	jobs = frappe.get_all(
-		"Forwarding Job",
-		filters=filters,
-		or_filters=or_filters,
-		fields=JOB_LIST_FIELDS,
-		order_by="modified desc",
-		limit_start=frappe.utils.cint(limit_start),
-		limit_page_length=frappe.utils.cint(limit_page_length),
+	def fetch(page_filters, order_by, start, page_length):
+		return frappe.get_all(
+			"Forwarding Job",
+			filters=page_filters,
+			or_filters=or_filters,
+			fields=JOB_LIST_FIELDS,
+			order_by=order_by,
+			limit_start=start,
+			limit_page_length=page_length,
+		)
+
+	jobs, next_cursor = paginate_job_list(
+		fetch, filters, cursor=cursor, limit_start=limit_start, limit_page_length=limit_page_length
 	)
 
-	total_count = frappe.db.count("Forwarding Job", filters=filters)
+	total_count = cached_count("Forwarding Job", filters)
 
-	progress_map = forwarding_milestone_progress_map([j.name for j in jobs])
 	today = getdate(nowdate())
 	for j in jobs:
-		j["milestone_percent"] = progress_map.get(j.name, 0)
+		j["milestone_percent"] = frappe.utils.cint(j.milestone_percent)
 		j["operational_phase_label"] = get_phase_label(j.get("operational_phase"))
 		j["is_overdue"] = bool(
 			(j.direction == "Import" and j.eta and getdate(j.eta) < today and not j.ata)
@@ -276,7 +277,7 @@ def get_jobs(status=None, direction=None, operational_phase=None, search=None, l
 
 	log_portal_access("list_shipments", doctype="Forwarding Job")
 
-	return {"jobs": jobs, "total_count": total_count}
+	return {"jobs": jobs, "total_count": total_count, "next_cursor": next_cursor}
 
 
 @frappe.whitelist()
@@ -13,7 +13,12 @@
 import frappe
 from frappe import _
 
-from freightmas.portal.security import CUSTOMER_PORTAL_ROLE, SUPPLIER_PORTAL_ROLE, UNIVERSAL_ROLES
+from freightmas.portal.security import (
+	CUSTOMER_PORTAL_ROLE,
+	SUPPLIER_PORTAL_ROLE,
+	UNIVERSAL_ROLES,
+	clear_portal_entitlements,
+)
 
 # link_doctype -> portal role granted when a Contact carries that link type.
 PARTY_ROLE_MAP = {
@@ -24,6 +29,12 @@ PARTY_ROLE_MAP = {
 
 def sync_portal_user_on_contact_save(doc, method=None):
 	"""Contact validate hook: enforce portal constraints on doc.user."""
+	# Links or the linked user may be changing - the cached entitlements of
+	# both the current and any previous user are stale either way.
+	previous = doc.get_doc_before_save()
+	for user in {doc.user, previous.user if previous else None} - {None, ""}:
+		clear_portal_entitlements(user)
+
 	if not doc.user:
 		return
 
@@ -47,6 +58,8 @@ def sync_portal_user_on_contact_save(doc, method=None):
 def enforce_portal_user_type(doc, method=None):
 	"""User validate hook: re-apply portal constraints whenever the User
 	record itself is edited (e.g. someone manually adds a Desk role)."""
+	clear_portal_entitlements(doc.name)
+
 	# A user can hold more than one Contact record - aggregate links across
 	# all of them, the same as freightmas.portal.security.get_portal_party_names,
 	# or a user provisioned via a second Contact could lose a portal role
@@ -73,6 +86,20 @@ def enforce_portal_user_type(doc, method=None):
 	_apply_portal_constraints(doc, portal_roles)
 
 
+def clear_portal_entitlements_on_trash(doc, method=None):
+	"""Contact/User on_trash hook: a deleted Contact or User must stop
+	resolving to cached entitlements."""
+	user = doc.user if doc.doctype == "Contact" else doc.name
+	if user:
+		clear_portal_entitlements(user)
+
+
+def clear_all_portal_entitlements(doc=None, method=None):
+	"""Role on_update hook: a role's desk_access feeds every cached
+	Desk-role verdict."""
+	clear_portal_entitlements()
+
+
 def _apply_portal_constraints(user_doc, portal_roles):
 	"""Force user_doc into a valid portal-login shape.
 
@@ -20,6 +20,17 @@ SUPPLIER_PORTAL_ROLE = "Supplier Portal User"
 # these as evidence of a Desk-access account.
 UNIVERSAL_ROLES = frozenset({"All", "Guest"})
 
+# Per-user entitlement cache: the inputs of check_portal_access (user type,
+# roles, Desk-role verdict) and the Customer/Supplier names the user's
+# Contacts link to. Cleared by the Contact/User/Role hooks in
+# freightmas.portal.provisioning whenever any of those inputs change, and
+# again after the commit so a request racing the save cannot re-cache the
+# old state. The TTL only bounds staleness from writes that bypass document
+# hooks (e.g. a party rename rewriting Dynamic Link rows in SQL).
+ENTITLEMENT_CACHE_PREFIX = "freightmas:portal_entitlements:"
+ENTITLEMENT_CACHE_TTL = 300  # seconds
+CACHED_PARTY_DOCTYPES = ("Customer", "Supplier")
+
 
 def check_portal_access(role=PORTAL_ROLE):
 	"""Verify the current session is a provisioned, desk-locked portal user.
@@ -40,22 +51,15 @@ def check_portal_access(role=PORTAL_ROLE):
 	if user == "Guest":
 		frappe.throw(_("Please login to access this portal."), frappe.PermissionError)
 
-	user_type = frappe.db.get_value("User", user, "user_type")
-	if user_type != "Website User":
-		frappe.throw(_("You do not have permission to access this portal."), frappe.PermissionError)
+	entitlements = get_portal_entitlements(user)
 
-	roles = frappe.get_roles(user)
+	if entitlements["user_type"] != "Website User":
+		frappe.throw(_("You do not have permission to access this portal."), frappe.PermissionError)
 
-	if role not in roles:
+	if role not in entitlements["roles"]:
 		frappe.throw(_("You do not have permission to access this portal."), frappe.PermissionError)
 
-	non_universal_roles = set(roles) - UNIVERSAL_ROLES
-	has_desk_role = non_universal_roles and frappe.get_all(
-		"Role",
-		filters={"name": ["in", list(non_universal_roles)], "desk_access": 1},
-		limit=1,
-	)
-	if has_desk_role:
+	if entitlements["has_desk_role"]:
 		frappe.throw(_("You do not have permission to access this portal."), frappe.PermissionError)
 
 
@@ -74,24 +78,84 @@ def get_portal_party_names(link_doctype):
 	"""
 	user = frappe.session.user
 
+	if link_doctype in CACHED_PARTY_DOCTYPES:
+		return list(get_portal_entitlements(user)["parties"].get(link_doctype, []))
+
+	return _linked_party_names(user, [link_doctype]).get(link_doctype, [])
+
+
+def get_portal_entitlements(user):
+	"""Cached portal entitlement inputs for `user`.
+
+	Returns:
+		dict with user_type, roles, has_desk_role and parties
+			({"Customer": [...], "Supplier": [...]}). Built from the database
+			on a cache miss; see ENTITLEMENT_CACHE_PREFIX for invalidation.
+	"""
+	key = ENTITLEMENT_CACHE_PREFIX + user
+	entitlements = frappe.cache().get_value(key)
+	if entitlements is not None:
+		return entitlements
+
+	roles = frappe.get_roles(user)
+	non_universal_roles = set(roles) - UNIVERSAL_ROLES
+	has_desk_role = bool(non_universal_roles) and bool(
+		frappe.get_all(
+			"Role",
+			filters={"name": ["in", list(non_universal_roles)], "desk_access": 1},
+			limit=1,
+		)
+	)
+	entitlements = {
+		"user_type": frappe.db.get_value("User", user, "user_type"),
+		"roles": list(roles),
+		"has_desk_role": has_desk_role,
+		"parties": _linked_party_names(user, CACHED_PARTY_DOCTYPES),
+	}
+	frappe.cache().set_value(key, entitlements, expires_in_sec=ENTITLEMENT_CACHE_TTL)
+	return entitlements
+
+
+def _linked_party_names(user, link_doctypes):
+	"""{link_doctype: [party names]} across all of the user's Contacts."""
 	# A user can legitimately hold more than one Contact record (e.g. one
 	# per party they represent) - resolving to a single arbitrary Contact
 	# here would silently drop entitlements linked from any Contact but the
 	# one an unordered query happened to return.
 	contact_names = frappe.get_all("Contact", filters={"user": user}, pluck="name")
 	if not contact_names:
-		return []
+		return {}
 
-	names = frappe.get_all(
+	links = frappe.get_all(
 		"Dynamic Link",
 		filters={
 			"parenttype": "Contact",
 			"parent": ["in", contact_names],
-			"link_doctype": link_doctype,
+			"link_doctype": ["in", list(link_doctypes)],
 		},
-		pluck="link_name",
+		fields=["link_doctype", "link_name"],
+		order_by="idx asc",
 	)
-	return list(dict.fromkeys(names))
+	names = {}
+	for link in links:
+		party_names = names.setdefault(link.link_doctype, [])
+		if link.link_name not in party_names:
+			party_names.append(link.link_name)
+	return names
+
+
+def clear_portal_entitlements(user=None):
+	"""Drop cached entitlements for `user` (all users if None), now and again
+	once the current transaction commits."""
+
+	def clear():
+		if user:
+			frappe.cache().delete_value(ENTITLEMENT_CACHE_PREFIX + user)
+		else:
+			frappe.cache().delete_keys(ENTITLEMENT_CACHE_PREFIX)
+
+	clear()
+	frappe.db.after_commit.add(clear)
 
 
 def get_portal_customer_names():
@@ -143,8 +207,10 @@ def log_portal_access(action, doctype=None, docname=None, customer=None, party_t
 
 	Client Portal Access Log grants no permission to any portal role
 	(System Manager only), so a portal user can never read or tamper with
-	its own audit trail. Logging failures never block the underlying
-	request.
+	its own audit trail. Rows are buffered in Redis and bulk inserted
+	shortly afterwards (see freightmas.portal.access_log); if the buffer is
+	unavailable the row is inserted directly. Logging failures never block
+	the underlying request.
 
 	Args:
 		customer: legacy kwarg, kept so existing Customer-portal call sites
@@ -152,23 +218,30 @@ def log_portal_access(action, doctype=None, docname=None, customer=None, party_t
 		party_type / party: "Customer"/"Supplier" and the resolved party
 			name - preferred for new call sites.
 	"""
+	from freightmas.portal.access_log import buffer_access_log
+
 	if party_type is None and customer is not None:
 		party_type, party = "Customer", customer
 
+	row = {
+		"user": frappe.session.user,
+		"customer": party if party_type == "Customer" else None,
+		"party_type": party_type,
+		"party": party,
+		"action": action,
+		"reference_doctype": doctype,
+		"reference_name": docname,
+		"ip_address": frappe.local.request_ip if getattr(frappe.local, "request_ip", None) else None,
+		"timestamp": frappe.utils.now(),
+	}
+
+	try:
+		buffer_access_log(row)
+		return
+	except Exception:
+		pass
+
 	try:
-		frappe.get_doc(
-			{
-				"doctype": "Client Portal Access Log",
-				"user": frappe.session.user,
-				"customer": party if party_type == "Customer" else None,
-				"party_type": party_type,
-				"party": party,
-				"action": action,
-				"reference_doctype": doctype,
-				"reference_name": docname,
-				"ip_address": frappe.local.request_ip if getattr(frappe.local, "request_ip", None) else None,
-				"timestamp": frappe.utils.now(),
-			}
-		).insert(ignore_permissions=True)
+		frappe.get_doc({"doctype": "Client Portal Access Log", **row}).insert(ignore_permissions=True)
 	except Exception:
 		frappe.log_error(frappe.get_traceback(), "Client Portal Access Log Error")
@@ -167,34 +167,69 @@ const STANDARD_FILTERS = {
     }
 };
 
+// Build an export in a background job and offer the file once it is ready.
+// Polls get_export_status; identical in-flight requests share one job. The
+// file is offered as a link rather than opened: a window.open outside the
+// click handler is swallowed by popup blockers.
+function run_background_export(method, args) {
+    frappe.call({
+        method: "freightmas.utils.export_utils.start_export",
+        args: { method: method, kwargs: JSON.stringify(args) },
+    }).then(r => {
+        const export_id = r.message.export_id;
+        frappe.show_alert({ message: __("Preparing export..."), indicator: "blue" });
+
+        const poll = () => {
+            frappe.call({
+                method: "freightmas.utils.export_utils.get_export_status",
+                args: { export_id: export_id },
+            }).then(s => {
+                const status = s.message || {};
+                if (status.status === "completed") {
+                    frappe.hide_progress();
+                    frappe.msgprint({
+                        title: __("Export ready"),
+                        indicator: "green",
+                        message: `<a href="${encodeURI(status.file_url)}" target="_blank" rel="noopener" download>
+                            ${frappe.utils.escape_html(status.file_name || __("Download file"))}</a>`,
+                    });
+                } else if (status.status === "failed" || status.status === "not_found") {
+                    frappe.hide_progress();
+                    frappe.msgprint(status.message || __("Export failed"));
+                } else {
+                    frappe.show_progress(__("Exporting"), status.progress || 0, 100, status.message || "");
+                    setTimeout(poll, 2000);
+                }
+            });
+        };
+        poll();
+    });
+}
+
 // Standard export button setup
 function setup_standard_export_buttons(report, report_name, custom_exports = {}) {
     // Excel Export
     report.page.add_inner_button(__('Export to Excel'), function() {
         const filters = report.get_filter_values(true);
-        const query = encodeURIComponent(JSON.stringify(filters));
-        
-        let url;
+
         if (custom_exports.excel) {
-            url = `/api/method/${custom_exports.excel}?report_name=${encodeURIComponent(report_name)}&filters=${query}`;
+            const query = encodeURIComponent(JSON.stringify(filters));
+            window.open(`/api/method/${custom_exports.excel}?report_name=${encodeURIComponent(report_name)}&filters=${query}`);
         } else {
-            url = `/api/method/freightmas.api.export_report_to_excel?report_name=${encodeURIComponent(report_name)}&filters=${query}`;
+            run_background_export("freightmas.api.export_report_to_excel", { report_name: report_name, filters: JSON.stringify(filters) });
         }
-        window.open(url);
     }, __('Export'));
 
     // PDF Export  
     report.page.add_inner_button(__('Export to PDF'), function() {
         const filters = report.get_filter_values(true);
-        const query = encodeURIComponent(JSON.stringify(filters));
-        
-        let url;
+
         if (custom_exports.pdf) {
-            url = `/api/method/${custom_exports.pdf}?report_name=${encodeURIComponent(report_name)}&filters=${query}`;
+            const query = encodeURIComponent(JSON.stringify(filters));
+            window.open(`/api/method/${custom_exports.pdf}?report_name=${encodeURIComponent(report_name)}&filters=${query}`);
         } else {
-            url = `/api/method/freightmas.api.export_report_to_pdf?report_name=${encodeURIComponent(report_name)}&filters=${query}`;
+            run_background_export("freightmas.api.export_report_to_pdf", { report_name: report_name, filters: JSON.stringify(filters) });
         }
-        window.open(url);
     }, __('Export'));
 
     // Clear Filters - Standalone button between Export and Actions
@@ -331,6 +366,7 @@ function create_standard_report_config(report_name, filter_type = "job_register"
 window.FreightmasReportUtils = {
     STANDARD_FILTERS,
     setup_standard_export_buttons,
+    run_background_export,
     clear_all_filters,
     validate_filters,
     get_job_register_filters,
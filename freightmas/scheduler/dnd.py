@@ -1,39 +1,302 @@
+import hashlib
+import time
+
 import frappe
-from freightmas.utils.forwarding_dnd_calculator import refresh_and_calculate_dnd
+from frappe.utils import flt, getdate, nowdate
+
+from freightmas.utils.forwarding_dnd_calculator import (
+	RATE_CARD_FIELDS,
+	CONTAINER_RATE_FIELDS,
+	apply_dnd_figures,
+	fallback_free_days_for,
+	get_rate_card_index,
+	refresh_and_calculate_dnd,
+	resolve_rate_card,
+)
+
+
+# Jobs are processed (and committed) in chunks so IN-lists and memory stay bounded.
+BATCH_SIZE = 500
+
+# Redis hash of job name -> fingerprint of the inputs used on the last successful run.
+FINGERPRINT_CACHE_KEY = "freightmas:dnd_recalc_fingerprint"
+
+# DND row fields copied from the cargo parcel on every refresh.
+ROW_INPUT_FIELDS = [
+	"container_number", "container_type", "discharge_date", "gate_out_date",
+	"empty_return_date", "to_be_returned", "is_hazardous",
+]
+
+# DND row fields written by apply_dnd_figures.
+ROW_FIGURE_FIELDS = [
+	"rate_card", "rate_card_currency", "dnd_free_days", "storage_free_days",
+	"dnd_rate_per_day", "storage_rate_per_day", "total_dnd_days", "chargeable_dnd_days",
+	"estimated_dnd_cost", "total_storage_days", "chargeable_storage_days",
+	"estimated_storage_cost", "total_container_cost",
+]
+
+_DATE_FIELDS = {"discharge_date", "gate_out_date", "empty_return_date"}
+_NUMERIC_FIELDS = {
+	"to_be_returned", "is_hazardous", "dnd_free_days", "storage_free_days",
+	"dnd_rate_per_day", "storage_rate_per_day", "total_dnd_days", "chargeable_dnd_days",
+	"estimated_dnd_cost", "total_storage_days", "chargeable_storage_days",
+	"estimated_storage_cost", "total_container_cost",
+}
+
+TOTAL_FIELDS = ["total_est_dnd_cost", "total_est_storage_cost", "total_est_dnd_storage_cost"]
 
 
 def recalculate_open_job_dnd():
-	"""Daily: recalculate DND & Storage for all open Forwarding Jobs that have DND rows populated."""
+	"""Daily: recalculate DND & Storage for all open Forwarding Jobs that have DND rows populated.
+
+	Batch engine: cargo rows, DND rows, rate cards and shipping line free days are
+	loaded for a whole chunk of jobs in a handful of queries, figures are computed in
+	memory with the same rules as refresh_and_calculate_dnd, and only the DND rows /
+	job totals whose values actually changed are written back with bulk updates.
+
+	A job whose inputs (cargo dates, rate card, rates — and today's date while any
+	container clock is still running) match the previous run is skipped outright.
+	Jobs whose containers were added or removed since the DND rows were built fall
+	back to the document path so rows are rebuilt exactly as the form would.
+	"""
+	started = time.monotonic()
 	open_jobs = frappe.get_all(
 		"Forwarding Job",
 		filters={
 			"status": ["not in", ["Closed", "Cancelled"]],
 			"docstatus": ["<", 2],
 		},
-		pluck="name",
+		fields=["name", "direction", "shipping_line", "port_of_discharge", "discharge_date"]
+		+ TOTAL_FIELDS,
+		order_by="name asc",
 	)
 
-	success = 0
-	skipped = 0
-	failed = 0
+	stats = frappe._dict(updated=0, unchanged=0, skipped=0, rebuilt=0, failed=0)
+	for start in range(0, len(open_jobs), BATCH_SIZE):
+		_process_batch(open_jobs[start:start + BATCH_SIZE], stats)
 
-	for job_name in open_jobs:
+	elapsed = time.monotonic() - started
+	stats.jobs = len(open_jobs)
+	stats.seconds = round(elapsed, 2)
+	stats.jobs_per_second = round(len(open_jobs) / elapsed, 1) if elapsed else 0
+
+	frappe.logger().info(
+		f"DND scheduler: {stats.updated} updated, {stats.rebuilt} rebuilt, "
+		f"{stats.unchanged} unchanged, {stats.skipped} skipped (no DND rows), "
+		f"{stats.failed} failed — {stats.jobs} jobs in {stats.seconds}s "
+		f"({stats.jobs_per_second} jobs/s)"
+	)
+	return stats
+
+
+def _process_batch(jobs, stats):
+	job_names = [j.name for j in jobs]
+	as_of = getdate(nowdate())
+
+	dnd_rows = _rows_by_parent(
+		"Forwarding DND Storage Detail", job_names, "forwarding_dnd_storage_details",
+		["name", "parent", "cargo_parcel_reference"] + ROW_INPUT_FIELDS + ROW_FIGURE_FIELDS,
+	)
+	jobs = [j for j in jobs if dnd_rows.get(j.name)]
+	stats.skipped += len(job_names) - len(jobs)
+	if not jobs:
+		return
+
+	cargo_rows = _rows_by_parent(
+		"Cargo Parcel Details", [j.name for j in jobs], "cargo_parcel_details",
+		["name", "parent"] + ROW_INPUT_FIELDS,
+		filters={"cargo_type": "Containerised"},
+	)
+	rate_lookup = _load_rate_lookup({j.shipping_line for j in jobs if j.shipping_line})
+
+	cache = frappe.cache()
+	row_updates = {}
+	job_updates = {}
+	fingerprints = {}
+	rebuild = []
+	updated = 0
+
+	for job in jobs:
 		try:
-			doc = frappe.get_doc("Forwarding Job", job_name)
-			if not doc.forwarding_dnd_storage_details:
-				skipped += 1
+			existing = {r.cargo_parcel_reference: r for r in dnd_rows[job.name]}
+			cargo = cargo_rows.get(job.name, [])
+			if len(existing) != len(dnd_rows[job.name]) or set(existing) != {c.name for c in cargo}:
+				# Containers added/removed — rebuild rows through the document.
+				rebuild.append(job.name)
+				continue
+
+			header, rates, fallback_free_days = rate_lookup(job, as_of)
+			computed = [_computed_row(job, c, header, rates, fallback_free_days) for c in cargo]
+
+			fingerprint = _fingerprint(job, computed, header, rates, fallback_free_days, as_of)
+			if cache.hget(FINGERPRINT_CACHE_KEY, job.name) == fingerprint:
+				stats.unchanged += 1
 				continue
-			# Rebuild rows from current cargo before recalculating, so any container date
-			# changes (e.g. from an API sync) are reflected in the DND figures.
-			refresh_and_calculate_dnd(doc)
-			doc.save(ignore_permissions=True)
-			frappe.db.commit()
-			success += 1
+			fingerprints[job.name] = fingerprint
+
+			changed = False
+			for row in computed:
+				current = existing[row.cargo_parcel_reference]
+				diff = _diff(current, row, ROW_INPUT_FIELDS + ROW_FIGURE_FIELDS)
+				if diff:
+					row_updates[current.name] = diff
+					changed = True
+
+			totals = _job_totals(computed)
+			diff = _diff(job, totals, TOTAL_FIELDS)
+			if diff:
+				job_updates[job.name] = diff
+				changed = True
+
+			if changed:
+				updated += 1
+			else:
+				stats.unchanged += 1
 		except Exception:
-			failed += 1
-			frappe.db.rollback()
-			frappe.log_error(title=f"DND auto-recalc failed: {job_name}")
+			stats.failed += 1
+			fingerprints.pop(job.name, None)
+			frappe.log_error(title=f"DND auto-recalc failed: {job.name}")
 
-	frappe.logger().info(
-		f"DND scheduler: {success} updated, {skipped} skipped (no DND rows), {failed} failed"
+	try:
+		if row_updates:
+			frappe.db.bulk_update("Forwarding DND Storage Detail", row_updates, update_modified=False)
+		if job_updates:
+			frappe.db.bulk_update("Forwarding Job", job_updates, update_modified=False)
+		frappe.db.commit()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(title="DND auto-recalc batch write failed")
+		stats.failed += updated
+		stats.unchanged -= len(fingerprints) - updated
+		return
+
+	stats.updated += updated
+	for job_name, fingerprint in fingerprints.items():
+		cache.hset(FINGERPRINT_CACHE_KEY, job_name, fingerprint)
+
+	for job_name in rebuild:
+		_rebuild_job(job_name, stats)
+
+
+def _rebuild_job(job_name, stats):
+	"""Document path for jobs whose container set changed since the DND rows were built."""
+	try:
+		doc = frappe.get_doc("Forwarding Job", job_name)
+		# Rebuild rows from current cargo before recalculating, so any container date
+		# changes (e.g. from an API sync) are reflected in the DND figures.
+		refresh_and_calculate_dnd(doc)
+		doc.save(ignore_permissions=True)
+		frappe.db.commit()
+		frappe.cache().hdel(FINGERPRINT_CACHE_KEY, job_name)
+		stats.rebuilt += 1
+	except Exception:
+		stats.failed += 1
+		frappe.db.rollback()
+		frappe.log_error(title=f"DND auto-recalc failed: {job_name}")
+
+
+def _rows_by_parent(doctype, parents, parentfield, fields, filters=None):
+	rows = frappe.get_all(
+		doctype,
+		filters={
+			"parenttype": "Forwarding Job",
+			"parentfield": parentfield,
+			"parent": ["in", parents],
+			**(filters or {}),
+		},
+		fields=fields,
+		order_by="parent asc, idx asc",
+	)
+	grouped = {}
+	for row in rows:
+		grouped.setdefault(row.parent, []).append(row)
+	return grouped
+
+
+def _load_rate_lookup(shipping_lines):
+	"""Resolve rate cards from the process-level rate card index and fetch the
+	Shipping Line free days for the given shipping lines in one query; return a
+	resolver `(job, as_of) -> (header, {container_type: rates}, fallback_free_days)`."""
+	index = get_rate_card_index()
+	free_days = {}
+
+	if shipping_lines:
+		for sl in frappe.get_all(
+			"Shipping Line",
+			filters={"name": ["in", list(shipping_lines)]},
+			fields=["name", "free_days_import", "free_days_export"],
+		):
+			free_days[sl.name] = sl
+
+	def resolve(job, as_of):
+		header = resolve_rate_card(index, job.shipping_line, job.port_of_discharge, job.direction, as_of)
+		if header:
+			return header, header.rates, 0
+		fallback = 0
+		if job.shipping_line:
+			fallback = fallback_free_days_for(free_days.get(job.shipping_line), job.direction)
+		return None, {}, fallback
+
+	return resolve
+
+
+def _computed_row(job, cargo, header, rates, fallback_free_days):
+	row = frappe._dict(
+		cargo_parcel_reference=cargo.name,
+		container_number=cargo.container_number or "",
+		container_type=cargo.container_type,
+		discharge_date=cargo.discharge_date or job.discharge_date or None,
+		gate_out_date=cargo.gate_out_date,
+		empty_return_date=cargo.empty_return_date,
+		to_be_returned=cargo.to_be_returned,
+		is_hazardous=int(cargo.is_hazardous or 0),
 	)
+	apply_dnd_figures(row, header, rates.get(row.container_type), fallback_free_days, job.direction)
+	return row
+
+
+def _job_totals(rows):
+	total_dnd = sum(r.estimated_dnd_cost or 0 for r in rows)
+	total_storage = sum(r.estimated_storage_cost or 0 for r in rows)
+	return frappe._dict(
+		total_est_dnd_cost=total_dnd,
+		total_est_storage_cost=total_storage,
+		total_est_dnd_storage_cost=total_dnd + total_storage,
+	)
+
+
+def _fingerprint(job, rows, header, rates, fallback_free_days, as_of):
+	"""Hash of everything the figures depend on. Today's date is only part of it while
+	a container clock is still running (no end date), since only then do the day
+	counts move on their own."""
+	clock_running = any(
+		r.discharge_date and (
+			not r.gate_out_date or not (r.empty_return_date if r.to_be_returned else r.gate_out_date)
+		)
+		for r in rows
+	)
+	parts = [
+		job.direction, job.shipping_line, job.port_of_discharge,
+		[header.get(f) for f in RATE_CARD_FIELDS] if header else None,
+		sorted((ct, [r.get(f) for f in CONTAINER_RATE_FIELDS]) for ct, r in rates.items()),
+		fallback_free_days,
+		[[r.cargo_parcel_reference] + [r.get(f) for f in ROW_INPUT_FIELDS] for r in rows],
+		as_of if clock_running else None,
+	]
+	return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _diff(current, new, fields):
+	"""Return {field: new_value} for fields whose stored value differs."""
+	changed = {}
+	for field in fields:
+		old_value, new_value = current.get(field), new.get(field)
+		if field in _DATE_FIELDS:
+			same = (getdate(old_value) if old_value else None) == (getdate(new_value) if new_value else None)
+		elif field in _NUMERIC_FIELDS:
+			same = flt(old_value, 6) == flt(new_value, 6)
+		else:
+			same = (old_value or None) == (new_value or None)
+		if not same:
+			changed[field] = new_value
+	return changed
@@ -1,3 +1,8 @@
+import math
+import queue
+import threading
+import time
+
 import frappe
 from frappe.utils import now_datetime
 
@@ -55,7 +60,7 @@ def _run_tracking_for_doctype(doctype, updated_refs=None):
 			"api_tracking_status": ["not in", terminal_statuses],
 			"docstatus": ["<", 2],
 		},
-		fields=["name", "bl_number"],
+		fields=["name", "bl_number", "shipping_line", "traqo_shipment_id"],
 	)
 
 	if not jobs:
@@ -63,34 +68,208 @@ def _run_tracking_for_doctype(doctype, updated_refs=None):
 
 	if doctype == "Forwarding Job":
 		from freightmas.forwarding_service.doctype.forwarding_job.forwarding_job import (
-			fetch_containers_from_bl,
+			apply_tracking_to_job,
 		)
 	else:
 		from freightmas.clearing_service.doctype.clearing_job.clearing_job import (
-			fetch_containers_from_bl,
+			apply_tracking_to_job,
 		)
 
+	from freightmas.integrations.tracking.base import get_tracking_provider, require_sealine_for_traqo
+
+	provider = get_tracking_provider()
+	tracking_type = frappe.db.get_single_value("FreightMas Settings", "default_tracking_type") or "BL"
+
 	success = 0
 	failed = 0
 	skipped = 0
+	fetch_requests = []
 
 	for job in jobs:
 		if updated_refs is not None and job.bl_number not in updated_refs:
 			skipped += 1
 			continue
+		if not job.bl_number:
+			failed += 1
+			frappe.log_error(
+				title=f"Tracking update failed [{doctype}]: {job.name}",
+				message="BL Number is required to fetch tracking data.",
+			)
+			continue
+
+		try:
+			sealine = require_sealine_for_traqo(None, job.shipping_line)
+		except Exception:
+			failed += 1
+			frappe.clear_messages()
+			frappe.log_error(title=f"Tracking update failed [{doctype}]: {job.name}")
+			continue
+
+		fetch_requests.append(frappe._dict(
+			job=job.name,
+			number=job.bl_number,
+			tracking_type=tracking_type,
+			sealine=sealine,
+			traqo_shipment_id=job.traqo_shipment_id,
+		))
+
+	latencies = []
+
+	# Provider calls run on a bounded worker pool; results are applied here, on the
+	# scheduler's own connection, one job at a time.
+	for request, tracking, error, elapsed in fetch_tracking_concurrently(provider, fetch_requests):
+		latencies.append(elapsed)
+		if error:
+			failed += 1
+			frappe.log_error(
+				title=f"Tracking update failed [{doctype}]: {request.job}",
+				message=error,
+			)
+			continue
 
 		try:
-			fetch_containers_from_bl(job.name)
+			apply_tracking_to_job(frappe.get_doc(doctype, request.job), tracking)
 			success += 1
 			frappe.db.commit()
 		except Exception:
 			failed += 1
 			frappe.db.rollback()
 			frappe.log_error(
-				title=f"Tracking update failed [{doctype}]: {job.name}",
+				title=f"Tracking update failed [{doctype}]: {request.job}",
 			)
 
 	frappe.logger().info(
 		f"Tracking scheduler [{doctype}]: {success} updated, {failed} failed, "
-		f"{skipped} skipped (unchanged), out of {len(jobs)} jobs"
+		f"{skipped} skipped (unchanged), out of {len(jobs)} jobs; "
+		f"{provider} fetch latency {format_latency_percentiles(latencies)}"
+	)
+
+
+# ── Concurrent provider fetch stage ──────────────────────────────────────────
+
+# Per-provider cap on in-flight requests and on request starts per second.
+PROVIDER_FETCH_LIMITS = {
+	"Traqo": {"concurrency": 4, "per_second": 2.0},
+	"Searates": {"concurrency": 4, "per_second": 1.0},
+}
+DEFAULT_FETCH_LIMITS = {"concurrency": 2, "per_second": 1.0}
+
+
+class _RateLimiter:
+	"""Spaces request starts at least 1/per_second apart across threads."""
+
+	def __init__(self, per_second):
+		self.interval = 1.0 / per_second if per_second else 0
+		self.lock = threading.Lock()
+		self.next_slot = 0.0
+
+	def wait(self):
+		with self.lock:
+			now = time.monotonic()
+			slot = max(now, self.next_slot)
+			self.next_slot = slot + self.interval
+		if slot > now:
+			time.sleep(slot - now)
+
+
+def fetch_tracking_concurrently(provider, fetch_requests):
+	"""Fetch tracking payloads for many jobs on a bounded pool of worker threads.
+
+	Yields (request, tracking, error, elapsed_seconds) in completion order. Worker
+	threads only talk to the provider (each on its own site connection for settings
+	lookups); nothing is written to the database from a worker.
+	"""
+	if not fetch_requests:
+		return
+
+	from freightmas.integrations.http_session import close_sessions
+
+	limits = PROVIDER_FETCH_LIMITS.get(provider, DEFAULT_FETCH_LIMITS)
+	limiter = _RateLimiter(limits["per_second"])
+	pending = queue.Queue()
+	results = queue.Queue()
+	for request in fetch_requests:
+		pending.put(request)
+
+	site = frappe.local.site
+	sites_path = frappe.local.sites_path
+
+	def worker():
+		frappe.init(site=site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			while True:
+				try:
+					request = pending.get_nowait()
+				except queue.Empty:
+					return
+				limiter.wait()
+				started = time.monotonic()
+				tracking, error = None, None
+				try:
+					tracking = _fetch_one(request)
+				except Exception:
+					error = frappe.get_traceback()
+				finally:
+					frappe.clear_messages()
+				results.put((request, tracking, error, time.monotonic() - started))
+		except Exception:
+			# Could not even connect — fail whatever this worker would have taken.
+			error = frappe.get_traceback()
+			while True:
+				try:
+					request = pending.get_nowait()
+				except queue.Empty:
+					break
+				results.put((request, None, error, 0.0))
+		finally:
+			close_sessions()
+			frappe.destroy()
+
+	threads = [
+		threading.Thread(target=worker, name=f"tracking-fetch-{i}", daemon=True)
+		for i in range(min(limits["concurrency"], len(fetch_requests)))
+	]
+	for thread in threads:
+		thread.start()
+
+	for _ in range(len(fetch_requests)):
+		yield results.get()
+
+	for thread in threads:
+		thread.join()
+
+
+def _fetch_one(request):
+	from freightmas.integrations.tracking.dispatcher import fetch_tracking
+
+	return fetch_tracking(
+		request.number,
+		tracking_type=request.tracking_type,
+		sealine=request.sealine,
+		traqo_shipment_id=request.traqo_shipment_id,
 	)
+
+
+def latency_percentiles(latencies):
+	"""{p50, p90, p99, max} in seconds (nearest-rank) for a list of durations."""
+	if not latencies:
+		return {}
+	ordered = sorted(latencies)
+
+	def rank(pct):
+		return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+	return {
+		"p50": round(rank(50), 3),
+		"p90": round(rank(90), 3),
+		"p99": round(rank(99), 3),
+		"max": round(ordered[-1], 3),
+	}
+
+
+def format_latency_percentiles(latencies):
+	stats = latency_percentiles(latencies)
+	if not stats:
+		return "n/a (no calls)"
+	return ", ".join(f"{key} {value}s" for key, value in stats.items()) + f" over {len(latencies)} calls"
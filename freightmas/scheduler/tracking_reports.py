@@ -0,0 +1,28 @@
+import frappe
+
+from freightmas.freightmas.page.shipment_dashboard.shipment_dashboard import (
+	TRACKING_REPORT_KINDS,
+	get_shipment_tracking_report,
+)
+
+
+def pregenerate_tracking_reports():
+	"""Daily scheduler: build the Shipment Tracking PDF and Excel for every
+	customer with tracking emails enabled, so the day's downloads and emails
+	are served from the cache instead of rebuilt on demand.
+
+	Runs after update_active_tracking so the morning's tracking refresh is
+	already reflected. Reports whose fingerprint still matches are left as
+	they are.
+	"""
+	customers = frappe.get_all(
+		"Customer",
+		filters={"tracking_email_enabled": 1, "disabled": 0},
+		pluck="name",
+	)
+	for customer in customers:
+		for kind in TRACKING_REPORT_KINDS:
+			try:
+				get_shipment_tracking_report(customer, kind)
+			except Exception:
+				frappe.log_error(title=f"Tracking report pre-generation failed: {customer} ({kind})")
@@ -0,0 +1,69 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Query-count regression for the FM Accounts Receivable / Payable Summary
+reports: aging buckets come from one grouped query, so the query count must
+not grow with the number of parties."""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from freightmas.freightmas.report.aging_common import parse_aging_ranges
+from freightmas.freightmas.report.fm_accounts_payable_summary import fm_accounts_payable_summary
+from freightmas.freightmas.report.fm_accounts_receivable_summary import fm_accounts_receivable_summary
+
+
+class _RecordingDB:
+	def __init__(self, party_field, parties):
+		self.party_field = party_field
+		self.parties = parties
+		self.queries = []
+
+	def sql(self, query, values=None, as_dict=False):
+		self.queries.append(query)
+		if "tabGL Entry" in query:
+			return [
+				frappe._dict({self.party_field: f"P-{i}", "outstanding_submitted": 100 + i})
+				for i in range(self.parties)
+			]
+		# Aging query: only even parties have outstanding invoices.
+		return [
+			frappe._dict(party=f"P-{i}", range1=10, range2=20, range3=None, range4=70)
+			for i in range(0, self.parties, 2)
+		]
+
+
+def _run(report, party_field, parties):
+	db = _RecordingDB(party_field, parties)
+	with patch("frappe.db", db):
+		_columns, data = report.execute({"company": "Test Co", "report_date": "2026-06-30"})
+	return db.queries, data
+
+
+class TestAgingSummary(unittest.TestCase):
+	def test_query_count_is_constant_in_party_count(self):
+		for report, party_field in (
+			(fm_accounts_receivable_summary, "customer"),
+			(fm_accounts_payable_summary, "supplier"),
+		):
+			small, _data = _run(report, party_field, 3)
+			large, _data = _run(report, party_field, 3000)
+			self.assertEqual(len(small), 2)
+			self.assertEqual(len(large), 2)
+
+	def test_parties_without_aged_invoices_get_zero_buckets(self):
+		_queries, data = _run(fm_accounts_receivable_summary, "customer", 2)
+		rows = {row["customer"]: row for row in data}
+		self.assertEqual(
+			[rows["P-0"][f"range{i}"] for i in range(1, 5)], [10, 20, 0, 70]
+		)
+		self.assertEqual(
+			[rows["P-1"][f"range{i}"] for i in range(1, 5)], [0, 0, 0, 0]
+		)
+
+	def test_parse_aging_ranges(self):
+		self.assertEqual(parse_aging_ranges("15, 45, 75, 105"), [15, 45, 75, 105])
+		self.assertEqual(parse_aging_ranges("30, 60"), [30, 60, 90, 120])
+		self.assertEqual(parse_aging_ranges(None), [30, 60, 90, 120])
@@ -0,0 +1,97 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for bulk (period-end) revenue and cost recognition."""
+
+import contextlib
+import unittest
+from unittest.mock import MagicMock, patch
+
+import frappe
+
+from freightmas.utils import bulk_recognition
+from freightmas.utils import revenue_recognition as rr
+
+
+class _RecordingGetAll:
+	"""frappe.get_all stand-in: one Sales and one Purchase Invoice per job."""
+
+	def __init__(self):
+		self.calls = []
+
+	def __call__(self, doctype, filters=None, fields=None, order_by=None, **kwargs):
+		self.calls.append(doctype)
+		if doctype in ("Sales Invoice", "Purchase Invoice"):
+			prefix = "SINV" if doctype == "Sales Invoice" else "PINV"
+			return [
+				frappe._dict(
+					name=f"{prefix}-{job}", forwarding_job_reference=job,
+					posting_date="2026-05-01", grand_total=100, company="Test Co",
+				)
+				for job in filters["forwarding_job_reference"][1]
+			]
+		if doctype in ("Sales Invoice Item", "Purchase Invoice Item"):
+			return [
+				frappe._dict(parent=parent, item_code="FREIGHT", base_net_amount=100)
+				for parent in filters["parent"][1]
+			]
+		return []
+
+
+class TestRecognitionPrefetch(unittest.TestCase):
+	def _load(self, jobs):
+		get_all = _RecordingGetAll()
+		with patch("frappe.get_all", get_all):
+			invoices = rr.load_linked_invoices("Forwarding Job", jobs)
+		return get_all.calls, invoices
+
+	def test_query_count_is_constant_in_job_count(self):
+		small, _invoices = self._load(["FWJB-1"])
+		large, _invoices = self._load([f"FWJB-{i}" for i in range(500)])
+		self.assertEqual(len(small), 4)
+		self.assertEqual(len(large), 4)
+
+	def test_invoices_carry_their_item_lines(self):
+		_calls, invoices = self._load(["FWJB-1", "FWJB-2"])
+		invoice = invoices[("Sales Invoice", "FWJB-2")][0]
+		self.assertEqual(invoice.name, "SINV-FWJB-2")
+		self.assertEqual([item.item_code for item in invoice.items], ["FREIGHT"])
+
+	def test_linked_invoices_are_served_from_prefetch(self):
+		with patch("frappe.get_all", _RecordingGetAll()), patch("frappe.flags", frappe._dict()):
+			with rr.recognition_prefetch("Forwarding Job", ["FWJB-1"]):
+				with patch("frappe.get_all") as get_all, patch("frappe.get_doc") as get_doc:
+					invoices = rr.get_linked_purchase_invoices("Forwarding Job", "FWJB-1")
+				get_all.assert_not_called()
+				get_doc.assert_not_called()
+			self.assertEqual([inv.name for inv in invoices], ["PINV-FWJB-1"])
+			self.assertIsNone(frappe.flags.get(rr.RECOGNITION_PREFETCH_FLAG))
+
+
+class TestBulkRecognitionRun(unittest.TestCase):
+	def _job(self, name, fail=False):
+		job = MagicMock(docstatus=0, status="Completed", revenue_recognised_on=None, completed_on="2026-05-31")
+		job.name = name
+		if fail:
+			job.submit.side_effect = frappe.ValidationError("GL period closed")
+		return job
+
+	def test_failed_job_is_rolled_back_and_the_rest_continue(self):
+		jobs = {"FWJB-1": self._job("FWJB-1"), "FWJB-2": self._job("FWJB-2", fail=True), "FWJB-3": self._job("FWJB-3")}
+		statuses = []
+		db = MagicMock()
+
+		with patch("frappe.db", db), \
+				patch("frappe.get_doc", side_effect=lambda doctype, name: jobs[name]), \
+				patch("frappe.log_error"), patch("frappe.clear_messages", create=True), \
+				patch.object(bulk_recognition, "recognition_prefetch", lambda *args: contextlib.nullcontext()), \
+				patch.object(bulk_recognition, "_set_status", side_effect=lambda run_id, **values: statuses.append(values) or values):
+			bulk_recognition.run_bulk_recognition("RUN-1", "Forwarding Job", list(jobs), recognition_date="2026-05-31")
+
+		self.assertEqual(db.commit.call_count, 2)
+		self.assertEqual(db.rollback.call_count, 1)
+		last_progress = statuses[-2]
+		self.assertEqual(last_progress["succeeded"], ["FWJB-1", "FWJB-3"])
+		self.assertEqual([row["job"] for row in last_progress["failed"]], ["FWJB-2"])
+		self.assertEqual(statuses[-1]["status"], "completed")
+		self.assertEqual(jobs["FWJB-1"].revenue_recognised_on, "2026-05-31")
@@ -323,6 +323,33 @@ class TestAssertCustomerScope(IntegrationTestCase):
 		finally:
 			frappe.set_user("Administrator")
 
+	def test_removing_contact_link_revokes_cached_entitlement(self):
+		# Entitlements are cached per user; the Contact hook must drop the
+		# cached party list so an unlinked customer is denied immediately.
+		customer_a = _make_customer("C4a")
+		customer_b = _make_customer("C4b")
+		user = _make_user("c4")
+		contact = _make_contact(user, [customer_a, customer_b])
+		log_for_b = self._make_log(customer_b)
+
+		frappe.set_user(user.name)
+		try:
+			self.assertEqual(set(get_portal_customer_names()), {customer_a.name, customer_b.name})
+		finally:
+			frappe.set_user("Administrator")
+
+		contact.reload()
+		contact.links = [link for link in contact.links if link.link_name != customer_b.name]
+		contact.save(ignore_permissions=True)
+
+		frappe.set_user(user.name)
+		try:
+			self.assertEqual(get_portal_customer_names(), [customer_a.name])
+			with self.assertRaises(frappe.PermissionError):
+				assert_customer_scope("Client Portal Access Log", log_for_b.name, "customer")
+		finally:
+			frappe.set_user("Administrator")
+
 
 class TestEnforcePrivateOnInsert(IntegrationTestCase):
 	def test_forces_private_on_protected_doctype(self):
@@ -0,0 +1,54 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Unit tests for the streaming Excel export engine: a generator-fed sheet is
+written and read back to check layout, widths and cell styles."""
+
+import unittest
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from freightmas.utils import excel_stream
+
+COLUMNS = [
+	{"label": "Job", "fieldname": "job"},
+	{"label": "Amount", "fieldname": "amount", "fieldtype": "Currency"},
+]
+
+
+def _rows(count):
+	for i in range(count):
+		yield {"job": f"JOB-{i:05d}", "amount": i * 1.5}
+
+
+class TestExcelStream(unittest.TestCase):
+	def _read_back(self, rows, **kwargs):
+		wb = excel_stream.new_workbook()
+		excel_stream.write_table_sheet(wb, "Jobs / Finance", COLUMNS, rows, **kwargs)
+		return load_workbook(BytesIO(excel_stream.workbook_bytes(wb))).active
+
+	def test_streams_generator_below_frozen_header(self):
+		count = excel_stream.SAMPLE_ROWS + 5
+		preamble = [[("Company", "fm_title")], [("Jobs", "fm_subtitle")], None]
+		ws = self._read_back(_rows(count), preamble=preamble)
+
+		self.assertEqual(ws.title, "Jobs  Finance")
+		self.assertEqual(ws.freeze_panes, "A5")
+		self.assertEqual([c.value for c in ws[4]], ["Job", "Amount"])
+		# Rows beyond the width sample are still written
+		self.assertEqual(ws.max_row, 4 + count)
+		self.assertEqual(ws.cell(row=4 + count, column=1).value, f"JOB-{count - 1:05d}")
+
+	def test_numeric_cells_and_zebra_striping(self):
+		ws = self._read_back(_rows(2))
+
+		first, second = ws[2], ws[3]
+		self.assertEqual(first[1].number_format, "#,##0.00")
+		self.assertEqual(first[1].alignment.horizontal, "right")
+		self.assertEqual(first[0].fill.fill_type, None)
+		self.assertEqual(second[0].fill.fgColor.rgb, "00F2F2F2")
+
+	def test_format_value_coerces_blank_numbers(self):
+		self.assertEqual(excel_stream.format_value(None, COLUMNS[1]), (0, "number"))
+		self.assertEqual(excel_stream.format_value(None, COLUMNS[0]), ("", "text"))
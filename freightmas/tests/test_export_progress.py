@@ -0,0 +1,30 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for row-loop progress reporting from background exports."""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from freightmas.utils import export_utils
+
+
+class TestExportRowProgress(unittest.TestCase):
+	def _write(self, rows, export_id):
+		flags = frappe._dict(freightmas_export_id=export_id)
+		with patch("frappe.flags", flags), patch.object(export_utils, "_set_export_status") as set_status:
+			written = list(export_utils.with_export_progress(rows))
+		return written, [call.kwargs["progress"] for call in set_status.call_args_list]
+
+	def test_progress_is_reported_every_step_and_on_the_last_row(self):
+		rows = list(range(450))
+		written, progress = self._write(rows, "EXP-1")
+		self.assertEqual(written, rows)
+		self.assertEqual(progress, [43, 76, 85])
+
+	def test_synchronous_export_reports_nothing(self):
+		written, progress = self._write(list(range(450)), None)
+		self.assertEqual(len(written), 450)
+		self.assertEqual(progress, [])
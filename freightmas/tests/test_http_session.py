@@ -0,0 +1,79 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the pooled integration HTTP session layer against a local stub
+server - no external network access needed."""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from freightmas.integrations import http_session
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+	protocol_version = "HTTP/1.1"  # keep-alive
+	responses = []
+	client_ports = []
+
+	def do_GET(self):
+		self.client_ports.append(self.client_address[1])
+		status = self.responses.pop(0) if self.responses else 200
+		body = b'{"ok": true}'
+		self.send_response(status)
+		if status == 429:
+			self.send_header("Retry-After", "0")
+		self.send_header("Content-Type", "application/json")
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+class TestHttpSession(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+		cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/ping"
+		threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+	@classmethod
+	def tearDownClass(cls):
+		cls.server.shutdown()
+		cls.server.server_close()
+
+	def setUp(self):
+		_StubHandler.responses = []
+		_StubHandler.client_ports = []
+		http_session.close_sessions()
+		config = {"stub": dict(http_session.FALLBACK_DEFAULTS, backoff_factor=0)}
+		patcher = patch.dict(http_session.SERVICE_DEFAULTS, config)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+		self.addCleanup(http_session.close_sessions)
+
+	def test_reuses_keep_alive_connection(self):
+		for _ in range(3):
+			self.assertEqual(http_session.request("stub", "GET", self.url).status_code, 200)
+		self.assertEqual(len(set(_StubHandler.client_ports)), 1)
+
+	def test_retries_on_429_and_5xx(self):
+		_StubHandler.responses = [429, 503]
+		response = http_session.request("stub", "GET", self.url)
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(len(_StubHandler.client_ports), 3)
+
+	def test_returns_last_response_when_retries_exhausted(self):
+		_StubHandler.responses = [503, 503, 503, 503]
+		response = http_session.request("stub", "GET", self.url)
+		self.assertEqual(response.status_code, 503)
+
+	def test_session_is_per_thread(self):
+		sessions = []
+		thread = threading.Thread(target=lambda: sessions.append(http_session.get_session("stub")))
+		thread.start()
+		thread.join()
+		self.assertIsNot(sessions[0], http_session.get_session("stub"))
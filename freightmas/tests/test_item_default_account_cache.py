@@ -0,0 +1,57 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the cached Item / Item Group / Brand default account resolution."""
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from freightmas.utils import revenue_recognition as rr
+
+DEFAULTS = {"FREIGHT": "Freight Income - T", "HANDLING": "Handling Income - T"}
+
+
+class TestItemDefaultAccountCache(FrappeTestCase):
+	def setUp(self):
+		rr.clear_item_default_account_cache()
+
+	def tearDown(self):
+		rr.clear_item_default_account_cache()
+
+	def _walk(self, item_code, company, account_fieldname):
+		return DEFAULTS.get(item_code)
+
+	def test_each_distinct_item_is_resolved_once(self):
+		lines = ["FREIGHT", "HANDLING", "DOCS"] * 14
+		with patch.object(rr, "_walk_item_defaults", side_effect=self._walk) as walk:
+			accounts = [rr.resolve_item_default_account(code, "Test Co", "income_account") for code in lines]
+
+		self.assertEqual(walk.call_count, 3)
+		self.assertEqual(accounts[:3], ["Freight Income - T", "Handling Income - T", None])
+
+	def test_cache_is_keyed_by_company_and_account_field(self):
+		with patch.object(rr, "_walk_item_defaults", side_effect=self._walk) as walk:
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "income_account")
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "expense_account")
+			rr.resolve_item_default_account("FREIGHT", "Other Co", "income_account")
+		self.assertEqual(walk.call_count, 3)
+
+	def test_item_change_clears_the_cache(self):
+		with patch.object(rr, "_walk_item_defaults", side_effect=self._walk) as walk:
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "income_account")
+			rr.clear_item_default_account_cache(frappe._dict(doctype="Item"), "on_update")
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "income_account")
+		self.assertEqual(walk.call_count, 2)
+
+	def test_item_change_clears_again_after_commit(self):
+		with patch.object(rr, "_walk_item_defaults", side_effect=self._walk) as walk, \
+				patch.object(frappe.db, "after_commit") as after_commit:
+			rr.clear_item_default_account_cache(frappe._dict(doctype="Item"), "on_update")
+			# a lookup before the commit caches the old default again
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "income_account")
+			(clear,) = after_commit.add.call_args[0]
+			clear()
+			rr.resolve_item_default_account("FREIGHT", "Test Co", "income_account")
+		self.assertEqual(walk.call_count, 2)
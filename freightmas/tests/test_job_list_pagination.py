@@ -0,0 +1,71 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Keyset pagination for the dashboard / portal job lists, driven against an
+in-memory fetch that honours the same filters and order get_list would."""
+
+import datetime
+import unittest
+
+import frappe
+
+from freightmas.utils.dashboard_common import KEYSET_ORDER_BY, keyset_page, paginate_job_list
+
+BASE = datetime.datetime(2026, 1, 1, 8, 0)
+
+
+def _jobs():
+	# Bursts of jobs saved in the same instant, so page boundaries land on ties.
+	jobs = []
+	for i in range(57):
+		jobs.append(frappe._dict(name=f"FWJB-{i:05d}", modified=BASE + datetime.timedelta(seconds=i // 4)))
+	return sorted(jobs, key=lambda j: (j.modified, j.name), reverse=True)
+
+
+class _Fetch:
+	def __init__(self, jobs):
+		self.jobs = jobs
+		self.calls = []
+
+	def __call__(self, filters, order_by, start, page_length):
+		self.calls.append((order_by, start, page_length))
+		rows = self.jobs
+		if "modified" in filters:
+			rows = [j for j in rows if j.modified <= filters["modified"][1]]
+		return rows[start:start + page_length]
+
+
+class TestJobListPagination(unittest.TestCase):
+	def test_keyset_pages_cover_every_job_once_in_order(self):
+		jobs = _jobs()
+		fetch = _Fetch(jobs)
+		seen, cursor = [], None
+		while True:
+			rows, cursor = keyset_page(fetch, {"docstatus": ["<", 2]}, cursor, page_length=5)
+			seen.extend(r.name for r in rows)
+			if not cursor:
+				break
+		self.assertEqual(seen, [j.name for j in jobs])
+		# Pages seek from their cursor: the only offset is a re-read past rows
+		# dropped at a tied timestamp, never one that grows with page depth.
+		self.assertLessEqual(max(start for _order, start, _length in fetch.calls), 6)
+
+	def test_last_page_has_no_cursor(self):
+		rows, cursor = keyset_page(_Fetch(_jobs()), {}, None, page_length=100)
+		self.assertEqual(len(rows), 57)
+		self.assertIsNone(cursor)
+
+	def test_other_sort_orders_fall_back_to_offset(self):
+		fetch = _Fetch(_jobs())
+		rows, cursor = paginate_job_list(
+			fetch, {}, order_by="milestone_percent desc, modified desc", limit_start=10, limit_page_length=5
+		)
+		self.assertEqual(len(rows), 5)
+		self.assertIsNone(cursor)
+		self.assertEqual(fetch.calls, [("milestone_percent desc, modified desc", 10, 5)])
+
+	def test_first_page_without_offset_uses_keyset(self):
+		fetch = _Fetch(_jobs())
+		_rows, cursor = paginate_job_list(fetch, {}, limit_page_length=5)
+		self.assertIsNotNone(cursor)
+		self.assertEqual(fetch.calls[0][0], KEYSET_ORDER_BY)
@@ -0,0 +1,29 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Unit tests for the Management Accounts report runner. Report execution is
+patched out; these check result ordering, error capture and timings."""
+
+import unittest
+from unittest.mock import patch
+
+from freightmas.utils import management_accounts
+
+
+def _fake_execute(config, report_filters):
+	if config["key"] == "broken":
+		raise ValueError("no fiscal year")
+	return [{"fieldname": "x"}], [{"x": config["key"]}]
+
+
+class TestManagementAccountsRunner(unittest.TestCase):
+	def test_results_keep_job_order_and_capture_errors(self):
+		jobs = [({"key": "pl"}, {}), ({"key": "broken"}, {}), ({"key": "bs"}, {})]
+		with patch.object(management_accounts, "_execute_report", _fake_execute):
+			results = management_accounts.run_reports(jobs, workers=1)
+
+		self.assertEqual([r[1] for r in results], [[{"x": "pl"}], [], [{"x": "bs"}]])
+		self.assertIsNone(results[0][2])
+		self.assertIsInstance(results[1][2], ValueError)
+		for _columns, _data, _error, seconds in results:
+			self.assertGreaterEqual(seconds, 0)
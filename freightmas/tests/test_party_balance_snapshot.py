@@ -0,0 +1,126 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the month-end Party Balance Snapshots behind statement openings."""
+
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+import frappe
+
+from freightmas.utils import party_balance
+
+
+def _movement(party, period_end, movement, company="Test Co", party_type="Customer"):
+	return frappe._dict(
+		company=company, party_type=party_type, party=party,
+		period_end=period_end, movement=movement,
+	)
+
+
+class TestBuildSnapshotRows(unittest.TestCase):
+	def test_runs_on_from_latest_snapshot_and_skips_covered_months(self):
+		movements = [
+			_movement("A", "2026-01-31", 999),  # already in A's latest snapshot
+			_movement("A", "2026-02-28", 50),
+			_movement("A", "2026-03-31", -20),
+			_movement("B", "2026-03-31", 10),
+		]
+		latest = {("Test Co", "Customer", "A"): ("2026-01-31", 100)}
+
+		rows = party_balance.build_snapshot_rows(movements, latest)
+
+		self.assertEqual(
+			[(row["party"], str(row["period_end"]), row["balance"]) for row in rows],
+			[("A", "2026-02-28", 150), ("A", "2026-03-31", 130), ("B", "2026-03-31", 10)],
+		)
+
+	def test_excluded_parties_are_skipped(self):
+		rows = party_balance.build_snapshot_rows(
+			[_movement("A", "2026-02-28", 50), _movement("B", "2026-02-28", 5)],
+			{},
+			exclude={("Test Co", "Customer", "A")},
+		)
+		self.assertEqual([row["party"] for row in rows], ["B"])
+
+
+class TestPartyOpeningBalance(unittest.TestCase):
+	def test_snapshot_plus_delta(self):
+		db = MagicMock()
+		db.sql.side_effect = [
+			[frappe._dict(party="A", period_end=datetime.date(2026, 5, 31), balance=1000)],
+			[(-250,)],
+		]
+		with patch("frappe.db", db):
+			opening = party_balance.get_party_opening_balance("Test Co", "Customer", ["A", "B"], "2026-06-15")
+
+		self.assertEqual(opening, 750)
+		delta_query, params = db.sql.call_args_list[1][0]
+		self.assertIn("posting_date > %(since_0)s", delta_query)
+		self.assertEqual(params["since_0"], datetime.date(2026, 5, 31))
+		# B has no snapshot, so its entries are summed from the beginning.
+		self.assertEqual(params["uncovered"], ("B",))
+
+	def test_no_parties_or_date_is_zero(self):
+		with patch("frappe.db", MagicMock()) as db:
+			self.assertEqual(party_balance.get_party_opening_balance("Test Co", "Customer", [], "2026-06-15"), 0)
+			self.assertEqual(party_balance.get_party_opening_balance("Test Co", "Customer", "A", None), 0)
+			db.sql.assert_not_called()
+
+
+class TestSnapshotInvalidation(unittest.TestCase):
+	def _gl_entry(self, posting_date, is_cancelled=0, party_type="Customer"):
+		return frappe._dict(
+			company="Test Co", party_type=party_type, party="A", posting_date=posting_date,
+			is_cancelled=is_cancelled, voucher_type="Sales Invoice", voucher_no="SINV-1",
+		)
+
+	def _invalidate(self, doc, earliest=None, marker="2026-05-31", stale_exists=True):
+		db = MagicMock()
+		db.sql.return_value = [(earliest,)]
+		db.get_global.return_value = marker
+		db.exists.return_value = stale_exists
+		with patch("frappe.db", db), patch.object(party_balance, "today", return_value="2026-06-15"), \
+				patch.object(party_balance, "_insert_rows") as insert_rows:
+			party_balance.invalidate_party_balance_snapshots(doc)
+		db.insert_rows = insert_rows
+		return db
+
+	def test_posting_in_open_month_leaves_snapshots_alone(self):
+		db = self._invalidate(self._gl_entry("2026-06-10"))
+		db.set_value.assert_not_called()
+
+	def test_back_dated_posting_marks_snapshots_stale(self):
+		db = self._invalidate(self._gl_entry("2026-03-05"))
+		filters = db.set_value.call_args[0][1]
+		self.assertEqual(filters["period_end"], [">=", datetime.date(2026, 3, 5)])
+
+	def test_cancellation_invalidates_from_the_original_posting(self):
+		db = self._invalidate(self._gl_entry("2026-06-10", is_cancelled=1), earliest=datetime.date(2026, 2, 1))
+		filters = db.set_value.call_args[0][1]
+		self.assertEqual(filters["period_end"], [">=", datetime.date(2026, 2, 1)])
+
+	def test_non_party_types_are_ignored(self):
+		db = self._invalidate(self._gl_entry("2026-03-05", party_type="Employee"))
+		db.set_value.assert_not_called()
+
+	def test_back_dated_posting_after_last_snapshot_records_a_stale_marker(self):
+		# A's last snapshot is January: nothing dated March on matches, and
+		# the month extension only reads entries after the May marker.
+		db = self._invalidate(self._gl_entry("2026-03-05"), stale_exists=None)
+		(rows,) = db.insert_rows.call_args[0]
+		self.assertEqual(len(rows), 1)
+		self.assertEqual(rows[0]["party"], "A")
+		self.assertEqual(rows[0]["period_end"], datetime.date(2026, 3, 31))
+		self.assertEqual(rows[0]["is_stale"], 1)
+
+	def test_no_marker_row_when_snapshots_were_marked_stale(self):
+		db = self._invalidate(self._gl_entry("2026-03-05"), stale_exists=True)
+		db.insert_rows.assert_not_called()
+
+	def test_posting_after_the_through_marker_needs_no_marker_row(self):
+		# May is closed but not yet snapshotted; the next refresh reads it anyway.
+		db = self._invalidate(self._gl_entry("2026-05-10"), marker="2026-04-30", stale_exists=None)
+		db.set_value.assert_called_once()
+		db.insert_rows.assert_not_called()
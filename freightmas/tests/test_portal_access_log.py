@@ -0,0 +1,77 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the buffered Client Portal Access Log writer."""
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from freightmas.portal import access_log
+from freightmas.portal.security import log_portal_access
+
+
+class TestPortalAccessLogBuffer(FrappeTestCase):
+	def setUp(self):
+		self._clear()
+
+	def tearDown(self):
+		self._clear()
+
+	def _clear(self):
+		for key in (access_log.BUFFER_KEY, access_log.INFLIGHT_KEY, access_log.FLUSH_LOCK_KEY):
+			frappe.cache().delete_value(key)
+
+	def _flush(self):
+		# The flush commits for real in production; keep test rows in the
+		# test transaction.
+		with patch.object(frappe.db, "commit"):
+			return access_log.flush_access_log()
+
+	def test_logging_buffers_instead_of_inserting(self):
+		before = frappe.db.count("Client Portal Access Log")
+		log_portal_access("view_invoice", "Sales Invoice", "SINV-TEST-1", customer="Buffered Customer")
+
+		self.assertEqual(access_log.get_buffered_count(), 1)
+		self.assertEqual(frappe.db.count("Client Portal Access Log"), before)
+
+		self.assertEqual(self._flush(), 1)
+		self.assertEqual(access_log.get_buffered_count(), 0)
+		row = frappe.get_all(
+			"Client Portal Access Log",
+			filters={"reference_name": "SINV-TEST-1"},
+			fields=["party_type", "party", "customer", "action"],
+		)
+		self.assertEqual(len(row), 1)
+		self.assertEqual(row[0].party, "Buffered Customer")
+		self.assertEqual(row[0].party_type, "Customer")
+
+	def test_retried_flush_does_not_duplicate_rows(self):
+		log_portal_access("view_job", "Forwarding Job", "FWJB-TEST-1", customer="Retry Customer")
+
+		# First flush inserts but "dies" before dropping the in-flight list.
+		with patch.object(frappe.cache(), "delete", side_effect=lambda *keys: None):
+			self._flush()
+		frappe.cache().delete_value(access_log.FLUSH_LOCK_KEY)
+
+		self._flush()
+		self.assertEqual(
+			frappe.db.count("Client Portal Access Log", {"reference_name": "FWJB-TEST-1"}), 1
+		)
+
+	def test_falls_back_to_direct_insert_when_buffer_unavailable(self):
+		with patch.object(access_log, "buffer_access_log", side_effect=ConnectionError):
+			log_portal_access("view_quote", "Quotation", "QTN-TEST-1", customer="Fallback Customer")
+
+		self.assertEqual(
+			frappe.db.count("Client Portal Access Log", {"reference_name": "QTN-TEST-1"}), 1
+		)
+
+	def test_buffered_row_is_not_inserted_again_when_flush_enqueue_fails(self):
+		before = frappe.db.count("Client Portal Access Log")
+		with patch.object(access_log, "FLUSH_SIZE", 1), patch("frappe.enqueue", side_effect=ConnectionError):
+			log_portal_access("view_invoice", "Sales Invoice", "SINV-TEST-2", customer="Enqueue Customer")
+
+		self.assertEqual(access_log.get_buffered_count(), 1)
+		self.assertEqual(frappe.db.count("Client Portal Access Log"), before)
@@ -0,0 +1,59 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the cached, validated revenue recognition settings bundle."""
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from freightmas.utils import revenue_recognition as rr
+
+BUNDLE = {"enabled": True, "wip_revenue_account": "WIP Revenue - T", "pass_through_account": None}
+
+
+class TestRecognitionSettingsCache(FrappeTestCase):
+	def setUp(self):
+		rr.clear_recognition_settings_cache()
+
+	def tearDown(self):
+		rr.clear_recognition_settings_cache()
+
+	def test_settings_are_loaded_once_across_hooks(self):
+		with patch.object(rr, "load_recognition_settings", return_value=dict(BUNDLE)) as load:
+			for _ in range(5):
+				self.assertTrue(rr.is_revenue_recognition_enabled())
+				self.assertEqual(rr.get_wip_revenue_account(), "WIP Revenue - T")
+				self.assertIsNone(rr.get_duty_pass_through_account())
+		self.assertEqual(load.call_count, 1)
+
+	def test_callers_cannot_mutate_the_cached_bundle(self):
+		with patch.object(rr, "load_recognition_settings", return_value=dict(BUNDLE)):
+			rr.get_recognition_settings()["wip_revenue_account"] = "Tampered"
+			self.assertEqual(rr.get_recognition_settings()["wip_revenue_account"], "WIP Revenue - T")
+
+	def test_account_change_clears_the_bundle(self):
+		with patch.object(rr, "load_recognition_settings", return_value=dict(BUNDLE)) as load:
+			rr.get_recognition_settings()
+			rr.clear_recognition_settings_cache(frappe._dict(doctype="Account"), "on_update")
+			rr.get_recognition_settings()
+		self.assertEqual(load.call_count, 2)
+
+	def test_invalid_settings_are_not_cached(self):
+		with patch.object(rr, "load_recognition_settings", side_effect=frappe.ValidationError) as load:
+			for _ in range(2):
+				with self.assertRaises(frappe.ValidationError):
+					rr.get_recognition_settings()
+		self.assertEqual(load.call_count, 2)
+
+	def test_bundle_is_cleared_again_after_commit(self):
+		with patch.object(rr, "load_recognition_settings", return_value=dict(BUNDLE)) as load, \
+				patch.object(frappe.db, "after_commit") as after_commit:
+			rr.clear_recognition_settings_cache(frappe._dict(doctype="FreightMas Settings"), "on_update")
+			# a request reading between the save and the commit re-caches the old bundle
+			rr.get_recognition_settings()
+			(clear,) = after_commit.add.call_args[0]
+			clear()
+			rr.get_recognition_settings()
+		self.assertEqual(load.call_count, 2)
@@ -0,0 +1,84 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the container / BL / reference search index keys."""
+
+import unittest
+from unittest.mock import patch
+
+from freightmas.utils import search_index
+
+
+class _RecordingDB:
+	def __init__(self):
+		self.queries = []
+
+	def sql(self, query, values=None, as_dict=False):
+		self.queries.append((query, values))
+		return []
+
+
+class TestSearchIndexKeys(unittest.TestCase):
+	def test_iso6346_check_digit(self):
+		self.assertEqual(search_index.container_check_digit("CSQU305438"), 3)
+		self.assertEqual(search_index.container_key("csqu 305438"), "CSQU3054383")
+		self.assertEqual(search_index.container_key("CSQU-305438-3"), "CSQU3054383")
+
+	def test_job_keys_are_normalised_and_deduplicated(self):
+		header = {"name": "FWJB-1", "bl_number": "MEDU 123/45", "customer_reference": "po-77"}
+		cargo = [
+			{"name": "row-1", "container_number": "CSQU305438"},
+			{"name": "row-2", "container_number": ""},
+		]
+		keys = {
+			(k["key_type"], k["search_key"], k["serial_key"], k["row_name"])
+			for k in search_index.build_search_keys("Forwarding Job", header, cargo)
+		}
+		self.assertEqual(keys, {
+			("BL", "MEDU12345", None, None),
+			("Reference", "PO77", None, None),
+			("Container", "CSQU3054383", "305438", "row-1"),
+		})
+
+	def test_border_clearing_indexes_vehicle_and_references(self):
+		header = {"name": "BCJ-1", "customer_reference": "REF1", "shipper_reference": "REF1"}
+		cargo = [{"name": "row-1", "container_or_vehicle_no": "ABC 1234"}]
+		keys = search_index.build_search_keys("Border Clearing Job", header, cargo)
+		self.assertEqual([(k["key_type"], k["search_key"]) for k in keys], [("Reference", "REF1"), ("Container", "ABC1234")])
+
+	def test_lookup_uses_prefix_seeks_only(self):
+		db = _RecordingDB()
+		with patch("frappe.db", db):
+			search_index.find_search_keys("305438", ["Container"])
+		query, values = db.queries[0]
+		self.assertNotIn("LIKE '%", query)
+		self.assertEqual(values["prefix"], "305438%")
+		self.assertEqual(values["suffix"], "834503%")
+		self.assertEqual(values["serial"], "305438")
+
+	def test_blank_search_runs_no_query(self):
+		db = _RecordingDB()
+		with patch("frappe.db", db):
+			self.assertEqual(search_index.find_search_keys(" -/ "), [])
+		self.assertEqual(db.queries, [])
+
+	def test_scope_is_applied_before_the_limit(self):
+		db = _RecordingDB()
+		scope = {"docstatus": ["<", 2], "customer": ["in", ["CUST-1", "CUST-2"]], "consignee": ["like", "%x%"]}
+		with patch("frappe.db", db):
+			search_index.find_search_keys("MEDU", ["BL"], ["Forwarding Job"], scope=scope)
+		query, values = db.queries[0]
+		self.assertIn("JOIN `tabForwarding Job` j ON j.name = k.job_name", query)
+		self.assertIn("j.`customer` in %(scope_1)s", query)
+		self.assertEqual(values["scope_1"], ("CUST-1", "CUST-2"))
+		# operators the join doesn't understand are left to the caller's query
+		self.assertNotIn("consignee", query)
+		self.assertLess(query.index("ORDER BY"), query.index("LIMIT"))
+
+	def test_unlimited_lookup(self):
+		db = _RecordingDB()
+		with patch("frappe.db", db):
+			search_index.find_search_keys("MEDU", ["BL"], limit=None)
+		query, values = db.queries[0]
+		self.assertNotIn("LIMIT", query)
+		self.assertNotIn("limit", values)
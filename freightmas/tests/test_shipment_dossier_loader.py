@@ -0,0 +1,73 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Query-count regression for the per-customer shipment tracking dossier:
+jobs, cargo and milestones are batch-loaded, so the number of queries must not
+grow with the number of jobs."""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from freightmas.freightmas.page.shipment_dashboard import shipment_dashboard as sd
+
+
+class _RecordingGetAll:
+	def __init__(self, jobs):
+		self.jobs = jobs
+		self.calls = []
+
+	def __call__(self, doctype, filters=None, fields=None, order_by=None, **kwargs):
+		self.calls.append(doctype)
+		names = [f"FWJB-{i}" for i in range(self.jobs)]
+		if doctype == "Forwarding Job":
+			return [
+				frappe._dict(
+					name=name, status="In Progress", direction="Import", shipment_mode="Sea",
+					eta="2026-01-10", bl_number=f"BL-{name}", requires_port_clearance=1,
+				)
+				for name in names
+			]
+		if doctype == "Cargo Parcel Details":
+			return [
+				frappe._dict(
+					name=f"{name}-C{n}", parent=name, container_number=f"CONT{n}",
+					container_type="40HC", cargo_type="Containerised", discharge_date="2026-01-12",
+				)
+				for name in names
+				for n in range(2)
+			]
+		return [
+			frappe._dict(
+				parent=name, parentfield="port_clearance_milestones", milestone_label=label,
+				is_completed=int(label == "Docs"), stage="Documentation", stage_sequence=1,
+			)
+			for name in names
+			for label in ("Docs", "Customs")
+		]
+
+
+def _run(jobs):
+	get_all = _RecordingGetAll(jobs)
+	with patch("frappe.get_all", get_all), patch("frappe.get_doc", side_effect=AssertionError):
+		dossier = sd._dossier_jobs_for_customer("Test Customer", numbered=True)
+	return get_all.calls, dossier
+
+
+class TestShipmentDossierLoader(unittest.TestCase):
+	def test_query_count_is_constant_in_job_count(self):
+		small, _dossier = _run(2)
+		large, _dossier = _run(200)
+		self.assertEqual(len(small), 3)
+		self.assertEqual(large, small)
+
+	def test_batch_loaded_rows_feed_the_dossier_context(self):
+		_calls, dossier = _run(1)
+		ctx = dossier[0]
+		self.assertEqual(ctx["num"], 1)
+		self.assertEqual(ctx["fields"]["bl_number"], "BL-FWJB-0")
+		self.assertEqual(len(ctx["containers"]), 2)
+		self.assertEqual(ctx["glance"]["cargo_units"], "2×40HC")
+		port = next(s for s in ctx["sections"] if s["title"] == "Port Clearance")
+		self.assertEqual((port["frac"]["done"], port["frac"]["total"]), (1, 2))
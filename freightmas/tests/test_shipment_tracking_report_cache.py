@@ -0,0 +1,56 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for the fingerprinted Shipment Tracking report cache."""
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from freightmas.freightmas.page.shipment_dashboard import shipment_dashboard as sd
+
+CUSTOMER = "_Test Tracking Cache Customer"
+
+
+class TestShipmentTrackingReportCache(FrappeTestCase):
+	def setUp(self):
+		self._clear()
+
+	def tearDown(self):
+		self._clear()
+
+	def _clear(self):
+		for kind in sd.TRACKING_REPORT_KINDS:
+			frappe.cache().delete_value(f"{sd.TRACKING_REPORT_CACHE_PREFIX}:{kind}:{CUSTOMER}")
+
+	def _get(self, fingerprint, kind="pdf"):
+		builds = []
+
+		def build(customer, kind):
+			builds.append(kind)
+			return f"{kind}-{len(builds)}".encode(), "Tracking Cache Customer"
+
+		with patch.object(sd, "_shipment_tracking_fingerprint", return_value=fingerprint), \
+				patch.object(sd, "_build_shipment_tracking_report", side_effect=build):
+			content, _customer_name = sd.get_shipment_tracking_report(CUSTOMER, kind)
+		return content, builds
+
+	def test_unchanged_jobs_are_served_from_cache(self):
+		first, builds = self._get("fp-1")
+		self.assertEqual(builds, ["pdf"])
+
+		second, builds = self._get("fp-1")
+		self.assertEqual(builds, [])
+		self.assertEqual(second, first)
+
+	def test_changed_fingerprint_rebuilds(self):
+		self._get("fp-1")
+		_content, builds = self._get("fp-2")
+		self.assertEqual(builds, ["pdf"])
+
+	def test_pdf_and_excel_are_cached_separately(self):
+		self._get("fp-1", "pdf")
+		content, builds = self._get("fp-1", "xlsx")
+		self.assertEqual(builds, ["xlsx"])
+		self.assertTrue(content.startswith(b"xlsx"))
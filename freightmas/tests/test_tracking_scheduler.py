@@ -0,0 +1,27 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Unit tests for the tracking scheduler's fetch-stage helpers. No provider
+calls: these exercise the latency percentiles and rate limiter directly."""
+
+import time
+import unittest
+
+from freightmas.scheduler.tracking import _RateLimiter, latency_percentiles
+
+
+class TestTrackingScheduler(unittest.TestCase):
+	def test_latency_percentiles_nearest_rank(self):
+		stats = latency_percentiles([float(i) for i in range(1, 101)])
+		self.assertEqual(stats, {"p50": 50.0, "p90": 90.0, "p99": 99.0, "max": 100.0})
+
+	def test_latency_percentiles_empty(self):
+		self.assertEqual(latency_percentiles([]), {})
+
+	def test_rate_limiter_spaces_request_starts(self):
+		limiter = _RateLimiter(per_second=20)
+		started = time.monotonic()
+		for _ in range(3):
+			limiter.wait()
+		# First call is immediate, the next two wait one 50ms slot each.
+		self.assertGreaterEqual(time.monotonic() - started, 0.09)
@@ -0,0 +1,47 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Tests for coalescing Traqo webhook deliveries into one refresh per shipment."""
+
+import time
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from freightmas.integrations.tracking import webhook
+
+
+class TestTraqoWebhookCoalescing(FrappeTestCase):
+	def setUp(self):
+		frappe.cache().delete_value(webhook.PENDING_KEY)
+
+	def tearDown(self):
+		frappe.cache().delete_value(webhook.PENDING_KEY)
+
+	def test_burst_for_same_bl_collapses_to_one_refresh(self):
+		for _ in range(5):
+			webhook.coalesce_webhook_event("container.updated", {"reference_number": "MEDU123"})
+		webhook.coalesce_webhook_event("container.updated", {"reference_number": "MAEU999"})
+
+		self.assertEqual(len(frappe.cache().hkeys(webhook.PENDING_KEY)), 2)
+
+		later = time.time() + webhook.QUIET_WINDOW_SEC + 1
+		with patch.object(webhook.time, "time", return_value=later), patch.object(frappe, "enqueue") as enqueue:
+			self.assertEqual(webhook.flush_pending_refreshes(), 2)
+
+		counts = {
+			call.kwargs["data"]["reference_number"]: call.kwargs["coalesced_events"]
+			for call in enqueue.call_args_list
+		}
+		self.assertEqual(counts, {"MEDU123": 5, "MAEU999": 1})
+		self.assertFalse(frappe.cache().hkeys(webhook.PENDING_KEY))
+
+	def test_unsettled_burst_is_held_back(self):
+		webhook.coalesce_webhook_event("container.updated", {"shipment_id": "SHP-1"})
+		with patch.object(frappe, "enqueue") as enqueue:
+			self.assertEqual(webhook.flush_pending_refreshes(), 0)
+		enqueue.assert_not_called()
+
+	def test_payload_without_identifiers_is_ignored(self):
+		self.assertIsNone(webhook.coalesce_webhook_event("ping", {}))
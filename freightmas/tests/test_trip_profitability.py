@@ -0,0 +1,53 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Query-count regression for the Trip Profitability report: invoice totals
+come from grouped subqueries, so the query count must not grow with the
+number of trips."""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from freightmas.trucking_service.report.trip_profitability import trip_profitability
+
+
+class _RecordingDB:
+	def __init__(self, trips):
+		self.trips = trips
+		self.queries = []
+
+	def sql(self, query, values=None, as_dict=False):
+		self.queries.append(query)
+		return [
+			frappe._dict(
+				name=f"TRIP-{i}", date_created="2026-01-01", customer="C", truck="T", route="R",
+				total_estimated_revenue=1000, total_estimated_cost=600,
+				draft_revenue=None, draft_cost=50,
+				actual_revenue=900, actual_cost=None,
+			)
+			for i in range(self.trips)
+		]
+
+
+def _run(trips):
+	db = _RecordingDB(trips)
+	with patch("frappe.db", db):
+		_columns, data = trip_profitability.execute({"from_date": "2026-01-01"})
+	return db.queries, data
+
+
+class TestTripProfitability(unittest.TestCase):
+	def test_query_count_is_constant_in_trip_count(self):
+		small, _data = _run(3)
+		large, _data = _run(3000)
+		self.assertEqual(len(small), 1)
+		self.assertEqual(len(large), 1)
+
+	def test_missing_invoice_totals_default_to_zero(self):
+		_queries, data = _run(1)
+		row = data[0]
+		self.assertEqual(row["est_profit"], 400)
+		self.assertEqual((row["draft_revenue"], row["draft_cost"], row["draft_profit"]), (0, 50, -50))
+		self.assertEqual((row["actual_revenue"], row["actual_cost"], row["actual_profit"]), (900, 0, 900))
@@ -0,0 +1,59 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Query-count benchmark for the Weekly Treasury Report's overdue debtor and
+creditor sections. The database is replaced by a recording fixture that serves
+N parties, so the number of queries can be asserted as N grows."""
+
+import unittest
+from unittest.mock import patch
+
+import frappe
+
+from freightmas.freightmas.report.weekly_treasury_report import weekly_treasury_report as wtr
+
+
+class _RecordingDB:
+	"""Serves GL outstanding rows for `parties` parties and records every query."""
+
+	def __init__(self, parties):
+		self.parties = parties
+		self.queries = []
+
+	def sql(self, query, values=None, as_dict=False):
+		self.queries.append(query)
+		if "`tabGL Entry`" in query:
+			return [
+				frappe._dict(customer=f"P{i}", supplier=f"P{i}", outstanding=100.0)
+				for i in range(min(self.parties, values["limit"]))
+			]
+		# Overdue invoices: every other party has 40 overdue
+		return [frappe._dict(party=p, overdue=40.0) for p in values["parties"] if int(p[1:]) % 2 == 0]
+
+
+def _run(parties):
+	db = _RecordingDB(parties)
+	filters = frappe._dict(company="Test Co", week_end="2026-03-01")
+	with patch.object(wtr, "TOP_N", parties), patch("frappe.db", db):
+		debtors = wtr.build_overdue_debtors(filters)
+		creditors = wtr.build_overdue_creditors(filters)
+	return db.queries, debtors, creditors
+
+
+class TestWeeklyTreasuryOverdue(unittest.TestCase):
+	def test_query_count_is_constant_in_party_count(self):
+		small, _d, _c = _run(5)
+		large, _d, _c = _run(500)
+		# One GL query and one grouped overdue query per section
+		self.assertEqual(len(small), 4)
+		self.assertEqual(len(large), len(small))
+
+	def test_overdue_amounts_merged_per_party(self):
+		_queries, debtors, creditors = _run(4)
+		for rows in (debtors, creditors):
+			data = {r["label"]: r for r in rows if r.get("party")}
+			self.assertEqual(data["P0"]["amount_2"], 40.0)
+			self.assertIsNone(data["P1"]["amount_2"])
+			total = next(r for r in rows if r["label"] == "Total")
+			self.assertEqual(total["amount"], 400.0)
+			self.assertEqual(total["amount_2"], 80.0)
@@ -17,29 +17,37 @@ def execute(filters=None):
     params = {}
     
     if filters.get("from_date"):
-        conditions.append("date_created >= %(from_date)s")
+        conditions.append("t.date_created >= %(from_date)s")
         params["from_date"] = filters["from_date"]
     
     if filters.get("to_date"):
-        conditions.append("date_created <= %(to_date)s")
+        conditions.append("t.date_created <= %(to_date)s")
         params["to_date"] = filters["to_date"]
     
     if filters.get("customer"):
-        conditions.append("customer = %(customer)s")
+        conditions.append("t.customer = %(customer)s")
         params["customer"] = filters["customer"]
     
     if filters.get("truck"):
-        conditions.append("truck = %(truck)s")
+        conditions.append("t.truck = %(truck)s")
         params["truck"] = filters["truck"]
 
     where_clause = " AND ".join(conditions)
 
+    # Draft (docstatus 0) and actual (docstatus 1) invoice totals are summed per
+    # trip in grouped subqueries, so the whole report is a single query.
     trips = frappe.db.sql("""
-        SELECT name, date_created, customer, truck, route,
-               total_estimated_revenue, total_estimated_cost
-        FROM `tabTrip`
+        SELECT t.name, t.date_created, t.customer, t.truck, t.route,
+               t.total_estimated_revenue, t.total_estimated_cost,
+               si.draft_total AS draft_revenue, si.actual_total AS actual_revenue,
+               pi.draft_total AS draft_cost, pi.actual_total AS actual_cost
+        FROM `tabTrip` t
+        LEFT JOIN (""" + _invoice_totals_subquery("Sales Invoice") + """) si
+            ON si.trip_reference = t.name
+        LEFT JOIN (""" + _invoice_totals_subquery("Purchase Invoice") + """) pi
+            ON pi.trip_reference = t.name
         WHERE """ + where_clause + """
-        ORDER BY date_created DESC
+        ORDER BY t.date_created DESC
     """, params, as_dict=True)
 
     for trip in trips:
@@ -47,28 +55,12 @@ def execute(filters=None):
         est_cost = flt(trip.total_estimated_cost)
         est_profit = est_revenue - est_cost
 
-        draft_revenue = frappe.db.sql("""
-            SELECT SUM(grand_total) FROM `tabSales Invoice`
-            WHERE trip_reference = %s AND docstatus = 0
-        """, trip.name)[0][0] or 0
-
-        draft_cost = frappe.db.sql("""
-            SELECT SUM(grand_total) FROM `tabPurchase Invoice`
-            WHERE trip_reference = %s AND docstatus = 0
-        """, trip.name)[0][0] or 0
-
+        draft_revenue = trip.draft_revenue or 0
+        draft_cost = trip.draft_cost or 0
         draft_profit = flt(draft_revenue) - flt(draft_cost)
 
-        actual_revenue = frappe.db.sql("""
-            SELECT SUM(grand_total) FROM `tabSales Invoice`
-            WHERE trip_reference = %s AND docstatus = 1
-        """, trip.name)[0][0] or 0
-
-        actual_cost = frappe.db.sql("""
-            SELECT SUM(grand_total) FROM `tabPurchase Invoice`
-            WHERE trip_reference = %s AND docstatus = 1
-        """, trip.name)[0][0] or 0
-
+        actual_revenue = trip.actual_revenue or 0
+        actual_cost = trip.actual_cost or 0
         actual_profit = flt(actual_revenue) - flt(actual_cost)
 
         # Append raw values without currency formatting
@@ -90,6 +82,18 @@ def execute(filters=None):
 
     return columns, data
 
+
+def _invoice_totals_subquery(doctype):
+    """Draft and submitted grand totals per trip_reference for an invoice doctype."""
+    return """
+        SELECT trip_reference,
+               SUM(CASE WHEN docstatus = 0 THEN grand_total END) AS draft_total,
+               SUM(CASE WHEN docstatus = 1 THEN grand_total END) AS actual_total
+        FROM `tab{doctype}`
+        WHERE docstatus < 2 AND IFNULL(trip_reference, '') != ''
+        GROUP BY trip_reference
+    """.format(doctype=doctype)
+
 def get_columns():
     return [
         {"label": "Trip ID", "fieldname": "name", "fieldtype": "Link", "options": "Trip", "width": 130},
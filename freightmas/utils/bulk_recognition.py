@@ -0,0 +1,214 @@
+# Copyright (c) 2026, FreightMas and contributors
+# For license information, please see license.txt
+
+"""
+Bulk (period-end) revenue and cost recognition.
+
+Submitting a completed job recognises its revenue and cost (see
+revenue_recognition). Rather than opening and submitting hundreds of jobs one
+by one at month end, accounts staff can start a bulk run for every completed
+draft job of a service, optionally narrowed by company and completion date.
+
+- The run is a background job on the long queue, executed as the requesting
+  user, so the usual submit permissions and job validations apply.
+- Jobs are processed in batches. Each batch's submitted invoices, their item
+  lines and the accounts those point at are loaded in a few set queries
+  (revenue_recognition.recognition_prefetch), so the recognition Journal
+  Entries are built from memory instead of from every invoice document.
+- Every job is submitted and committed on its own: a job that fails is rolled
+  back and reported with its error, the rest carry on.
+- Progress and per-job outcomes are kept in Redis for
+  get_bulk_recognition_status and pushed over realtime as
+  "freightmas_bulk_recognition_progress".
+"""
+
+import frappe
+from frappe import _
+
+from freightmas.utils.revenue_recognition import (
+    RECOGNITION_JOB_TYPES,
+    is_revenue_recognition_enabled,
+    recognition_prefetch,
+)
+
+# service type ('forwarding', 'clearing', 'border_clearing') -> job doctype
+BULK_RECOGNITION_SERVICES = {
+    service_type: job_doctype
+    for job_doctype, (_link_field, service_type) in RECOGNITION_JOB_TYPES.items()
+}
+
+BATCH_SIZE = 50
+STATUS_TTL = 24 * 60 * 60  # seconds
+JOB_TIMEOUT = 3600  # seconds
+
+
+def _status_key(run_id):
+    return f"freightmas:bulk_recognition:{run_id}"
+
+
+def _set_status(run_id, **values):
+    status = frappe.cache().get_value(_status_key(run_id)) or {}
+    status.update(values)
+    frappe.cache().set_value(_status_key(run_id), status, expires_in_sec=STATUS_TTL)
+    frappe.publish_realtime("freightmas_bulk_recognition_progress", status, user=status.get("user"))
+    return status
+
+
+def _get_job_doctype(service):
+    job_doctype = BULK_RECOGNITION_SERVICES.get(service)
+    if not job_doctype:
+        frappe.throw(_("Unsupported service for bulk recognition: {0}").format(service))
+    return job_doctype
+
+
+def get_bulk_recognition_candidates(service, company=None, from_date=None, to_date=None):
+    """
+    Completed, not yet submitted jobs of a service.
+
+    Returns:
+        tuple: (job_doctype, [job names]) ordered by completion date
+    """
+    job_doctype = _get_job_doctype(service)
+    filters = {"docstatus": 0, "status": "Completed"}
+    if company:
+        filters["company"] = company
+    if from_date and to_date:
+        filters["completed_on"] = ["between", [from_date, to_date]]
+    elif from_date:
+        filters["completed_on"] = [">=", from_date]
+    elif to_date:
+        filters["completed_on"] = ["<=", to_date]
+
+    names = frappe.get_all(
+        job_doctype,
+        filters=filters,
+        pluck="name",
+        order_by="completed_on asc, name asc",
+    )
+    return job_doctype, names
+
+
+@frappe.whitelist()
+def preview_bulk_recognition(service, company=None, from_date=None, to_date=None):
+    """The jobs a bulk run with these filters would submit."""
+    job_doctype, names = get_bulk_recognition_candidates(service, company, from_date, to_date)
+    return {"job_doctype": job_doctype, "count": len(names), "jobs": names}
+
+
+@frappe.whitelist()
+def start_bulk_recognition(service, company=None, from_date=None, to_date=None, recognition_date=None):
+    """
+    Queue a bulk recognition run.
+
+    Args:
+        service: 'forwarding', 'clearing' or 'border_clearing'
+        company, from_date, to_date: optional filters (completion date range)
+        recognition_date: Revenue Recognition Date for jobs that have none set;
+            defaults to each job's completion date
+
+    Returns:
+        dict: the run's status, including run_id
+    """
+    if not is_revenue_recognition_enabled():
+        frappe.throw(_("Revenue Recognition is not enabled in FreightMas Settings"))
+
+    job_doctype, names = get_bulk_recognition_candidates(service, company, from_date, to_date)
+    frappe.has_permission(job_doctype, "submit", throw=True)
+    if not names:
+        frappe.throw(_("No completed {0}s found for these filters").format(_(job_doctype)))
+
+    run_id = frappe.generate_hash(length=12)
+    user = frappe.session.user
+    status = _set_status(
+        run_id,
+        run_id=run_id,
+        status="queued",
+        job_doctype=job_doctype,
+        total=len(names),
+        processed=0,
+        progress=0,
+        succeeded=[],
+        failed=[],
+        user=user,
+    )
+
+    frappe.enqueue(
+        "freightmas.utils.bulk_recognition.run_bulk_recognition",
+        queue="long",
+        timeout=JOB_TIMEOUT,
+        run_id=run_id,
+        job_doctype=job_doctype,
+        job_names=names,
+        recognition_date=recognition_date,
+        user=user,
+    )
+    return status
+
+
+@frappe.whitelist()
+def get_bulk_recognition_status(run_id):
+    status = frappe.cache().get_value(_status_key(run_id))
+    if not status:
+        frappe.throw(_("Bulk recognition run {0} not found or expired").format(run_id))
+    if status.get("user") != frappe.session.user and "System Manager" not in frappe.get_roles():
+        frappe.throw(_("Not permitted"), frappe.PermissionError)
+    return status
+
+
+def run_bulk_recognition(run_id, job_doctype, job_names, recognition_date=None, user=None):
+    """Worker side of start_bulk_recognition."""
+    if user:
+        frappe.set_user(user)
+    _set_status(run_id, status="running")
+
+    succeeded = []
+    failed = []
+    total = len(job_names)
+
+    for start in range(0, total, BATCH_SIZE):
+        batch = job_names[start:start + BATCH_SIZE]
+        with recognition_prefetch(job_doctype, batch):
+            for job_name in batch:
+                error = recognise_job(job_doctype, job_name, recognition_date)
+                if error:
+                    failed.append({"job": job_name, "error": error})
+                else:
+                    succeeded.append(job_name)
+
+                processed = len(succeeded) + len(failed)
+                _set_status(
+                    run_id,
+                    processed=processed,
+                    progress=int(processed * 100 / total),
+                    succeeded=succeeded,
+                    failed=failed,
+                )
+
+    return _set_status(run_id, status="completed", progress=100)
+
+
+def recognise_job(job_doctype, job_name, recognition_date=None):
+    """
+    Submit one completed job - recognising its revenue and cost - in its own
+    transaction.
+
+    Returns:
+        str or None: the error message if the job could not be submitted
+    """
+    try:
+        job = frappe.get_doc(job_doctype, job_name)
+        if job.docstatus != 0 or job.status != "Completed":
+            return _("Job is no longer a completed draft")
+
+        if not job.revenue_recognised_on:
+            job.revenue_recognised_on = recognition_date or job.completed_on
+        job.submit()
+        frappe.db.commit()
+        return None
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(title=f"Bulk recognition failed: {job_doctype} {job_name}")
+        return str(e) or e.__class__.__name__
+    finally:
+        # recognition msgprints pile up over hundreds of jobs otherwise
+        frappe.clear_messages()
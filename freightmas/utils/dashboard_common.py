@@ -16,8 +16,10 @@ function validates its identifier arguments against those maps and raises if an
 unknown value is passed - this keeps the string-formatted SQL injection-safe.
 """
 
+import hashlib
+
 import frappe
-from frappe.utils import flt, add_months, get_first_day, get_last_day, formatdate, nowdate
+from frappe.utils import cint, flt, add_months, get_first_day, get_last_day, formatdate, get_datetime, nowdate
 
 
 # ============================================================
@@ -249,39 +251,94 @@ def monthly_revenue_margin_trend(job_doctype, months=6, recognised=None):
 
 
 # ============================================================
-# MILESTONE PROGRESS
+# JOB LIST PAGINATION
 # ============================================================
 
-def milestone_progress_map(job_doctype, milestone_fields, job_names):
-	"""Return {job_name: percent_complete} across the given milestone child tables.
+# Keyset order for job lists: newest first, name breaks ties so a page
+# boundary is never ambiguous.
+KEYSET_ORDER_BY = "modified desc, name desc"
 
-	milestone_fields: list of parentfield names (child table = Job Milestone
-	Progress). Percent = completed rows / total rows across all listed tables.
-	"""
-	if not job_names or not milestone_fields:
-		return {}
+# Total counts behind the list pagers are cached this long (seconds) per
+# filter set - paging, re-sorting and polling reuse one COUNT per window.
+LIST_COUNT_CACHE_TTL = 60
+LIST_COUNT_CACHE_PREFIX = "freightmas:list_count"
 
-	counts = {}
-	for fieldname in milestone_fields:
-		rows = frappe.db.sql(
-			"""
-			SELECT parent, COUNT(*) AS total, SUM(IFNULL(is_completed, 0)) AS done
-			FROM `tabJob Milestone Progress`
-			WHERE parenttype = %(dt)s AND parentfield = %(field)s AND parent IN %(names)s
-			GROUP BY parent
-			""",
-			{"dt": job_doctype, "field": fieldname, "names": tuple(job_names)},
-			as_dict=True,
-		)
-		for r in rows:
-			bucket = counts.setdefault(r.parent, {"total": 0, "done": 0})
-			bucket["total"] += r.total or 0
-			bucket["done"] += int(r.done or 0)
 
-	return {
-		name: (round(v["done"] / v["total"] * 100) if v["total"] else 0)
-		for name, v in counts.items()
-	}
+def encode_list_cursor(row):
+	"""Opaque cursor pointing just past `row` (needs its modified + name)."""
+	return f"{get_datetime(row.modified).isoformat()}|{row.name}"
+
+
+def _decode_list_cursor(cursor):
+	modified, sep, name = (cursor or "").partition("|")
+	if not sep or not name:
+		frappe.throw(frappe._("Invalid page cursor."))
+	return get_datetime(modified), name
+
+
+def keyset_page(fetch, filters, cursor=None, page_length=20):
+	"""One page of a job list in KEYSET_ORDER_BY order, seeking from `cursor`
+	instead of skipping limit_start rows, so deep pages cost the same as the
+	first one.
+
+	fetch(filters, order_by, limit_start, limit_page_length) runs the caller's
+	own get_list/get_all (keeping its or_filters and permission behaviour);
+	its rows must carry `modified` and `name`. `filters` is the caller's
+	filter dict and may not filter on modified itself.
+
+	The seek is `modified <= cursor` in SQL; rows sharing the cursor's
+	timestamp that were already returned (name >= cursor name) are dropped
+	here, as an (a < x OR (a = x AND b < y)) condition can't be combined with
+	the callers' search or_filters.
+
+	Returns (rows, next_cursor); next_cursor is None on the last page.
+	"""
+	page_length = max(cint(page_length), 1)
+	after = _decode_list_cursor(cursor) if cursor else None
+	if after:
+		filters = dict(filters, modified=["<=", after[0]])
+
+	want = page_length + 1
+	rows = []
+	start = 0
+	while True:
+		batch = fetch(filters, KEYSET_ORDER_BY, start, want)
+		for row in batch:
+			if after and get_datetime(row.modified) == after[0] and row.name >= after[1]:
+				continue
+			rows.append(row)
+		if len(rows) >= want or len(batch) < want:
+			break
+		start += len(batch)
+
+	next_cursor = encode_list_cursor(rows[page_length - 1]) if len(rows) > page_length else None
+	return rows[:page_length], next_cursor
+
+
+def paginate_job_list(fetch, filters, order_by=KEYSET_ORDER_BY, cursor=None, limit_start=0, limit_page_length=20):
+	"""Job-list pager shared by the dashboard and portal get_jobs endpoints.
+
+	Lists in KEYSET_ORDER_BY are served by keyset_page - from `cursor`, or
+	from the top when no limit_start is given. Other sort orders, and callers
+	still paging by limit_start, fall back to OFFSET. Returns
+	(rows, next_cursor); next_cursor is only set in keyset mode.
+	"""
+	if order_by == KEYSET_ORDER_BY and (cursor or not cint(limit_start)):
+		return keyset_page(fetch, filters, cursor, limit_page_length)
+	return fetch(filters, order_by, cint(limit_start), cint(limit_page_length)), None
+
+
+def cached_count(doctype, filters):
+	"""frappe.db.count(doctype, filters), cached for LIST_COUNT_CACHE_TTL
+	seconds under a key derived from the doctype and filter set."""
+	digest = hashlib.sha1(frappe.as_json([doctype, filters], indent=None).encode()).hexdigest()
+	key = f"{LIST_COUNT_CACHE_PREFIX}:{digest}"
+	cache = frappe.cache()
+	count = cache.get_value(key)
+	if count is None:
+		count = frappe.db.count(doctype, filters=filters)
+		cache.set_value(key, count, expires_in_sec=LIST_COUNT_CACHE_TTL)
+	return count
 
 
 # ============================================================
@@ -0,0 +1,268 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Streaming Excel export engine shared by the report and dashboard exporters.
+
+Rows are fed from any iterable (ideally a generator) into an openpyxl
+write-only workbook, which spools each row to disk as it is appended, so
+memory stays flat however many rows a report has. Cell styles are registered
+once per workbook as named styles and cells just reference them by name,
+instead of building Font/Fill/Border objects per cell.
+
+A streamed sheet cannot be re-read, so column widths are sized from the header
+and the first SAMPLE_ROWS rows before anything is written, and title/filter
+rows are written unmerged (the text simply overflows into the empty cells).
+"""
+
+import re
+from io import BytesIO
+from itertools import chain, islice
+
+import frappe
+from frappe.utils import flt, formatdate
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.worksheet import Worksheet
+
+NUMERIC_TYPES = ("Currency", "Int", "Float", "Percent")
+SAMPLE_ROWS = 200
+MIN_WIDTH = 12
+MAX_WIDTH = 40
+
+# Look per exporter family: "report" matches freightmas.api script report exports,
+# "dashboard" the shipment / clearing dashboard exports. Script reports carry
+# Percent values as 0-100, the dashboards as fractions.
+THEMES = {
+	"report": {
+		"header": "305496",
+		"title_size": 16,
+		"subtitle": Font(bold=True, size=13),
+		"percent_format": '#,##0.00"%"',
+	},
+	"dashboard": {
+		"header": "17406B",
+		"title_size": 14,
+		"subtitle": Font(bold=True, size=11, color="667085"),
+		"percent_format": "0.0%",
+	},
+}
+
+_BORDER = Border(
+	left=Side(style="thin", color="DDDDDD"),
+	right=Side(style="thin", color="DDDDDD"),
+	top=Side(style="thin", color="DDDDDD"),
+	bottom=Side(style="thin", color="DDDDDD"),
+)
+_LEFT = Alignment(horizontal="left", vertical="center")
+_RIGHT = Alignment(horizontal="right", vertical="center")
+_ZEBRA = "F2F2F2"
+_NUMBER_FORMAT = "#,##0.00"
+
+
+def _named_styles(theme):
+	header = theme["header"]
+
+	def style(name, font=None, fill=None, align=_LEFT, border=_BORDER, number_format=None):
+		ns = NamedStyle(name=name)
+		if font:
+			ns.font = font
+		if fill:
+			ns.fill = PatternFill("solid", fgColor=fill)
+		if align:
+			ns.alignment = align
+		if border:
+			ns.border = border
+		if number_format:
+			ns.number_format = number_format
+		return ns
+
+	styles = [
+		style("fm_title", font=Font(bold=True, size=theme["title_size"]), border=None),
+		style("fm_subtitle", font=theme["subtitle"], border=None),
+		style("fm_label", font=Font(bold=True), border=None),
+		style("fm_plain", border=None),
+		style("fm_header", font=Font(bold=True, color="FFFFFF"), fill=header),
+		style("fm_heading", font=Font(bold=True, size=11, color=header), fill="E8ECF1"),
+	]
+	for suffix, fill in (("", None), ("_alt", _ZEBRA)):
+		styles += [
+			style(f"fm_text{suffix}", fill=fill),
+			style(f"fm_number{suffix}", fill=fill, align=_RIGHT, number_format=_NUMBER_FORMAT),
+			style(f"fm_percent{suffix}", fill=fill, align=_RIGHT, number_format=theme["percent_format"]),
+		]
+	for prefix, font, fill in (
+		("fm_subtotal", Font(bold=True, color=header), "D6DCE4"),
+		("fm_grand", Font(bold=True, color="FFFFFF"), header),
+	):
+		styles += [
+			style(f"{prefix}_text", font=font, fill=fill),
+			style(f"{prefix}_number", font=font, fill=fill, align=_RIGHT, number_format=_NUMBER_FORMAT),
+		]
+	return styles
+
+
+def new_workbook(theme="report"):
+	"""Write-only workbook with the fm_* named styles registered."""
+	wb = Workbook(write_only=True)
+	for named_style in _named_styles(THEMES[theme]):
+		wb.add_named_style(named_style)
+	return wb
+
+
+def cell(ws, value, style):
+	c = WriteOnlyCell(ws, value=value)
+	c.style = style
+	return c
+
+
+def sheet_title(title):
+	return re.sub(r"[\\/*?:\[\]]", "", title)[:31]
+
+
+def format_value(value, col, dates_by_fieldname=False):
+	"""(value, kind) for a report column, kind being "number", "percent" or "text".
+
+	Dates are rendered dd-MMM-yy for Date/Datetime columns, and - for script
+	report exports - any column whose fieldname mentions "date".
+	"""
+	fieldtype = col.get("fieldtype") or "Data"
+	if fieldtype in NUMERIC_TYPES:
+		number = value if isinstance(value, (int, float)) else (flt(value) if value not in (None, "") else 0)
+		return number, "percent" if fieldtype == "Percent" else "number"
+
+	is_date = fieldtype in ("Date", "Datetime") or (dates_by_fieldname and "date" in (col.get("fieldname") or ""))
+	if is_date and value:
+		try:
+			return formatdate(value, "dd-MMM-yy"), "text"
+		except Exception:
+			return str(value), "text"
+
+	return ("" if value is None else value), "text"
+
+
+def data_cells(ws, row, columns, alt=False, dates_by_fieldname=False, transform=None):
+	"""Styled cells for one plain data row (zebra fill when `alt`)."""
+	suffix = "_alt" if alt else ""
+	cells = []
+	for col in columns:
+		value = row.get(col["fieldname"], "")
+		if transform:
+			value = transform(value)
+		value, kind = format_value(value, col, dates_by_fieldname)
+		cells.append(cell(ws, value, f"fm_{kind}{suffix}"))
+	return cells
+
+
+def header_cells(ws, columns, transform=None):
+	return [
+		cell(ws, transform(col.get("label", "")) if transform else col.get("label", ""), "fm_header")
+		for col in columns
+	]
+
+
+def write_table_sheet(
+	wb,
+	title,
+	columns,
+	rows,
+	preamble=None,
+	row_cells=None,
+	dates_by_fieldname=False,
+	label_transform=None,
+	fit_to_width=False,
+):
+	"""Stream one tabular sheet: preamble rows, a frozen header row, then `rows`.
+
+	Args:
+		preamble: list of rows, each a list of (value, style) pairs, written above
+			the header (company, title, filters, export stamp); None entries are
+			blank spacer rows
+		row_cells: optional callable(ws, row, index) -> list of cells or None
+			(blank row) for sheets with group headings / totals; defaults to
+			zebra-striped data_cells
+		fit_to_width: print setup for A4 landscape, one page wide
+	"""
+	ws = wb.create_sheet(sheet_title(title))
+	ws.sheet_view.showGridLines = False
+	if fit_to_width:
+		# Sheet properties are written with the first row, so set them up front.
+		ws.sheet_properties.pageSetUpPr.fitToPage = True
+		ws.page_setup.orientation = "landscape"
+		ws.page_setup.fitToWidth = 1
+		ws.page_setup.fitToHeight = 0
+		ws.page_setup.paperSize = Worksheet.PAPERSIZE_A4
+
+	rows = iter(rows)
+	sample = list(islice(rows, SAMPLE_ROWS))
+	for idx, width in enumerate(_column_widths(columns, sample, dates_by_fieldname), start=1):
+		ws.column_dimensions[get_column_letter(idx)].width = width
+
+	preamble = preamble or []
+	header_row = len(preamble) + 1
+	ws.freeze_panes = f"A{header_row + 1}"
+
+	for pre in preamble:
+		ws.append([cell(ws, value, style) for value, style in (pre or [])])
+	ws.append(header_cells(ws, columns, label_transform))
+
+	if row_cells is None:
+		def row_cells(ws, row, index):
+			return data_cells(ws, row, columns, alt=index % 2 == 0, dates_by_fieldname=dates_by_fieldname)
+
+	for index, row in enumerate(chain(sample, rows), start=1):
+		ws.append(row_cells(ws, row, index) or [])
+
+	return ws
+
+
+def _column_widths(columns, sample, dates_by_fieldname):
+	widths = []
+	for col in columns:
+		longest = len(str(col.get("label") or ""))
+		for row in sample:
+			if not row:
+				continue
+			value, _kind = format_value(row.get(col["fieldname"], ""), col, dates_by_fieldname)
+			if value not in (None, ""):
+				longest = max(longest, len(str(value)))
+		widths.append(max(MIN_WIDTH, min(longest + 2, MAX_WIDTH)))
+	return widths
+
+
+def report_preamble(company, title, filters=None, labels=None):
+	"""Company, title, "Label: value" filter rows and the export stamp, as a
+	write_table_sheet preamble.
+
+	`labels` maps filter keys to labels and also fixes which filters are shown
+	and in what order; without it every set filter is shown under its
+	title-cased key. Values of "*date*" keys are rendered dd-MMM-yy.
+	"""
+	filters = filters or {}
+	if labels is None:
+		labels = {key: key.replace("_", " ").title() for key in filters}
+
+	preamble = [[(company, "fm_title")], [(title, "fm_subtitle")]]
+	for key, label in labels.items():
+		val = filters.get(key)
+		if not val:
+			continue
+		if "date" in key:
+			try:
+				val = formatdate(val, "dd-MMM-yy")
+			except Exception:
+				pass
+		preamble.append([(f"{label}:", "fm_label"), (val, "fm_plain")])
+	preamble.append([("Exported:", "fm_label"), (export_stamp(), "fm_plain")])
+	return preamble
+
+
+def export_stamp():
+	return frappe.utils.now_datetime().strftime("%d-%b-%Y %H:%M")
+
+
+def workbook_bytes(wb):
+	output = BytesIO()
+	wb.save(output)
+	return output.getvalue()
@@ -7,13 +7,13 @@ This builds upon the existing api.py functions but adds improvements.
 import frappe
 from frappe import _
 from frappe.utils import now_datetime, formatdate
+import hashlib
 import json
 import importlib
-from io import BytesIO
 import logging
 from typing import Optional, Dict, List, Any
 
-from freightmas.utils.report_utils import get_report_filename
+from freightmas.api import get_report_filename
 
 
 # Setup logging
@@ -203,38 +203,20 @@ def generate_excel_export(report_name: str, columns: List, data: List, filters:
         Excel file content as bytes
     """
     try:
-        import openpyxl
-        from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
-        from openpyxl.utils import get_column_letter
-        from freightmas.api import get_report_filename  # Import existing function
-        
-        # Create workbook using existing logic from api.py but with enhancements
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        
-        # Set sheet title
-        import re
-        sheet_title = re.sub(r'[\\/*?:\[\]]', '', report_name)[:31]
-        ws.title = sheet_title
-        
-        # Enhanced styling
-        title_font = Font(bold=True, size=16, color="2E75B6")
-        subtitle_font = Font(bold=True, size=13, color="2E75B6")
-        bold_font = Font(bold=True, color="FFFFFF")
-        filter_label_font = Font(bold=True, size=11)
-        header_fill = PatternFill("solid", fgColor="305496")
-        zebra_fill = PatternFill("solid", fgColor="F2F2F2")
-        
-        # Apply the enhanced Excel generation logic here
-        # (This would include the existing logic from api.py but with improvements)
-        
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        return output.read()
-        
+        from freightmas.utils import excel_stream
+
+        company = frappe.defaults.get_user_default("Company") or "FreightMas"
+        wb = excel_stream.new_workbook()
+        excel_stream.write_table_sheet(
+            wb,
+            report_name,
+            columns,
+            with_export_progress(data),
+            preamble=excel_stream.report_preamble(company, _(report_name), filters),
+            dates_by_fieldname=True,
+        )
+        return excel_stream.workbook_bytes(wb)
+
     except Exception as e:
         logger.error(f"Excel generation failed: {str(e)}")
         raise ReportExportError(f"Failed to generate Excel file: {str(e)}")
@@ -278,6 +260,7 @@ def generate_pdf_export(report_name: str, columns: List, data: List, filters: Di
         }
         
         # Render template
+        update_export_progress(30, _("Rendering PDF"))
         html = frappe.render_template(
             "freightmas/templates/report_pdf_template.html", 
             context
@@ -305,20 +288,199 @@ def generate_pdf_export(report_name: str, columns: List, data: List, filters: Di
         raise ReportExportError(f"Failed to generate PDF file: {str(e)}")
 
 
+# ── Background (async) exports ──────────────────────────────────────────────
+# Any synchronous exporter that answers with frappe.local.response.filecontent
+# can run in the background: the build is enqueued on the long queue as the
+# requesting user, the output is stored as a private File owned by that user,
+# and progress/status live in Redis for get_export_status to report.
+
+# Exporters that may be run in the background. Each is still called as the
+# requesting user, so its own permission checks apply unchanged.
+BACKGROUND_EXPORT_METHODS = {
+    "freightmas.api.export_report_to_excel",
+    "freightmas.api.export_report_to_pdf",
+    "freightmas.utils.export_utils.export_report_to_excel_v2",
+    "freightmas.utils.export_utils.export_report_to_pdf_v2",
+    "freightmas.freightmas.page.shipment_dashboard.shipment_dashboard.export_jobs",
+    "freightmas.freightmas.page.shipment_dashboard.shipment_dashboard.export_tracking_report",
+    "freightmas.freightmas.page.shipment_dashboard.shipment_dashboard.export_master_tracking_report",
+}
+
+EXPORT_STATUS_TTL = 24 * 60 * 60  # seconds
+EXPORT_JOB_TIMEOUT = 1500  # seconds
+EXPORT_PROGRESS_STEP = 200  # rows written between progress updates
+
+
+def _export_status_key(export_id: str) -> str:
+    return f"fm_export:{export_id}"
+
+
+def _export_dedupe_key(method: str, kwargs: Dict, user: str) -> str:
+    # Keyed by user too - the same filters can yield different rows per user.
+    fingerprint = json.dumps({"method": method, "kwargs": kwargs, "user": user}, sort_keys=True, default=str)
+    return f"fm_export_inflight:{hashlib.sha1(fingerprint.encode()).hexdigest()}"
+
+
+def _set_export_status(export_id: str, **values) -> Dict:
+    status = frappe.cache().get_value(_export_status_key(export_id)) or {}
+    status.update(values)
+    frappe.cache().set_value(_export_status_key(export_id), status, expires_in_sec=EXPORT_STATUS_TTL)
+    frappe.publish_realtime("freightmas_export_progress", status, user=status.get("user"))
+    return status
+
+
+def update_export_progress(progress: int, message: Optional[str] = None):
+    """Report progress from inside an exporter. No-op when not running in the background."""
+    export_id = frappe.flags.get("freightmas_export_id")
+    if export_id:
+        _set_export_status(export_id, progress=progress, message=message)
+
+
+def update_export_row_progress(done: int, total: int, start: int = 10, end: int = 85):
+    """
+    Progress for an exporter's row loop: row `done` of `total`, scaled into
+    start..end percent. Reported every EXPORT_PROGRESS_STEP rows and on the
+    last row, so a large export costs a handful of Redis writes, not one per row.
+    """
+    if not total or not frappe.flags.get("freightmas_export_id"):
+        return
+    if done % EXPORT_PROGRESS_STEP and done != total:
+        return
+    update_export_progress(
+        start + int((end - start) * done / total),
+        _("Writing row {0} of {1}").format(done, total),
+    )
+
+
+def with_export_progress(rows: List, start: int = 10, end: int = 85):
+    """Yield `rows` (a list) into a streaming writer, reporting row progress on the way."""
+    total = len(rows)
+    for index, row in enumerate(rows, start=1):
+        yield row
+        update_export_row_progress(index, total, start, end)
+
+
+@frappe.whitelist()
+def start_export(method: str, kwargs: Optional[str] = None):
+    """
+    Queue a background build of one of BACKGROUND_EXPORT_METHODS.
+
+    Args:
+        method: Dotted path of the exporter
+        kwargs: JSON string of the exporter's arguments (e.g. report_name, filters)
+
+    Returns:
+        Dictionary with export_id and the current status; an identical request
+        (same user, method and arguments) still in flight returns that export.
+    """
+    if method not in BACKGROUND_EXPORT_METHODS:
+        frappe.throw(_("Export method {0} cannot be run in the background").format(method), frappe.PermissionError)
+
+    if isinstance(kwargs, str):
+        kwargs = json.loads(kwargs or "{}")
+    kwargs = kwargs or {}
+    user = frappe.session.user
+
+    dedupe_key = _export_dedupe_key(method, kwargs, user)
+    existing_id = frappe.cache().get_value(dedupe_key)
+    if existing_id:
+        existing = frappe.cache().get_value(_export_status_key(existing_id)) or {}
+        if existing.get("status") in ("queued", "running"):
+            return {"export_id": existing_id, "deduplicated": True, **existing}
+
+    export_id = frappe.generate_hash(length=12)
+    frappe.cache().set_value(dedupe_key, export_id, expires_in_sec=EXPORT_JOB_TIMEOUT)
+    status = _set_export_status(
+        export_id,
+        export_id=export_id,
+        status="queued",
+        progress=0,
+        message=_("Queued"),
+        method=method,
+        user=user,
+        created_at=str(now_datetime()),
+    )
+
+    frappe.enqueue(
+        "freightmas.utils.export_utils.run_background_export",
+        queue="long",
+        timeout=EXPORT_JOB_TIMEOUT,
+        export_id=export_id,
+        method=method,
+        kwargs=kwargs,
+        user=user,
+        dedupe_key=dedupe_key,
+    )
+    logger.info(f"Export queued - Method: {method}, User: {user}, Export: {export_id}")
+    return {"export_id": export_id, "deduplicated": False, **status}
+
+
+def run_background_export(export_id: str, method: str, kwargs: Dict, user: str, dedupe_key: str):
+    """Worker side of start_export: run the exporter as `user` and store its output."""
+    frappe.set_user(user)
+    frappe.flags.freightmas_export_id = export_id
+    _set_export_status(export_id, status="running", progress=5, message=_("Building export"))
+
+    try:
+        frappe.local.response.pop("filecontent", None)
+        frappe.local.response.pop("filename", None)
+        frappe.get_attr(method)(**kwargs)
+
+        content = frappe.local.response.get("filecontent")
+        filename = frappe.local.response.get("filename") or f"export_{export_id}"
+        if content is None:
+            raise ReportExportError("Exporter returned no file")
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+
+        _set_export_status(export_id, progress=90, message=_("Saving file"))
+        file_doc = frappe.get_doc({
+            "doctype": "File",
+            "file_name": filename,
+            "is_private": 1,
+            "content": content,
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+
+        _set_export_status(
+            export_id,
+            status="completed",
+            progress=100,
+            message=_("Export ready"),
+            file_url=file_doc.file_url,
+            file_name=file_doc.file_name,
+        )
+        logger.info(f"Export completed - Method: {method}, User: {user}, File: {file_doc.name}")
+    except Exception as e:
+        frappe.db.rollback()
+        message = str(e) if isinstance(e, (ReportExportError, frappe.ValidationError)) else _(
+            "An unexpected error occurred during export. Please try again or contact support."
+        )
+        _set_export_status(export_id, status="failed", message=message)
+        logger.error(f"Export failed - Method: {method}, User: {user}, Error: {str(e)}")
+        frappe.log_error(title=f"Background export failed: {method}")
+    finally:
+        frappe.flags.freightmas_export_id = None
+        frappe.cache().delete_value(dedupe_key)
+        frappe.local.response.pop("filecontent", None)
+
+
 @frappe.whitelist()
 def get_export_status(export_id: str):
     """
-    Get status of an export operation (for future async exports).
+    Get status of a background export started with start_export.
     
     Args:
         export_id: Unique identifier for the export operation
         
     Returns:
-        Dictionary with export status information
+        Dictionary with status (queued / running / completed / failed),
+        progress (0-100), message and, once completed, file_url
     """
-    # This would be implemented for async exports in the future
-    # For now, all exports are synchronous
-    return {"status": "completed", "message": "Synchronous export completed"}
+    status = frappe.cache().get_value(_export_status_key(export_id))
+    if not status or (status.get("user") != frappe.session.user and frappe.session.user != "Administrator"):
+        return {"status": "not_found", "message": _("Export not found or expired")}
+    return status
 
 
 @frappe.whitelist()
@@ -335,10 +497,23 @@ def get_available_export_formats(report_name: str):
     try:
         validate_export_request(report_name)
         
-        # Standard formats
+        # Standard formats. Both are built in the background: clients pass
+        # `method` to start_export and poll get_export_status for the file.
         formats = [
-            {"key": "excel", "label": "Excel (.xlsx)", "endpoint": "export_report_to_excel_v2"},
-            {"key": "pdf", "label": "PDF (.pdf)", "endpoint": "export_report_to_pdf_v2"}
+            {
+                "key": "excel",
+                "label": "Excel (.xlsx)",
+                "endpoint": "export_report_to_excel_v2",
+                "method": "freightmas.utils.export_utils.export_report_to_excel_v2",
+                "background": True,
+            },
+            {
+                "key": "pdf",
+                "label": "PDF (.pdf)",
+                "endpoint": "export_report_to_pdf_v2",
+                "method": "freightmas.utils.export_utils.export_report_to_pdf_v2",
+                "background": True,
+            },
         ]
         
         # Check for custom export functions
@@ -2,6 +2,14 @@ import frappe
 from frappe.utils import add_days, getdate, nowdate
 
 
+RATE_CARD_FIELDS = [
+	"name", "port", "direction", "currency", "valid_from", "valid_to",
+	"dnd_free_days", "storage_free_days",
+]
+
+CONTAINER_RATE_FIELDS = ["dnd_rate_per_day", "storage_rate_per_day", "storage_rate_per_day_hazardous"]
+
+
 def find_rate_card_header(shipping_line, port, direction, as_of_date=None):
 	"""
 	Find the best matching DND Storage Rate Card header for a job.
@@ -17,14 +25,117 @@ def find_rate_card_header(shipping_line, port, direction, as_of_date=None):
 	if not shipping_line:
 		return None
 
-	today = getdate(as_of_date or nowdate())
+	return resolve_rate_card(get_rate_card_index(), shipping_line, port, direction, as_of_date)
+
+
+# ── Process-level rate card index ────────────────────────────────────────────
+# Every active rate card with its per-container-type rates, keyed by
+# (shipping_line, port, direction) and carrying its validity window, built once
+# per worker process. A version stamp in Redis lets a rate card save on any
+# worker invalidate the index everywhere (see clear_rate_card_index).
+
+RATE_CARD_INDEX_VERSION_KEY = "freightmas:dnd_rate_card_index_version"
+
+_rate_card_index = {}  # site -> (version, index)
+
+
+def get_rate_card_index():
+	"""Return {(shipping_line, port, direction): [card, ...]} for all active cards.
+	Each card is a frappe._dict of RATE_CARD_FIELDS plus `rates`
+	({container_type: rates}). Costs one Redis read when warm, no DB queries."""
+	site = getattr(frappe.local, "site", None)
+	version = frappe.cache().get_value(RATE_CARD_INDEX_VERSION_KEY)
+	if version is None:
+		# No stamp (first use, or Redis was flushed): nothing cached can be
+		# trusted - start a new version and rebuild.
+		version = _bump_rate_card_index_version()
+	cached = _rate_card_index.get(site)
+	if cached and cached[0] == version:
+		return cached[1]
+
+	index = _build_rate_card_index()
+	_rate_card_index[site] = (version, index)
+	return index
 
-	candidates = frappe.get_all(
+
+def _build_rate_card_index():
+	cards = frappe.get_all(
 		"DND Storage Rate Card",
-		filters={"shipping_line": shipping_line, "is_active": 1},
-		fields=["name", "port", "direction", "currency", "valid_from", "valid_to",
-		        "dnd_free_days", "storage_free_days"],
+		filters={"is_active": 1},
+		fields=RATE_CARD_FIELDS + ["shipping_line"],
+		order_by="modified desc",
 	)
+	rates_by_card = {}
+	if cards:
+		for item in frappe.get_all(
+			"DND Storage Rate Card Item",
+			filters={"parenttype": "DND Storage Rate Card", "parent": ["in", [c.name for c in cards]]},
+			fields=["parent", "container_type"] + CONTAINER_RATE_FIELDS,
+			order_by="idx asc",
+		):
+			# First matching row wins, as with a get_value on the child table.
+			rates_by_card.setdefault(item.parent, {}).setdefault(
+				item.container_type,
+				frappe._dict({f: item.get(f) for f in CONTAINER_RATE_FIELDS}),
+			)
+
+	index = {}
+	for card in cards:
+		card.rates = rates_by_card.get(card.name, {})
+		key = (card.shipping_line, card.port or "", card.direction or "")
+		index.setdefault(key, []).append(card)
+	return index
+
+
+def _bump_rate_card_index_version():
+	version = frappe.generate_hash(length=10)
+	frappe.cache().set_value(RATE_CARD_INDEX_VERSION_KEY, version)
+	return version
+
+
+def clear_rate_card_index(*args, **kwargs):
+	"""Invalidate the rate card index in every worker, now and again once the
+	current transaction commits - a worker rebuilding in between would read the
+	pre-commit rows. Called from DND Storage Rate Card on_update / on_trash /
+	after_rename."""
+	site = getattr(frappe.local, "site", None)
+
+	def clear():
+		_bump_rate_card_index_version()
+		_rate_card_index.pop(site, None)
+
+	clear()
+	frappe.db.after_commit.add(clear)
+
+
+def resolve_rate_card(index, shipping_line, port, direction, as_of_date=None):
+	"""Best matching card from the index, same priority order as find_rate_card_header."""
+	if not shipping_line:
+		return None
+
+	candidates = []
+	seen = set()
+	for key in (
+		(shipping_line, port or "", direction or ""),
+		(shipping_line, port or "", ""),
+		(shipping_line, "", direction or ""),
+		(shipping_line, "", ""),
+	):
+		if key in seen:
+			continue
+		seen.add(key)
+		candidates.extend(index.get(key, []))
+
+	return select_rate_card(candidates, port, direction, as_of_date)
+
+
+def select_rate_card(candidates, port, direction, as_of_date=None):
+	"""
+	Pick the best matching card from pre-fetched active rate card headers of one
+	shipping line, using the same validity + priority rules as find_rate_card_header.
+	Pure function — no database access — so bulk callers can reuse one fetch.
+	"""
+	today = getdate(as_of_date or nowdate())
 
 	# Filter by validity and bucket into priority groups
 	buckets = {1: [], 2: [], 3: [], 4: []}
@@ -62,19 +173,37 @@ def find_container_rate(card_name, container_type):
 	"""
 	Look up the per-container-type rates from the rate card's child table.
 	Returns a dict {dnd_rate_per_day, storage_rate_per_day, storage_rate_per_day_hazardous},
-	or zeros if not found.
+	or zeros if not found. Active cards are answered from the rate card index.
 	"""
+	for cards in get_rate_card_index().values():
+		for card in cards:
+			if card.name == card_name:
+				return card.rates.get(container_type) or zero_container_rate()
+
 	row = frappe.db.get_value(
 		"DND Storage Rate Card Item",
 		{"parent": card_name, "container_type": container_type},
-		["dnd_rate_per_day", "storage_rate_per_day", "storage_rate_per_day_hazardous"],
+		CONTAINER_RATE_FIELDS,
 		as_dict=True,
 	)
 	if row:
 		return row
+	return zero_container_rate()
+
+
+def zero_container_rate():
 	return frappe._dict(dnd_rate_per_day=0, storage_rate_per_day=0, storage_rate_per_day_hazardous=0)
 
 
+def fallback_free_days_for(shipping_line_row, direction):
+	"""Free days from the Shipping Line master, used when no rate card matches."""
+	if not shipping_line_row:
+		return 0
+	if direction == "Import":
+		return shipping_line_row.free_days_import
+	return shipping_line_row.free_days_export or 0
+
+
 def calculate_dnd_days(discharge_date, pickup_date, dnd_free_days, direction):
 	"""
 	Returns (total_days, chargeable_days).
@@ -195,56 +324,65 @@ def calculate_dnd_storage_for_job(forwarding_job_doc):
 			["free_days_import", "free_days_export"],
 			as_dict=True,
 		)
-		if sl:
-			fallback_free_days = sl.free_days_import if direction == "Import" else (sl.free_days_export or 0)
+		fallback_free_days = fallback_free_days_for(sl, direction)
 
 	total_dnd = 0
 	total_storage = 0
 
 	for row in (forwarding_job_doc.forwarding_dnd_storage_details or []):
-		if header:
-			row.rate_card = header.name
-			row.rate_card_currency = header.currency
-			row.dnd_free_days = header.dnd_free_days or 0
-			row.storage_free_days = header.storage_free_days or 0
-
-			# Per-container rates from child table
-			rates = find_container_rate(header.name, row.container_type)
-			row.dnd_rate_per_day = rates.dnd_rate_per_day or 0
-			# Use hazardous storage rate when cargo is hazardous and a non-zero rate exists
-			hazardous_storage_rate = rates.storage_rate_per_day_hazardous or 0
-			if row.get("is_hazardous") and hazardous_storage_rate:
-				row.storage_rate_per_day = hazardous_storage_rate
-			else:
-				row.storage_rate_per_day = rates.storage_rate_per_day or 0
-		else:
-			row.rate_card = None
-			row.rate_card_currency = None
-			row.dnd_free_days = fallback_free_days
-			row.storage_free_days = fallback_free_days
-			row.dnd_rate_per_day = 0
-			row.storage_rate_per_day = 0
-
-		# DND days — returnable containers end at empty_return_date; others at gate_out_date
-		dnd_end = row.empty_return_date if row.to_be_returned else row.gate_out_date
-		total_dnd_days, chargeable_dnd = calculate_dnd_days(
-			row.discharge_date, dnd_end, row.dnd_free_days, direction
-		)
-		row.total_dnd_days = total_dnd_days
-		row.chargeable_dnd_days = chargeable_dnd
-		row.estimated_dnd_cost = chargeable_dnd * (row.dnd_rate_per_day or 0)
-
-		# Storage days — always ends at gate_out_date (when container leaves terminal)
-		total_storage_days, chargeable_storage = calculate_storage_days(
-			row.discharge_date, row.gate_out_date, row.storage_free_days
-		)
-		row.total_storage_days = total_storage_days
-		row.chargeable_storage_days = chargeable_storage
-		row.estimated_storage_cost = chargeable_storage * (row.storage_rate_per_day or 0)
-
-		row.total_container_cost = (row.estimated_dnd_cost or 0) + (row.estimated_storage_cost or 0)
+		# Per-container rates are preloaded on the indexed header
+		rates = header.rates.get(row.container_type) if header else None
+		apply_dnd_figures(row, header, rates, fallback_free_days, direction)
 
 		total_dnd += row.estimated_dnd_cost or 0
 		total_storage += row.estimated_storage_cost or 0
 
 	return total_dnd, total_storage, total_dnd + total_storage
+
+
+def apply_dnd_figures(row, header, rates, fallback_free_days, direction):
+	"""
+	Set the rate card, free days, rates, day counts and costs on one DND row in place.
+	`row` may be a child document or a frappe._dict; `rates` is the container rate
+	for the row's container type on `header` (ignored when there is no header).
+	"""
+	if header:
+		rates = rates or zero_container_rate()
+		row.rate_card = header.name
+		row.rate_card_currency = header.currency
+		row.dnd_free_days = header.dnd_free_days or 0
+		row.storage_free_days = header.storage_free_days or 0
+
+		row.dnd_rate_per_day = rates.dnd_rate_per_day or 0
+		# Use hazardous storage rate when cargo is hazardous and a non-zero rate exists
+		hazardous_storage_rate = rates.storage_rate_per_day_hazardous or 0
+		if row.get("is_hazardous") and hazardous_storage_rate:
+			row.storage_rate_per_day = hazardous_storage_rate
+		else:
+			row.storage_rate_per_day = rates.storage_rate_per_day or 0
+	else:
+		row.rate_card = None
+		row.rate_card_currency = None
+		row.dnd_free_days = fallback_free_days
+		row.storage_free_days = fallback_free_days
+		row.dnd_rate_per_day = 0
+		row.storage_rate_per_day = 0
+
+	# DND days — returnable containers end at empty_return_date; others at gate_out_date
+	dnd_end = row.empty_return_date if row.to_be_returned else row.gate_out_date
+	total_dnd_days, chargeable_dnd = calculate_dnd_days(
+		row.discharge_date, dnd_end, row.dnd_free_days, direction
+	)
+	row.total_dnd_days = total_dnd_days
+	row.chargeable_dnd_days = chargeable_dnd
+	row.estimated_dnd_cost = chargeable_dnd * (row.dnd_rate_per_day or 0)
+
+	# Storage days — always ends at gate_out_date (when container leaves terminal)
+	total_storage_days, chargeable_storage = calculate_storage_days(
+		row.discharge_date, row.gate_out_date, row.storage_free_days
+	)
+	row.total_storage_days = total_storage_days
+	row.chargeable_storage_days = chargeable_storage
+	row.estimated_storage_cost = chargeable_storage * (row.storage_rate_per_day or 0)
+
+	row.total_container_cost = (row.estimated_dnd_cost or 0) + (row.estimated_storage_cost or 0)
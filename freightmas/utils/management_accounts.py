@@ -7,6 +7,9 @@ custom reports into a single downloadable .xlsx file.
 """
 
 import importlib
+import queue
+import threading
+import time
 from io import BytesIO
 
 import frappe
@@ -41,6 +44,11 @@ CENTER = Alignment(horizontal="center", vertical="center")
 RIGHT = Alignment(horizontal="right", vertical="center")
 LEFT = Alignment(horizontal="left", vertical="center")
 
+# Reports are independent of each other, so they run on this many worker
+# threads (each with its own database connection) and the sheets are written
+# afterwards in REPORT_CONFIGS order.
+REPORT_WORKERS = 4
+
 # ---------------------------------------------------------------------------
 # Report Registry
 # ---------------------------------------------------------------------------
@@ -513,19 +521,22 @@ def write_report_to_sheet(ws, columns, data, title, report_filters, is_tree=Fals
 # ---------------------------------------------------------------------------
 # Cover Sheet
 # ---------------------------------------------------------------------------
-def write_cover_sheet(ws, master_filters, sheet_results):
+def write_cover_sheet(ws, master_filters, sheet_results, total_seconds=None):
 	"""
 	Generate a cover / table-of-contents sheet.
 
 	Args:
 		ws: openpyxl Worksheet (first sheet)
 		master_filters: harmonized filter dict
-		sheet_results: list of dicts with keys: sheet_name, success, error
+		sheet_results: list of dicts with keys: sheet_name, success, error,
+			seconds (report run time)
+		total_seconds: wall-clock time for the whole workbook
 	"""
 	ws.sheet_view.showGridLines = False
 	ws.column_dimensions["A"].width = 5
 	ws.column_dimensions["B"].width = 45
 	ws.column_dimensions["C"].width = 20
+	ws.column_dimensions["D"].width = 12
 
 	row = 1
 
@@ -597,7 +608,7 @@ def write_cover_sheet(ws, master_filters, sheet_results):
 	row += 1
 
 	# Header row
-	for c, label in enumerate(["#", "Report", "Status"], start=1):
+	for c, label in enumerate(["#", "Report", "Status", "Time (s)"], start=1):
 		cell = ws.cell(row=row, column=c, value=label)
 		cell.font = BOLD_WHITE
 		cell.fill = HEADER_FILL
@@ -617,6 +628,10 @@ def write_cover_sheet(ws, master_filters, sheet_results):
 			status_cell.font = Font(color="FF0000")
 		else:
 			status_cell.font = Font(color="008000")
+		time_cell = ws.cell(row=row, column=4, value=flt(sr.get("seconds"), 2))
+		time_cell.number_format = "0.00"
+		time_cell.alignment = RIGHT
+		time_cell.border = THIN_BORDER
 		row += 1
 
 	row += 2
@@ -627,6 +642,10 @@ def write_cover_sheet(ws, master_filters, sheet_results):
 	row += 1
 	ws.cell(row=row, column=1, value="Export date:").font = FILTER_LABEL_FONT
 	ws.cell(row=row, column=2, value=now_datetime().strftime("%d-%b-%Y %H:%M"))
+	if total_seconds is not None:
+		row += 1
+		ws.cell(row=row, column=1, value="Generated in:").font = FILTER_LABEL_FONT
+		ws.cell(row=row, column=2, value=f"{total_seconds:.1f}s ({REPORT_WORKERS} reports at a time)")
 
 
 # ---------------------------------------------------------------------------
@@ -678,6 +697,85 @@ def _execute_report(config, report_filters):
 	return columns, normalised_data
 
 
+# ---------------------------------------------------------------------------
+# Run reports concurrently
+# ---------------------------------------------------------------------------
+def run_reports(jobs, workers=None):
+	"""
+	Execute many reports on a pool of worker threads.
+
+	Args:
+		jobs: list of (config, report_filters)
+		workers: thread count, defaults to REPORT_WORKERS
+
+	Returns:
+		list of (columns, data, error, seconds) in the same order as ``jobs``;
+		``error`` is the exception raised by the report, else None.
+
+	Each worker opens its own connection to the site as the requesting user,
+	so reports apply the same permissions as when run one after another.
+	Nothing is written from the workers.
+	"""
+	workers = min(workers or REPORT_WORKERS, len(jobs))
+	if workers <= 1:
+		return [_timed_execute(config, report_filters) for config, report_filters in jobs]
+
+	pending = queue.Queue()
+	for idx, job in enumerate(jobs):
+		pending.put((idx, job))
+	results = [None] * len(jobs)
+
+	site = frappe.local.site
+	sites_path = frappe.local.sites_path
+	user = frappe.session.user
+	lang = getattr(frappe.local, "lang", None)
+
+	def worker():
+		frappe.init(site=site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			frappe.set_user(user)
+			if lang:
+				frappe.local.lang = lang
+			while True:
+				try:
+					idx, (config, report_filters) = pending.get_nowait()
+				except queue.Empty:
+					return
+				results[idx] = _timed_execute(config, report_filters)
+				frappe.clear_messages()
+		except Exception as e:
+			# Could not even connect — fail whatever this worker would have taken.
+			while True:
+				try:
+					idx, _job = pending.get_nowait()
+				except queue.Empty:
+					break
+				results[idx] = ([], [], e, 0.0)
+		finally:
+			frappe.destroy()
+
+	threads = [
+		threading.Thread(target=worker, name=f"management-accounts-{i}", daemon=True)
+		for i in range(workers)
+	]
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+
+	return results
+
+
+def _timed_execute(config, report_filters):
+	started = time.monotonic()
+	try:
+		columns, data = _execute_report(config, report_filters)
+		return columns, data, None, time.monotonic() - started
+	except Exception as e:
+		return [], [], e, time.monotonic() - started
+
+
 # ---------------------------------------------------------------------------
 # Main Orchestrator
 # ---------------------------------------------------------------------------
@@ -685,26 +783,45 @@ def generate_management_accounts(master_filters):
 	"""
 	Generate the multi-sheet Management Accounts workbook.
 
+	All reports are executed concurrently first (see run_reports), then their
+	sheets are written in REPORT_CONFIGS order and the cover sheet records how
+	long each report took.
+
 	Args:
 		master_filters: dict with harmonized filter values
 
 	Returns:
 		BytesIO containing the .xlsx file
 	"""
+	started = time.monotonic()
 	wb = openpyxl.Workbook()
 
 	# We'll write the cover sheet last (needs results from all reports)
 	cover_ws = wb.active
 	cover_ws.title = _safe_sheet_title("Cover")
 
+	# Filters are resolved up front (they may query fiscal years)
+	jobs = []
+	filter_errors = {}
+	for idx, config in enumerate(REPORT_CONFIGS):
+		try:
+			jobs.append((config, build_report_filters(config, master_filters)))
+		except Exception as e:
+			filter_errors[idx] = e
+			jobs.append((config, None))
+
+	runnable = [idx for idx in range(len(jobs)) if idx not in filter_errors]
+	results = dict(zip(runnable, run_reports([jobs[idx] for idx in runnable])))
+
 	sheet_results = []
 
-	for config in REPORT_CONFIGS:
+	for idx, (config, report_filters) in enumerate(jobs):
 		sheet_name = _safe_sheet_title(config["sheet_name"])
+		columns, data, error, seconds = results.get(idx) or ([], [], filter_errors.get(idx), 0.0)
 
 		try:
-			report_filters = build_report_filters(config, master_filters)
-			columns, data = _execute_report(config, report_filters)
+			if error:
+				raise error
 
 			ws = wb.create_sheet(title=sheet_name)
 			write_report_to_sheet(
@@ -715,7 +832,7 @@ def generate_management_accounts(master_filters):
 				report_filters,
 				is_tree=config.get("is_tree", False),
 			)
-			sheet_results.append({"sheet_name": config["sheet_name"], "success": True})
+			sheet_results.append({"sheet_name": config["sheet_name"], "success": True, "seconds": seconds})
 
 		except Exception as e:
 			frappe.log_error(
@@ -723,6 +840,8 @@ def generate_management_accounts(master_filters):
 				"Management Accounts Export Error",
 			)
 			# Create a sheet with the error message
+			if sheet_name in wb.sheetnames:
+				wb.remove(wb[sheet_name])
 			ws = wb.create_sheet(title=sheet_name)
 			ws.cell(row=1, column=1, value=config["sheet_name"]).font = SUBTITLE_FONT
 			ws.cell(row=2, column=1, value=f"Error generating this report: {str(e)}")
@@ -731,10 +850,14 @@ def generate_management_accounts(master_filters):
 				"sheet_name": config["sheet_name"],
 				"success": False,
 				"error": str(e)[:80],
+				"seconds": seconds,
 			})
 
+	timings = ", ".join(f"{sr['sheet_name']} {flt(sr['seconds'], 2)}s" for sr in sheet_results)
+	frappe.logger().info(f"Management Accounts: {time.monotonic() - started:.1f}s — {timings}")
+
 	# Now write the cover sheet with results
-	write_cover_sheet(cover_ws, master_filters, sheet_results)
+	write_cover_sheet(cover_ws, master_filters, sheet_results, total_seconds=time.monotonic() - started)
 
 	# Save
 	output = BytesIO()
@@ -0,0 +1,299 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Month-end party balance snapshots for statement opening balances.
+
+A Party Balance Snapshot holds the cumulative debit - credit of a customer's
+or supplier's non-cancelled GL Entries up to a month end, one row per
+(company, party type, party, month end) in which the party had postings.
+An opening balance is then the latest valid snapshot before the statement's
+from date plus the GL Entries between the two - a scan of at most a few
+weeks instead of the party's whole history.
+
+Snapshots are only written for closed months (up to the end of the previous
+month) by the daily refresh. A GL Entry dated on or before a snapshot - a
+back-dated posting, a cancellation, a repost - marks that party's snapshots
+from its posting date on stale in the same transaction; openings skip stale
+rows (falling back to an earlier snapshot and a longer delta) until the next
+refresh rebuilds them. A back-dated posting after the party's last snapshot
+(or for a party with none) has no row to mark, so it records a stale marker
+row for its month instead; otherwise the refresh, which only reads entries
+after the last completed month end, would never see it.
+"""
+
+import frappe
+from frappe.utils import add_months, flt, get_last_day, getdate, now, today
+
+DOCTYPE = "Party Balance Snapshot"
+PARTY_TYPES = ("Customer", "Supplier")
+
+# tabDefaultValue global: the month end every party's snapshots are complete up to.
+THROUGH_KEY = "freightmas_party_balance_snapshot_through"
+
+INSERT_CHUNK = 500
+
+_SNAPSHOT_FIELDS = ["company", "party_type", "party", "period_end", "balance", "is_stale"]
+_STANDARD_FIELDS = ["name", "owner", "modified_by", "creation", "modified", "docstatus"]
+
+
+def last_closed_month_end(date=None):
+	return get_last_day(add_months(getdate(date or today()), -1))
+
+
+def get_party_opening_balance(company, party_type, parties, from_date):
+	"""Debit - credit of the non-cancelled GL Entries of `parties` (a name or a
+	list) posted before `from_date`: each party's latest valid snapshot before
+	from_date plus the entries after it. Parties without a snapshot are summed
+	from the beginning."""
+	if isinstance(parties, str):
+		parties = [parties]
+	parties = list(parties or [])
+	if not parties or not from_date:
+		return 0
+
+	params = {
+		"company": company,
+		"party_type": party_type,
+		"parties": tuple(parties),
+		"from_date": getdate(from_date),
+	}
+	snapshots = frappe.db.sql(
+		f"""
+		SELECT s.party, s.period_end, s.balance
+		FROM `tab{DOCTYPE}` s
+		WHERE s.company = %(company)s
+		AND s.party_type = %(party_type)s
+		AND s.party IN %(parties)s
+		AND s.is_stale = 0
+		AND s.period_end = (
+			SELECT MAX(s2.period_end)
+			FROM `tab{DOCTYPE}` s2
+			WHERE s2.company = s.company
+			AND s2.party_type = s.party_type
+			AND s2.party = s.party
+			AND s2.is_stale = 0
+			AND s2.period_end < %(from_date)s
+		)
+		""",
+		params,
+		as_dict=True,
+	)
+
+	balance = sum(flt(row.balance) for row in snapshots)
+	branches = []
+	for i, row in enumerate(snapshots):
+		params[f"party_{i}"] = row.party
+		params[f"since_{i}"] = row.period_end
+		branches.append(f"(party = %(party_{i})s AND posting_date > %(since_{i})s)")
+
+	covered = {row.party for row in snapshots}
+	uncovered = tuple(party for party in parties if party not in covered)
+	if uncovered:
+		params["uncovered"] = uncovered
+		branches.append("party IN %(uncovered)s")
+
+	delta = frappe.db.sql(
+		f"""
+		SELECT SUM(debit) - SUM(credit)
+		FROM `tabGL Entry`
+		WHERE company = %(company)s
+		AND party_type = %(party_type)s
+		AND is_cancelled = 0
+		AND posting_date < %(from_date)s
+		AND ({" OR ".join(branches)})
+		""",
+		params,
+	)
+	return balance + flt(delta[0][0] if delta else 0)
+
+
+def invalidate_party_balance_snapshots(doc, method=None):
+	"""doc_events GL Entry after_insert: a posting dated inside a closed month
+	marks the party's snapshots from its posting date on stale."""
+	if doc.party_type not in PARTY_TYPES or not doc.party:
+		return
+
+	from_date = getdate(doc.posting_date)
+	if doc.is_cancelled:
+		# Cancelling flags the original entries is_cancelled by a direct
+		# update and the reversal may be dated later, so invalidate from the
+		# voucher's earliest entry for this party.
+		earliest = frappe.db.sql(
+			"""
+			SELECT MIN(posting_date)
+			FROM `tabGL Entry`
+			WHERE voucher_type = %s AND voucher_no = %s AND party_type = %s AND party = %s
+			""",
+			(doc.voucher_type, doc.voucher_no, doc.party_type, doc.party),
+		)
+		if earliest and earliest[0][0]:
+			from_date = min(from_date, getdate(earliest[0][0]))
+
+	if from_date > last_closed_month_end():
+		return
+
+	key_filters = {"company": doc.company, "party_type": doc.party_type, "party": doc.party}
+	frappe.db.set_value(
+		DOCTYPE,
+		dict(key_filters, period_end=[">=", from_date], is_stale=0),
+		"is_stale",
+		1,
+		update_modified=False,
+	)
+
+	# Months up to the marker are never re-read by the refresh's month
+	# extension, so a posting there that matched no snapshot must leave a
+	# stale row behind for the party to be rebuilt.
+	marker = frappe.db.get_global(THROUGH_KEY)
+	if not marker or from_date > getdate(marker):
+		return
+	if not frappe.db.exists(DOCTYPE, dict(key_filters, is_stale=1)):
+		_insert_rows([dict(key_filters, period_end=get_last_day(from_date), balance=0, is_stale=1)])
+
+
+def refresh_party_balance_snapshots():
+	"""Daily scheduler: rebuild stale snapshots, then snapshot the months
+	closed since the last run. Each party is extended from its own latest
+	valid snapshot, so only GL Entries after it are read."""
+	through = last_closed_month_end()
+	marker = frappe.db.get_global(THROUGH_KEY)
+	if not marker:
+		rebuild_party_balance_snapshots(through)
+		frappe.db.commit()
+		return
+
+	for key in _stale_keys():
+		company, party_type, party = key
+		frappe.db.delete(
+			DOCTYPE, {"company": company, "party_type": party_type, "party": party, "is_stale": 1}
+		)
+		_extend_snapshots(through, key=key)
+		frappe.db.commit()
+
+	if getdate(marker) < through:
+		# Parties that went stale since the loop above are rebuilt next run.
+		_extend_snapshots(through, since=getdate(marker), exclude=set(_stale_keys()))
+		frappe.db.set_global(THROUGH_KEY, str(through))
+		frappe.db.commit()
+
+
+def rebuild_party_balance_snapshots(through=None):
+	"""Drop and rebuild every snapshot up to `through` (default: the last
+	closed month end) - used by the backfill patch and the first refresh.
+	Returns the number of snapshots written."""
+	through = getdate(through or last_closed_month_end())
+	frappe.db.delete(DOCTYPE)
+	written = _extend_snapshots(through)
+	frappe.db.set_global(THROUGH_KEY, str(through))
+	return written
+
+
+def build_snapshot_rows(movements, latest, exclude=()):
+	"""Snapshot rows from monthly `movements` (company, party_type, party,
+	period_end, movement - ordered by party then period_end), running on from
+	each party's `latest` {(company, party_type, party): (period_end, balance)}.
+	Months already covered by the latest snapshot are skipped."""
+	rows = []
+	running = {}
+	for movement in movements:
+		key = (movement.company, movement.party_type, movement.party)
+		if key in exclude:
+			continue
+		period_end = getdate(movement.period_end)
+		base_end, base_balance = latest.get(key, (None, 0))
+		if base_end and period_end <= getdate(base_end):
+			continue
+		running[key] = running.get(key, flt(base_balance)) + flt(movement.movement)
+		rows.append({
+			"company": movement.company,
+			"party_type": movement.party_type,
+			"party": movement.party,
+			"period_end": period_end,
+			"balance": running[key],
+			"is_stale": 0,
+		})
+	return rows
+
+
+def _extend_snapshots(through, since=None, key=None, exclude=()):
+	latest = _latest_snapshots(key)
+	if key and since is None and key in latest:
+		since = latest[key][0]
+	rows = build_snapshot_rows(_monthly_movements(through, since, key), latest, exclude)
+	_insert_rows(rows)
+	return len(rows)
+
+
+def _key_condition(key, alias=""):
+	if not key:
+		return "", {}
+	company, party_type, party = key
+	return (
+		f"AND {alias}company = %(key_company)s AND {alias}party_type = %(key_party_type)s"
+		f" AND {alias}party = %(key_party)s",
+		{"key_company": company, "key_party_type": party_type, "key_party": party},
+	)
+
+
+def _latest_snapshots(key=None):
+	condition, params = _key_condition(key)
+	rows = frappe.db.sql(
+		f"""
+		SELECT s.company, s.party_type, s.party, s.period_end, s.balance
+		FROM `tab{DOCTYPE}` s
+		JOIN (
+			SELECT company, party_type, party, MAX(period_end) AS period_end
+			FROM `tab{DOCTYPE}`
+			WHERE is_stale = 0 {condition}
+			GROUP BY company, party_type, party
+		) l ON l.company = s.company AND l.party_type = s.party_type
+			AND l.party = s.party AND l.period_end = s.period_end
+		WHERE s.is_stale = 0
+		""",
+		params,
+		as_dict=True,
+	)
+	return {(row.company, row.party_type, row.party): (row.period_end, row.balance) for row in rows}
+
+
+def _monthly_movements(through, since=None, key=None):
+	condition, params = _key_condition(key)
+	params.update({"party_types": PARTY_TYPES, "through": through, "since": since})
+	since_condition = "AND posting_date > %(since)s" if since else ""
+	return frappe.db.sql(
+		f"""
+		SELECT company, party_type, party, LAST_DAY(posting_date) AS period_end,
+			SUM(debit) - SUM(credit) AS movement
+		FROM `tabGL Entry`
+		WHERE is_cancelled = 0
+		AND party_type IN %(party_types)s
+		AND IFNULL(party, '') != ''
+		AND posting_date <= %(through)s
+		{since_condition}
+		{condition}
+		GROUP BY company, party_type, party, LAST_DAY(posting_date)
+		ORDER BY company, party_type, party, period_end
+		""",
+		params,
+		as_dict=True,
+	)
+
+
+def _stale_keys():
+	return [
+		tuple(row)
+		for row in frappe.db.sql(
+			f"SELECT DISTINCT company, party_type, party FROM `tab{DOCTYPE}` WHERE is_stale = 1"
+		)
+	]
+
+
+def _insert_rows(rows):
+	stamp = now()
+	user = frappe.session.user
+	values = [
+		[frappe.generate_hash(length=10), user, user, stamp, stamp, 0] + [row[f] for f in _SNAPSHOT_FIELDS]
+		for row in rows
+	]
+	for start in range(0, len(values), INSERT_CHUNK):
+		frappe.db.bulk_insert(DOCTYPE, _STANDARD_FIELDS + _SNAPSHOT_FIELDS, values[start:start + INSERT_CHUNK])
@@ -34,6 +34,8 @@ Supports:
 - Border Clearing duty pass-through rows (settle at invoice time, never in WIP)
 """
 
+from contextlib import contextmanager
+
 import frappe
 from frappe import _
 from frappe.utils import flt, nowdate, get_link_to_form, getdate
@@ -131,9 +133,41 @@ def get_recognition_job_reference(invoice_doc):
     return None, None, None, None
 
 
+# Validated settings bundle, cached per site; cleared when FreightMas Settings
+# or any Account changes (see clear_recognition_settings_cache).
+RECOGNITION_SETTINGS_CACHE_KEY = "freightmas:recognition_settings"
+RECOGNITION_SETTINGS_CACHE_TTL = 6 * 60 * 60  # seconds; bounds staleness if a clear is missed
+
+
 def get_recognition_settings():
     """
-    Fetch and validate revenue/cost recognition settings from FreightMas Settings.
+    Validated revenue/cost recognition settings from FreightMas Settings.
+
+    The bundle built by load_recognition_settings is cached per site, so the
+    settings read and account checks run once per change rather than on every
+    invoice validate / GL build / submit hook. Misconfigured settings are never
+    cached: every call keeps raising until they are fixed.
+
+    Returns:
+        dict: Settings including enable flag, validated accounts
+
+    Raises:
+        frappe.ValidationError: If any account is misconfigured
+    """
+    cache = frappe.cache()
+    settings = cache.get_value(RECOGNITION_SETTINGS_CACHE_KEY)
+    if settings is None:
+        settings = load_recognition_settings()
+        cache.set_value(
+            RECOGNITION_SETTINGS_CACHE_KEY, settings, expires_in_sec=RECOGNITION_SETTINGS_CACHE_TTL
+        )
+    return dict(settings)
+
+
+def load_recognition_settings(settings=None):
+    """
+    Fetch and validate revenue/cost recognition settings from FreightMas Settings
+    (or the given, possibly unsaved, settings document). Not cached.
     P0 FIX #3: Validates account types to prevent misconfiguration fraud.
     
     Returns:
@@ -142,10 +176,10 @@ def get_recognition_settings():
     Raises:
         frappe.ValidationError: If any account is misconfigured
     """
-    settings = frappe.get_single("FreightMas Settings")
+    settings = settings or frappe.get_single("FreightMas Settings")
     
     if not settings.enable_revenue_recognition:
-        return {"enabled": False}
+        return {"enabled": False, "pass_through_account": settings.duty_pass_through_account}
     
     # Validate WIP accounts (WIP Revenue = Liability, WIP Cost = Asset)
     wip_revenue = validate_wip_account_type(
@@ -182,6 +216,20 @@ def get_recognition_settings():
     }
 
 
+def clear_recognition_settings_cache(doc=None, method=None, *args, **kwargs):
+    """
+    doc_events hook (Account update / trash / rename) and FreightMas Settings on_update.
+
+    Cleared now and again once the transaction commits: a request that reloads
+    the bundle in between would otherwise cache the pre-commit settings.
+    """
+    def clear():
+        frappe.cache().delete_value(RECOGNITION_SETTINGS_CACHE_KEY)
+
+    clear()
+    frappe.db.after_commit.add(clear)
+
+
 @frappe.whitelist()
 def is_revenue_recognition_enabled():
     """Check if revenue recognition is enabled in settings."""
@@ -283,7 +331,14 @@ def get_service_cost_account(service_type):
 
 def get_duty_pass_through_account():
     """Get the duty pass-through account (Border Clearing), or None if unset."""
-    return frappe.db.get_single_value("FreightMas Settings", "duty_pass_through_account")
+    return get_recognition_settings().get("pass_through_account")
+
+
+# Site-wide Redis hash of "item_code::company::account field" -> resolved
+# account ("" when the item has no explicit default). frappe.cache().hget also
+# memoises per request, so a 40-line invoice walks each distinct item once.
+# Cleared on Item / Item Group / Brand changes and Account renames.
+ITEM_DEFAULT_ACCOUNT_CACHE_KEY = "freightmas:item_default_accounts"
 
 
 def resolve_item_default_account(item_code, company, account_fieldname):
@@ -295,6 +350,8 @@ def resolve_item_default_account(item_code, company, account_fieldname):
     that is only a last resort in the snapshot chain, after the per-service
     account from FreightMas Settings.
 
+    Results are cached per (item_code, company, account_fieldname).
+
     Args:
         item_code: The Item code
         company: The company to resolve defaults for
@@ -306,6 +363,15 @@ def resolve_item_default_account(item_code, company, account_fieldname):
     if not item_code:
         return None
 
+    account = frappe.cache().hget(
+        ITEM_DEFAULT_ACCOUNT_CACHE_KEY,
+        f"{item_code}::{company}::{account_fieldname}",
+        generator=lambda: _walk_item_defaults(item_code, company, account_fieldname) or "",
+    )
+    return account or None
+
+
+def _walk_item_defaults(item_code, company, account_fieldname):
     from erpnext.stock.doctype.item.item import get_item_defaults
     from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
     from erpnext.setup.doctype.brand.brand import get_brand_defaults
@@ -322,13 +388,31 @@ def resolve_item_default_account(item_code, company, account_fieldname):
     return None
 
 
+def clear_item_default_account_cache(doc=None, method=None, *args, **kwargs):
+    """
+    doc_events hook (Item / Item Group / Brand update, trash, rename; Account rename).
+
+    Cleared now and again after commit, so a lookup made before the change is
+    committed cannot repopulate the hash with the old defaults.
+    """
+    def clear():
+        frappe.cache().delete_value(ITEM_DEFAULT_ACCOUNT_CACHE_KEY)
+
+    clear()
+    frappe.db.after_commit.add(clear)
+
+
 def is_usable_account(account, company):
     """Check that an account exists, is a ledger (not group), enabled, and belongs to the company."""
     if not account:
         return False
-    acc = frappe.db.get_value(
-        "Account", account, ["company", "disabled", "is_group"], as_dict=True
-    )
+    prefetched = (frappe.flags.get(RECOGNITION_PREFETCH_FLAG) or {}).get("accounts")
+    if prefetched is not None and account in prefetched:
+        acc = prefetched[account]
+    else:
+        acc = frappe.db.get_value(
+            "Account", account, ["company", "disabled", "is_group"], as_dict=True
+        )
     return bool(acc) and not acc.disabled and not acc.is_group and acc.company == company
 
 
@@ -357,6 +441,11 @@ def get_linked_sales_invoices(job_doctype, job_name, only_submitted=True):
     if not link_field:
         frappe.throw(_("Unsupported job doctype: {0}").format(job_doctype))
     
+    if only_submitted:
+        prefetched = _get_prefetched_invoices("Sales Invoice", job_doctype, job_name)
+        if prefetched is not None:
+            return prefetched
+
     filters = {link_field: job_name}
     if only_submitted:
         filters["docstatus"] = 1
@@ -386,6 +475,11 @@ def get_linked_purchase_invoices(job_doctype, job_name, only_submitted=True):
     if not link_field:
         frappe.throw(_("Unsupported job doctype: {0}").format(job_doctype))
     
+    if only_submitted:
+        prefetched = _get_prefetched_invoices("Purchase Invoice", job_doctype, job_name)
+        if prefetched is not None:
+            return prefetched
+
     filters = {link_field: job_name}
     if only_submitted:
         filters["docstatus"] = 1
@@ -399,6 +493,124 @@ def get_linked_purchase_invoices(job_doctype, job_name, only_submitted=True):
     return [frappe.get_doc("Purchase Invoice", name) for name in invoice_names]
 
 
+# Bulk recognition: invoices (with their item lines) and the accounts they point
+# at are loaded for a whole batch of jobs in a few set queries, and
+# get_linked_*_invoices / is_usable_account answer from that instead of loading
+# every invoice document. See freightmas.utils.bulk_recognition.
+RECOGNITION_PREFETCH_FLAG = "freightmas_recognition_prefetch"
+
+PREFETCH_INVOICE_SOURCES = {
+    # invoice doctype: (item doctype, WIP-routed account field, snapshot field)
+    "Sales Invoice": ("Sales Invoice Item", "income_account", "actual_income_account"),
+    "Purchase Invoice": ("Purchase Invoice Item", "expense_account", "actual_expense_account"),
+}
+
+
+class PrefetchedInvoice(frappe._dict):
+    """An invoice from load_linked_invoices. Its item rows are under "items",
+    which a plain frappe._dict would resolve to dict.items."""
+
+    @property
+    def items(self):
+        return self["items"]
+
+
+def load_linked_invoices(job_doctype, job_names):
+    """
+    Submitted Sales and Purchase Invoices of many jobs in four queries.
+
+    Returns:
+        dict: {(invoice doctype, job name): [invoice, ...]} with an entry (possibly
+              empty) for every job; each invoice is a PrefetchedInvoice carrying
+              the fields recognition reads, with its item rows under `items`
+    """
+    link_field = JOB_LINK_FIELD_MAP.get(job_doctype)
+    if not link_field:
+        frappe.throw(_("Unsupported job doctype: {0}").format(job_doctype))
+
+    result = {}
+    for invoice_doctype, (item_doctype, account_field, snapshot_field) in PREFETCH_INVOICE_SOURCES.items():
+        for job_name in job_names:
+            result[(invoice_doctype, job_name)] = []
+        if not job_names:
+            continue
+
+        invoices = frappe.get_all(
+            invoice_doctype,
+            filters={link_field: ["in", list(job_names)], "docstatus": 1},
+            fields=["name", link_field, "posting_date", "grand_total", "company"],
+            order_by="posting_date asc, name asc",
+        )
+        if not invoices:
+            continue
+
+        items_by_invoice = {}
+        for item in frappe.get_all(
+            item_doctype,
+            filters={"parenttype": invoice_doctype, "parent": ["in", [inv.name for inv in invoices]]},
+            fields=[
+                "parent", "item_code", "item_name", account_field, snapshot_field,
+                "base_net_amount", "cost_center",
+            ],
+            order_by="parent asc, idx asc",
+        ):
+            items_by_invoice.setdefault(item.parent, []).append(item)
+
+        for row in invoices:
+            invoice = PrefetchedInvoice(row, doctype=invoice_doctype, items=items_by_invoice.get(row.name, []))
+            result[(invoice_doctype, invoice.get(link_field))].append(invoice)
+
+    return result
+
+
+def load_accounts(account_names):
+    """{account: {company, disabled, is_group}} for is_usable_account, in one query."""
+    account_names = [name for name in set(account_names) if name]
+    if not account_names:
+        return {}
+    rows = frappe.get_all(
+        "Account",
+        filters={"name": ["in", account_names]},
+        fields=["name", "company", "disabled", "is_group"],
+    )
+    # Names that don't exist are cached as missing too
+    accounts = dict.fromkeys(account_names)
+    accounts.update({row.name: row for row in rows})
+    return accounts
+
+
+@contextmanager
+def recognition_prefetch(job_doctype, job_names):
+    """
+    Serve the submitted invoices of `job_names` and the accounts their items
+    point at from memory while the block runs (e.g. while those jobs are
+    submitted one after another).
+    """
+    invoices = load_linked_invoices(job_doctype, job_names)
+    account_names = []
+    for (invoice_doctype, _job_name), rows in invoices.items():
+        _item_doctype, _account_field, snapshot_field = PREFETCH_INVOICE_SOURCES[invoice_doctype]
+        account_names.extend(item.get(snapshot_field) for invoice in rows for item in invoice.items)
+
+    frappe.flags[RECOGNITION_PREFETCH_FLAG] = {
+        "job_doctype": job_doctype,
+        "invoices": invoices,
+        "accounts": load_accounts(account_names),
+    }
+    try:
+        yield
+    finally:
+        frappe.flags.pop(RECOGNITION_PREFETCH_FLAG, None)
+
+
+def _get_prefetched_invoices(invoice_doctype, job_doctype, job_name):
+    prefetch = frappe.flags.get(RECOGNITION_PREFETCH_FLAG)
+    if not prefetch or prefetch["job_doctype"] != job_doctype:
+        return None
+    invoices = prefetch["invoices"].get((invoice_doctype, job_name))
+    return list(invoices) if invoices is not None else None
+
+
 def build_recognition_lines(invoice, job_doc, wip_account, snapshot_field,
                             invoice_account_field, get_fallback_account, remark_builder, side):
     """
@@ -0,0 +1,314 @@
+# Copyright (c) 2026, Zvomaita Technologies (Pvt) Ltd and contributors
+# For license information, please see license.txt
+
+"""Container / BL / reference search index for the job doctypes.
+
+Every Forwarding, Clearing and Border Clearing Job keeps a set of Job Search
+Key rows - one per container number, BL number and customer-facing reference
+- rebuilt from the job on every save. Each key is stored normalised
+(upper-case alphanumerics, so "MSCU 123456-5" and "mscu1234565" are the same
+key) three ways:
+
+  search_key   the normalised value - prefix searches are index seeks
+  reverse_key  the same value reversed - suffix searches become prefix seeks
+  serial_key   for ISO 6346 container numbers, the 6-digit serial - finds a
+               container by its digits alone, without owner code or check digit
+
+A container number entered without its check digit is indexed with the
+computed digit appended, so it is found whether the user searches with or
+without it.
+
+Lookups never use a leading wildcard: a value matches when it is a prefix or
+a suffix of a key (or, for containers, its serial). Substrings from the
+middle of a value no longer match - that is the price of an index seek.
+"""
+
+import re
+
+import frappe
+from frappe.utils import now
+
+DOCTYPE = "Job Search Key"
+KEY_TYPES = ("Container", "BL", "Reference")
+
+# Where each job doctype keeps the values that get indexed.
+INDEXED_JOBS = {
+	"Forwarding Job": {
+		"cargo_table": "cargo_parcel_details",
+		"cargo_doctype": "Cargo Parcel Details",
+		"container_field": "container_number",
+		"bl_fields": ("bl_number",),
+		"reference_fields": ("customer_reference",),
+	},
+	"Clearing Job": {
+		"cargo_table": "cargo_package_details",
+		"cargo_doctype": "Cargo Package Details",
+		"container_field": "container_number",
+		"bl_fields": ("bl_number",),
+		"reference_fields": ("customer_reference",),
+	},
+	"Border Clearing Job": {
+		"cargo_table": "border_clearing_cargo_details",
+		"cargo_doctype": "Border Clearing Cargo Details",
+		"container_field": "container_or_vehicle_no",
+		"bl_fields": (),
+		"reference_fields": ("customer_reference", "shipper_reference", "clearing_agent_reference"),
+	},
+}
+
+# Matches returned by one lookup - a search box, not an export. Applied after
+# the caller's scope (see find_search_keys), newest jobs first.
+MATCH_LIMIT = 500
+
+# Operators of a filters dict that find_search_keys can push into its job
+# join. Conditions with any other operator are left to the caller's own query.
+_SCOPE_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+_KEY_FIELDS = [
+	"job_doctype", "job_name", "row_name", "key_type", "raw_value",
+	"search_key", "reverse_key", "serial_key",
+]
+_STANDARD_FIELDS = ["name", "owner", "modified_by", "creation", "modified", "docstatus"]
+
+_NON_ALNUM = re.compile(r"[^0-9A-Z]")
+_CONTAINER_NO_CHECK_DIGIT = re.compile(r"[A-Z]{4}\d{6}")
+_CONTAINER_FULL = re.compile(r"[A-Z]{4}\d{7}")
+_SERIAL = re.compile(r"\d{6,7}")
+
+
+def _iso6346_letter_values():
+	"""ISO 6346 letter values: 10 upwards, skipping multiples of 11."""
+	values = {}
+	value = 10
+	for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ":
+		if value % 11 == 0:
+			value += 1
+		values[letter] = value
+		value += 1
+	return values
+
+
+_LETTER_VALUES = _iso6346_letter_values()
+
+
+def normalise(value):
+	"""Upper-case alphanumerics of `value` ("" for None)."""
+	return _NON_ALNUM.sub("", (value or "").upper())
+
+
+def container_check_digit(code):
+	"""ISO 6346 check digit for a 10-character owner code + serial."""
+	total = sum(
+		(_LETTER_VALUES[ch] if ch.isalpha() else int(ch)) * (2 ** i)
+		for i, ch in enumerate(code[:10])
+	)
+	return total % 11 % 10
+
+
+def container_key(value):
+	"""Normalised container number, with the check digit appended when a
+	well-formed number was entered without one."""
+	key = normalise(value)
+	if _CONTAINER_NO_CHECK_DIGIT.fullmatch(key):
+		key += str(container_check_digit(key))
+	return key
+
+
+def _key_row(job_doctype, job_name, key_type, value, row_name=None):
+	key = container_key(value) if key_type == "Container" else normalise(value)
+	if not key:
+		return None
+	return {
+		"job_doctype": job_doctype,
+		"job_name": job_name,
+		"row_name": row_name,
+		"key_type": key_type,
+		"raw_value": (value or "").strip()[:140],
+		"search_key": key[:140],
+		"reverse_key": key[::-1][:140],
+		"serial_key": key[4:10] if key_type == "Container" and _CONTAINER_FULL.fullmatch(key) else None,
+	}
+
+
+def build_search_keys(job_doctype, header, cargo_rows):
+	"""Search-key rows for one job. `header` is the job (document or dict with
+	name + the BL / reference fields), `cargo_rows` its cargo child rows
+	(with name + the container field). Duplicate values are indexed once."""
+	config = INDEXED_JOBS[job_doctype]
+	rows = []
+	seen = set()
+
+	def add(key_type, value, row_name=None):
+		row = _key_row(job_doctype, header.get("name"), key_type, value, row_name)
+		if row and (key_type, row["search_key"], row_name) not in seen:
+			seen.add((key_type, row["search_key"], row_name))
+			rows.append(row)
+
+	for fieldname in config["bl_fields"]:
+		add("BL", header.get(fieldname))
+	for fieldname in config["reference_fields"]:
+		add("Reference", header.get(fieldname))
+	for cargo in cargo_rows or []:
+		add("Container", cargo.get(config["container_field"]), cargo.get("name"))
+	return rows
+
+
+def insert_search_keys(rows):
+	if not rows:
+		return
+	stamp = now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		DOCTYPE,
+		_STANDARD_FIELDS + _KEY_FIELDS,
+		[
+			[frappe.generate_hash(length=10), user, user, stamp, stamp, 0] + [row[f] for f in _KEY_FIELDS]
+			for row in rows
+		],
+	)
+
+
+def update_job_search_keys(doc, method=None):
+	"""doc_events on_update / on_update_after_submit: rebuild this job's keys."""
+	config = INDEXED_JOBS.get(doc.doctype)
+	if not config:
+		return
+	frappe.db.delete(DOCTYPE, {"job_doctype": doc.doctype, "job_name": doc.name})
+	insert_search_keys(build_search_keys(doc.doctype, doc, doc.get(config["cargo_table"])))
+
+
+def delete_job_search_keys(doc, method=None):
+	"""doc_events on_trash."""
+	frappe.db.delete(DOCTYPE, {"job_doctype": doc.doctype, "job_name": doc.name})
+
+
+def rename_job_search_keys(doc, method=None, old=None, new=None, merge=False):
+	"""doc_events after_rename."""
+	if merge:
+		frappe.db.delete(DOCTYPE, {"job_doctype": doc.doctype, "job_name": old})
+		update_job_search_keys(doc)
+		return
+	frappe.db.set_value(
+		DOCTYPE, {"job_doctype": doc.doctype, "job_name": old}, "job_name", new, update_modified=False
+	)
+
+
+def _scope_conditions(scope, params):
+	"""SQL conditions on the joined job (alias `j`) for a frappe filters dict
+	such as {"customer": ["in", customers], "docstatus": ["<", 2]}."""
+	conditions = []
+	for i, (fieldname, value) in enumerate((scope or {}).items()):
+		operator = "="
+		if isinstance(value, (list, tuple)):
+			if len(value) != 2:
+				continue
+			operator, value = str(value[0]).lower(), value[1]
+		if operator not in _SCOPE_OPERATORS or not re.fullmatch(r"\w+", fieldname):
+			continue
+		if operator in ("in", "not in"):
+			value = tuple(value or ())
+			if not value:
+				conditions.append("1 = 0" if operator == "in" else "1 = 1")
+				continue
+		params[f"scope_{i}"] = value
+		conditions.append(f"j.`{fieldname}` {operator} %(scope_{i})s")
+	return conditions
+
+
+def find_search_keys(value, key_types=KEY_TYPES, job_doctypes=None, limit=MATCH_LIMIT, scope=None):
+	"""Index rows (job_doctype, job_name, row_name, key_type) whose key starts
+	or ends with `value`, or - for containers - whose serial equals the digits
+	searched for. Each branch is a separate prefix seek on its own index.
+
+	`scope` is a filters dict on the job itself (customer, docstatus, ...) for
+	a single entry in `job_doctypes`: the keys are joined to the job and
+	filtered before `limit` is applied, so a search that is common across
+	customers still returns every match the caller may see. `limit=None`
+	returns all matches."""
+	query = normalise(value)
+	if not query or not key_types:
+		return []
+
+	job_doctypes = tuple(job_doctypes or INDEXED_JOBS)
+	params = {
+		"key_types": tuple(key_types),
+		"job_doctypes": job_doctypes,
+		"prefix": f"{query}%",
+		"suffix": f"{query[::-1]}%",
+	}
+	join = ""
+	conditions = ["k.key_type IN %(key_types)s", "k.job_doctype IN %(job_doctypes)s"]
+	if scope:
+		if len(job_doctypes) != 1:
+			frappe.throw("A search scope applies to a single job doctype")
+		join = f"JOIN `tab{job_doctypes[0]}` j ON j.name = k.job_name"
+		conditions.extend(_scope_conditions(scope, params))
+
+	base = f"""
+		SELECT k.job_doctype, k.job_name, k.row_name, k.key_type
+		FROM `tab{DOCTYPE}` k
+		{join}
+		WHERE {" AND ".join(conditions)} AND
+	"""
+	branches = [base + "k.search_key LIKE %(prefix)s", base + "k.reverse_key LIKE %(suffix)s"]
+	if "Container" in key_types and _SERIAL.fullmatch(query):
+		# 6 digits = the serial; 7 = serial + check digit.
+		params["serial"] = query[:6]
+		branches.append(base + "k.serial_key = %(serial)s")
+
+	sql = " UNION ".join(f"({branch})" for branch in branches) + " ORDER BY job_name DESC, row_name"
+	if limit:
+		params["limit"] = limit
+		sql += " LIMIT %(limit)s"
+	return frappe.db.sql(sql, params, as_dict=True)
+
+
+def search_job_names(job_doctype, value, key_types=KEY_TYPES, scope=None):
+	"""Names of `job_doctype` jobs with a container / BL / reference key
+	matching `value` - for the dashboards' search boxes. `scope` narrows the
+	lookup to the jobs the caller lists (see find_search_keys)."""
+	return list(dict.fromkeys(
+		row.job_name for row in find_search_keys(value, key_types, job_doctypes=[job_doctype], scope=scope)
+	))
+
+
+def job_search_or_filters(job_doctype, search, like_fields=(), filters=None):
+	"""or_filters for a dashboard search box: the job name (LIKE, as before),
+	any `like_fields` the index doesn't cover, and every job whose container /
+	BL / reference key matches `search`. Pass the list's `filters` so index
+	matches are limited to jobs the list can show."""
+	or_filters = [["name", "like", f"%{search}%"]]
+	or_filters.extend([fieldname, "like", f"%{search}%"] for fieldname in like_fields)
+	names = search_job_names(job_doctype, search, scope=filters)
+	if names:
+		or_filters.append(["name", "in", names])
+	return or_filters
+
+
+def rebuild_search_index(job_doctype, batch_size=500):
+	"""(Re)build every key for `job_doctype` with set queries - used by the
+	backfill patch. Returns the number of keys written."""
+	config = INDEXED_JOBS[job_doctype]
+	header_fields = ["name", *config["bl_fields"], *config["reference_fields"]]
+	frappe.db.delete(DOCTYPE, {"job_doctype": job_doctype})
+
+	names = frappe.get_all(job_doctype, pluck="name", order_by="name asc")
+	written = 0
+	for start in range(0, len(names), batch_size):
+		batch = names[start:start + batch_size]
+		headers = frappe.get_all(job_doctype, filters={"name": ["in", batch]}, fields=header_fields)
+		cargo_by_job = {}
+		for row in frappe.get_all(
+			config["cargo_doctype"],
+			filters={"parenttype": job_doctype, "parent": ["in", batch]},
+			fields=["name", "parent", config["container_field"]],
+			order_by="parent, idx",
+		):
+			cargo_by_job.setdefault(row.parent, []).append(row)
+
+		rows = []
+		for header in headers:
+			rows.extend(build_search_keys(job_doctype, header, cargo_by_job.get(header.name)))
+		insert_search_keys(rows)
+		written += len(rows)
+	return written
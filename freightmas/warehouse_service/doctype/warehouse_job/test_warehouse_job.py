@@ -1,9 +1,64 @@
 # Copyright (c) 2025, Zvomaita Technologies (Pvt) Ltd and contributors
 # See license.txt
 
-# import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from freightmas.warehouse_service.doctype.warehouse_job.warehouse_job import (
+	build_inventory_ledger,
+	storage_charge_periods,
+)
+
+
+def _d(day):
+	return getdate(f"2026-03-{day:02d}")
+
+
+def _daily_periods(movements, uom, start, end, charged):
+	"""Reference: day-by-day rescan, the way periods were derived originally."""
+	periods = []
+	period_start, period_qty = None, 0
+	day = start
+	while day <= end:
+		qty = sum(delta for date, u, delta in movements if u == uom and date <= day)
+		is_charged = any(c_start <= day <= c_end for c_start, c_end in charged)
+		if period_start is not None and (is_charged or qty <= 0 or qty != period_qty):
+			periods.append((period_start, add_days(day, -1), period_qty))
+			period_start = None
+		if not is_charged and qty > 0 and period_start is None:
+			period_start, period_qty = day, qty
+		day = add_days(day, 1)
+	if period_start is not None:
+		periods.append((period_start, end, period_qty))
+	return periods
 
 
 class TestWarehouseJob(FrappeTestCase):
-	pass
+	def test_ledger_keeps_only_balance_changes(self):
+		movements = [
+			(_d(1), "Pallet", 10), (_d(1), "Carton", 5),
+			(_d(4), "Pallet", -4), (_d(4), "Pallet", 4),
+			(_d(9), "Pallet", -10),
+		]
+		ledger = build_inventory_ledger(movements)
+		self.assertEqual(ledger["Pallet"], [(_d(1), 10), (_d(9), 0)])
+		self.assertEqual(ledger["Carton"], [(_d(1), 5)])
+
+	def test_periods_match_daily_rescan(self):
+		movements = [
+			(getdate("2026-02-20"), "Pallet", 3),
+			(_d(5), "Pallet", 7),
+			(_d(12), "Pallet", -10),
+			(_d(15), "Pallet", 2),
+			(_d(25), "Pallet", 1),
+		]
+		charged = [(_d(7), _d(8)), (_d(26), _d(31))]
+		expected = _daily_periods(movements, "Pallet", _d(1), _d(31), charged)
+
+		ledger = build_inventory_ledger(movements)
+		self.assertEqual(storage_charge_periods(ledger["Pallet"], _d(1), _d(31), charged), expected)
+		self.assertEqual(expected[0], (_d(1), _d(4), 3))
+
+	def test_no_periods_for_inverted_range(self):
+		ledger = build_inventory_ledger([(_d(1), "Pallet", 1)])
+		self.assertEqual(storage_charge_periods(ledger["Pallet"], _d(10), _d(9)), [])
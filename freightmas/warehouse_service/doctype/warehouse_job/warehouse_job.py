@@ -6,6 +6,9 @@ from frappe.model.document import Document
 from frappe.utils import flt, get_datetime_str, date_diff, today, getdate
 from freightmas.utils.permissions import check_doc_read_permission
 
+# Jobs per stock-movement query in the monthly storage run
+STORAGE_BATCH_SIZE = 200
+
 
 class WarehouseJob(Document):
 	def validate(self):
@@ -607,6 +610,151 @@ def calculate_monthly_storage_for_job(docname, start_date, end_date):
 		end_date: Period end date (YYYY-MM-DD)
 	"""
 	job = frappe.get_doc("Warehouse Job", docname)
+	movements = load_stock_movements([docname]).get(docname, [])
+	
+	new_charges_count = apply_monthly_storage(job, movements, start_date, end_date)
+	if new_charges_count is None:
+		frappe.msgprint("No receipts found for this job")
+		return
+	
+	# Save job
+	if new_charges_count > 0:
+		job.save()
+		frappe.msgprint(f"{new_charges_count} storage charge(s) created for period {start_date} to {end_date}")
+	else:
+		frappe.msgprint(f"No new charges to create. Period {start_date} to {end_date} already charged or no inventory.")
+	
+	return True
+
+
+def load_stock_movements(job_names):
+	"""
+	Quantity movements of submitted receipts (+) and dispatches (-) for many jobs
+	in one query.
+	
+	Returns:
+		{job: [(date, uom, delta)]} sorted by date; a job is present only if it
+		has at least one receipt item
+	"""
+	if not job_names:
+		return {}
+	
+	rows = frappe.db.sql("""
+		SELECT cgr.warehouse_job AS job, cgr.receipt_date AS date,
+			cgri.stock_uom AS uom, cgri.actual_stock_quantity AS delta, 1 AS is_receipt
+		FROM `tabCustomer Goods Receipt Item` cgri
+		INNER JOIN `tabCustomer Goods Receipt` cgr ON cgr.name = cgri.parent
+		WHERE cgr.warehouse_job IN %(jobs)s
+		AND cgr.docstatus = 1
+		UNION ALL
+		SELECT cgd.warehouse_job AS job, cgd.dispatch_date AS date,
+			cgdi.uom AS uom, -cgdi.quantity AS delta, 0 AS is_receipt
+		FROM `tabCustomer Goods Dispatch Item` cgdi
+		INNER JOIN `tabCustomer Goods Dispatch` cgd ON cgd.name = cgdi.parent
+		WHERE cgd.warehouse_job IN %(jobs)s
+		AND cgd.docstatus = 1
+	""", {"jobs": tuple(job_names)}, as_dict=1)
+	
+	movements = {}
+	has_receipts = set()
+	for row in rows:
+		movements.setdefault(row.job, []).append((getdate(row.date), row.uom, flt(row.delta)))
+		if row.is_receipt:
+			has_receipts.add(row.job)
+	
+	return {
+		job: sorted(items, key=lambda m: m[0])
+		for job, items in movements.items()
+		if job in has_receipts
+	}
+
+
+def build_inventory_ledger(movements):
+	"""
+	Prefix-sum ledger of on-hand quantity per UOM.
+	
+	Args:
+		movements: [(date, uom, delta)] sorted by date
+	
+	Returns:
+		{uom: [(date, balance)]} - the balance from that date (inclusive) until
+		the next entry; only dates where the balance actually changes are kept
+	"""
+	deltas = {}
+	for day, uom, delta in movements:
+		by_day = deltas.setdefault(uom, {})
+		by_day[day] = by_day.get(day, 0) + delta
+	
+	ledger = {}
+	for uom, by_day in deltas.items():
+		balance = 0
+		entries = []
+		for day in sorted(by_day):
+			new_balance = flt(balance + by_day[day], 6)
+			if new_balance != balance:
+				entries.append((day, new_balance))
+				balance = new_balance
+		ledger[uom] = entries
+	return ledger
+
+
+def storage_charge_periods(entries, start_date, end_date, charged=None):
+	"""
+	Uncharged periods of constant positive quantity within [start_date, end_date].
+	
+	Args:
+		entries: one UOM's ledger from build_inventory_ledger
+		charged: [(start, end)] ranges already charged for this UOM
+	
+	Returns:
+		[(period_start, period_end, quantity)] in date order
+	"""
+	if end_date < start_date:
+		return []
+	
+	# Constant-balance segments clipped to the period
+	segments = []
+	balance = 0
+	segment_start = start_date
+	for day, new_balance in entries:
+		if day <= start_date:
+			balance = new_balance
+			continue
+		if day > end_date:
+			break
+		segments.append((segment_start, frappe.utils.add_days(day, -1), balance))
+		segment_start, balance = day, new_balance
+	segments.append((segment_start, end_date, balance))
+	
+	# Cut the already charged ranges out of the stocked segments
+	charged = sorted(charged or [])
+	periods = []
+	idx = 0
+	for seg_start, seg_end, qty in segments:
+		if qty <= 0:
+			continue
+		while idx < len(charged) and charged[idx][1] < seg_start:
+			idx += 1
+		cursor = seg_start
+		j = idx
+		while j < len(charged) and charged[j][0] <= seg_end:
+			charged_start, charged_end = charged[j]
+			if charged_start > cursor:
+				periods.append((cursor, frappe.utils.add_days(charged_start, -1), qty))
+			cursor = max(cursor, frappe.utils.add_days(charged_end, 1))
+			j += 1
+		if cursor <= seg_end:
+			periods.append((cursor, seg_end, qty))
+	return periods
+
+
+def apply_monthly_storage(job, movements, start_date, end_date):
+	"""
+	Append storage charge rows to `job` for the period from its stock movements.
+	
+	Returns:
+		number of rows appended, or None when the job has no receipts
+	"""
 	start_date = getdate(start_date)
 	end_date = getdate(end_date)
 	today_date = getdate(today())
@@ -619,187 +767,58 @@ def calculate_monthly_storage_for_job(docname, start_date, end_date):
 	if not job.storage_rate_item:
 		frappe.throw("Storage rates not defined in Storage Rate Item table")
 	
-	# Get existing charged periods to avoid duplicates
-	# Check all existing charges (both invoiced and uninvoiced)
+	if not movements:
+		return None
+	
+	# Existing charges (both invoiced and uninvoiced) to avoid duplicates
 	existing_charges = {}
 	for charge in job.storage_charges:
-		uom = charge.uom
-		if uom not in existing_charges:
-			existing_charges[uom] = []
-		existing_charges[uom].append((getdate(charge.start_date), getdate(charge.end_date)))
-	
-	# Get all receipts for this job
-	receipts = frappe.get_all(
-		"Customer Goods Receipt",
-		filters={"warehouse_job": docname, "docstatus": 1},
-		fields=["name", "receipt_date"]
-	)
-	
-	if not receipts:
-		frappe.msgprint("No receipts found for this job")
-		return
-	
-	# Build daily inventory snapshots by tracking all receipts and dispatches
-	# Structure: {date: {uom: quantity}}
-	daily_inventory = {}
-	
-	# Initialize all dates in the period
-	current_date = start_date
-	while current_date <= end_date:
-		daily_inventory[current_date] = {}
-		current_date = frappe.utils.add_days(current_date, 1)
-	
-	# Get all receipt items with their dates
-	receipt_items = frappe.db.sql("""
-		SELECT 
-			cgri.stock_uom as uom,
-			cgri.actual_stock_quantity as quantity,
-			cgr.receipt_date
-		FROM `tabCustomer Goods Receipt Item` cgri
-		INNER JOIN `tabCustomer Goods Receipt` cgr ON cgr.name = cgri.parent
-		WHERE cgr.warehouse_job = %(job)s
-		AND cgr.docstatus = 1
-		ORDER BY cgr.receipt_date ASC
-	""", {"job": docname}, as_dict=1)
-	
-	# Get all dispatch items with their dates
-	dispatch_items = frappe.db.sql("""
-		SELECT 
-			cgdi.uom,
-			cgdi.quantity,
-			cgd.dispatch_date
-		FROM `tabCustomer Goods Dispatch Item` cgdi
-		INNER JOIN `tabCustomer Goods Dispatch` cgd ON cgd.name = cgdi.parent
-		WHERE cgd.warehouse_job = %(job)s
-		AND cgd.docstatus = 1
-		ORDER BY cgd.dispatch_date ASC
-	""", {"job": docname}, as_dict=1)
-	
-	# Build running balance for each day
-	for day in sorted(daily_inventory.keys()):
-		# Calculate total receipts up to this day
-		for receipt_item in receipt_items:
-			receipt_date = getdate(receipt_item.receipt_date)
-			if receipt_date <= day:
-				uom = receipt_item.uom
-				qty = flt(receipt_item.quantity)
-				
-				if uom not in daily_inventory[day]:
-					daily_inventory[day][uom] = 0
-				daily_inventory[day][uom] += qty
-		
-		# Subtract total dispatches up to this day
-		for dispatch_item in dispatch_items:
-			dispatch_date = getdate(dispatch_item.dispatch_date)
-			if dispatch_date <= day:
-				uom = dispatch_item.uom
-				qty = flt(dispatch_item.quantity)
-				
-				if uom not in daily_inventory[day]:
-					daily_inventory[day][uom] = 0
-				daily_inventory[day][uom] -= qty
+		existing_charges.setdefault(charge.uom, []).append(
+			(getdate(charge.start_date), getdate(charge.end_date))
+		)
 	
-	# Group consecutive days with same UOM quantities into charge periods
-	# Structure: {uom: [(start_date, end_date, quantity)]}
-	charge_periods = {}
+	ledger = build_inventory_ledger(movements)
 	
-	for uom_rate in job.storage_rate_item:
-		uom = uom_rate.uom
-		charge_periods[uom] = []
-		
-		period_start = None
-		period_qty = 0
-		
-		for day in sorted(daily_inventory.keys()):
-			current_qty = daily_inventory[day].get(uom, 0)
-			
-			# Check if this day is already charged (invoiced)
-			day_already_charged = False
-			if uom in existing_charges:
-				for charged_start, charged_end in existing_charges[uom]:
-					if charged_start <= day <= charged_end:
-						day_already_charged = True
-						break
+	new_charges_count = 0
+	seen_uoms = set()
+	for rate_item in job.storage_rate_item:
+		uom = rate_item.uom
+		if uom in seen_uoms:
+			continue
+		seen_uoms.add(uom)
+		
+		rate_per_day = flt(rate_item.rate_per_day)
+		min_days = flt(rate_item.minimum_charge_days)
+		
+		for period_start, period_end, qty in storage_charge_periods(
+			ledger.get(uom, []), start_date, end_date, existing_charges.get(uom)
+		):
+			storage_days = date_diff(period_end, period_start) + 1
 			
-			if day_already_charged:
-				# Close any open period before this charged day
-				if period_start is not None:
-					charge_periods[uom].append((period_start, frappe.utils.add_days(day, -1), period_qty))
-					period_start = None
-					period_qty = 0
-				continue
+			# Apply minimum charge days
+			chargeable_days = max(storage_days, min_days)
 			
-			if current_qty > 0:
-				if period_start is None:
-					# Start new period
-					period_start = day
-					period_qty = current_qty
-				elif current_qty != period_qty:
-					# Quantity changed - close current period and start new one
-					charge_periods[uom].append((period_start, frappe.utils.add_days(day, -1), period_qty))
-					period_start = day
-					period_qty = current_qty
-			else:
-				# No inventory for this UOM on this day
-				if period_start is not None:
-					# Close current period
-					charge_periods[uom].append((period_start, frappe.utils.add_days(day, -1), period_qty))
-					period_start = None
-					period_qty = 0
-		
-		# Close any open period at end date
-		if period_start is not None:
-			charge_periods[uom].append((period_start, end_date, period_qty))
-	
-	# Create storage charge rows
-	new_charges_count = 0
-	for uom, periods in charge_periods.items():
-		for period_start, period_end, qty in periods:
-			if qty > 0:
-				# Calculate days
-				storage_days = date_diff(period_end, period_start) + 1
-				
-				# Get rate and minimum days
-				rate_per_day = 0
-				min_days = 0
-				for rate_item in job.storage_rate_item:
-					if rate_item.uom == uom:
-						rate_per_day = flt(rate_item.rate_per_day)
-						min_days = flt(rate_item.minimum_charge_days)
-						break
-				
-				# Apply minimum charge days
-				chargeable_days = max(storage_days, min_days)
-				
-				# Calculate amount
-				amount = qty * chargeable_days * rate_per_day
-				
-				# Add charge row
-				job.append("storage_charges", {
-					"uom": uom,
-					"quantity": qty,
-					"start_date": period_start,
-					"end_date": period_end,
-					"storage_days": storage_days,
-					"amount": amount,
-					"is_invoiced": 0
-				})
-				new_charges_count += 1
-	
-	# Save job
-	if new_charges_count > 0:
-		job.save()
-		frappe.msgprint(f"{new_charges_count} storage charge(s) created for period {start_date} to {end_date}")
-	else:
-		frappe.msgprint(f"No new charges to create. Period {start_date} to {end_date} already charged or no inventory.")
+			job.append("storage_charges", {
+				"uom": uom,
+				"quantity": qty,
+				"start_date": period_start,
+				"end_date": period_end,
+				"storage_days": storage_days,
+				"amount": qty * chargeable_days * rate_per_day,
+				"is_invoiced": 0
+			})
+			new_charges_count += 1
 	
-	return True
+	return new_charges_count
 
 
 def calculate_all_monthly_storage():
 	"""
 	Scheduled task to calculate storage charges for all active warehouse jobs.
 	Runs monthly to calculate previous month's storage charges.
+	
+	Stock movements are loaded for a whole batch of jobs in one query; only
+	jobs that gain charge rows are saved.
 	"""
 	from frappe.utils import add_months, get_first_day, get_last_day
 	
@@ -813,7 +832,8 @@ def calculate_all_monthly_storage():
 	jobs = frappe.get_all(
 		"Warehouse Job",
 		filters={"status": "Active", "docstatus": 1},
-		fields=["name"]
+		pluck="name",
+		order_by="name asc"
 	)
 	
 	if not jobs:
@@ -823,12 +843,21 @@ def calculate_all_monthly_storage():
 	success_count = 0
 	error_count = 0
 	
-	for job in jobs:
-		try:
-			calculate_monthly_storage_for_job(job.name, start_date, end_date)
-			success_count += 1
-		except Exception as e:
-			error_count += 1
-			frappe.logger().error(f"Error calculating storage for job {job.name}: {str(e)}")
+	for batch_start in range(0, len(jobs), STORAGE_BATCH_SIZE):
+		batch = jobs[batch_start:batch_start + STORAGE_BATCH_SIZE]
+		movements = load_stock_movements(batch)
+		
+		for job_name in batch:
+			try:
+				if job_name in movements:
+					job = frappe.get_doc("Warehouse Job", job_name)
+					if apply_monthly_storage(job, movements[job_name], start_date, end_date):
+						job.save()
+				success_count += 1
+			except Exception as e:
+				error_count += 1
+				frappe.logger().error(f"Error calculating storage for job {job_name}: {str(e)}")
+		
+		frappe.db.commit()
 	
 	frappe.logger().info(f"Monthly storage calculation completed. Success: {success_count}, Errors: {error_count}")